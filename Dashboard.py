@@ -6,11 +6,29 @@ import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 from datetime import datetime, timedelta
+import hashlib
+import os
+import tempfile
+import threading
 import time
-import random
 import warnings
 warnings.filterwarnings('ignore')
 
+from data_engine import DEFAULT_SEED, GENERATEURS, SCHEMAS, DataEngine, memory_report, slice_period
+from live import LiveScheduler, SharedTickStore, TickStore
+from charts import FigureCache, downsample, extend_traces
+from sources import select, source_from_env
+from store import ColumnStore
+from loader import DatasetLoader
+from rollups import build_rollups
+from forecast import forecast
+from scenarios import ScenarioEngine
+from static_content import StaticContent
+from sectors import load_catalog
+from ingest import TickIngestor
+from instrumentation import (current_run, enable_log_line, end_run, registre, start_run,
+                             stop_allocations, timed, write_prometheus)
+
 # Configuration de la page
 st.set_page_config(
     page_title="Dashboard Économique La Réunion - Analyse en Temps Réel",
@@ -100,279 +118,498 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-class ReunionDashboard:
+# Cache des jeux de données partagé entre toutes les sessions
+CACHE_TTL_SECONDES = 3600
+CACHE_MAX_ENTREES = 64
+
+class CacheStats:
+    """Compteurs de requêtes et de miss du cache de données, par jeu de données"""
     def __init__(self):
-        self.secteurs = self.define_secteurs()
-        self.economic_data = self.initialize_economic_data()
-        self.tourism_data = self.initialize_tourism_data()
-        self.agriculture_data = self.initialize_agriculture_data()
-        self.energy_data = self.initialize_energy_data()
-        self.demographic_data = self.initialize_demographic_data()
-        
-    def define_secteurs(self):
-        """Définit les secteurs économiques de La Réunion"""
-        return {
-            'Tourisme': {
-                'nom_complet': 'Tourisme et Hôtellerie',
-                'poids_pib': 18.7,
-                'croissance': 6.2,
-                'emplois': 35000,
-                'couleur': '#EF4135',
-                'description': 'Premier secteur économique de l\'île',
-                'entreprises_cles': ['Accor', 'Club Med', 'Palm Hotel', 'LUX*'],
-                'perspectives': 'Très positives avec reprise post-COVID'
-            },
-            'Agriculture': {
-                'nom_complet': 'Agriculture et Agroalimentaire',
-                'poids_pib': 12.3,
-                'croissance': 2.1,
-                'emplois': 28000,
-                'couleur': '#28a745',
-                'description': 'Canne à sucre, fruits tropicaux, élevage',
-                'entreprises_cles': ['Tereos', 'Sucrerie de Bois Rouge', 'Chambre d\'Agriculture'],
-                'perspectives': 'Stable avec diversification'
-            },
-            'BTP': {
-                'nom_complet': 'Bâtiment et Travaux Publics',
-                'poids_pib': 15.4,
-                'croissance': 8.9,
-                'emplois': 42000,
-                'couleur': '#FF6B00',
-                'description': 'Construction, infrastructures, grands chantiers',
-                'entreprises_cles': ['Vinci', 'Eiffage', 'Bouygues', 'Sogea'],
-                'perspectives': 'Très positives avec NEO'
-            },
-            'Commerce': {
-                'nom_complet': 'Commerce et Distribution',
-                'poids_pib': 14.2,
-                'croissance': 3.8,
-                'emplois': 52000,
-                'couleur': '#6f42c1',
-                'description': 'Grande distribution, commerce de détail',
-                'entreprises_cles': ['Carrefour', 'Leader Price', 'Jumbo', 'Run Market'],
-                'perspectives': 'Stable'
-            },
-            'Services Publics': {
-                'nom_complet': 'Services Publics et Administration',
-                'poids_pib': 22.1,
-                'croissance': 1.2,
-                'emplois': 68000,
-                'couleur': '#0055A4',
-                'description': 'Administration, éducation, santé publique',
-                'entreprises_cles': ['ARS', 'Rectorat', 'Conseil Départemental', 'Conseil Régional'],
-                'perspectives': 'Stable'
-            },
-            'Énergie': {
-                'nom_complet': 'Énergie et Environnement',
-                'poids_pib': 5.8,
-                'croissance': 12.4,
-                'emplois': 8500,
-                'couleur': '#FFD100',
-                'description': 'Énergies renouvelables, transition écologique',
-                'entreprises_cles': ['EDF', 'Albioma', 'Akuo Energy', 'SIDELEC'],
-                'perspectives': 'Très positives'
-            },
-            'Numérique': {
-                'nom_complet': 'Numérique et Télécoms',
-                'poids_pib': 4.2,
-                'croissance': 9.7,
-                'emplois': 6200,
-                'couleur': '#00A3E0',
-                'description': 'Télécommunications, services numériques',
-                'entreprises_cles': ['Orange', 'SFR', 'Zeop', 'Runware'],
-                'perspectives': 'Très positives'
-            },
-            'Industrie': {
-                'nom_complet': 'Industrie et Transformation',
-                'poids_pib': 7.3,
-                'croissance': 4.5,
-                'emplois': 12500,
-                'couleur': '#8B4513',
-                'description': 'Agroalimentaire, BTP, énergie',
-                'entreprises_cles': ['Sofraca', 'Bourbon', 'Groupe Quartier Français'],
-                'perspectives': 'Modérément positives'
-            }
-        }
+        self._lock = threading.Lock()
+        self.requetes = {nom: 0 for nom in GENERATEURS}
+        self.miss = {nom: 0 for nom in GENERATEURS}
+    
+    def record_request(self, nom):
+        with self._lock:
+            self.requetes[nom] = self.requetes.get(nom, 0) + 1
+    
+    def record_miss(self, nom):
+        with self._lock:
+            self.miss[nom] = self.miss.get(nom, 0) + 1
+    
+    def snapshot(self):
+        """Retourne les hits/miss par jeu de données sous forme de DataFrame"""
+        with self._lock:
+            lignes = [{
+                'dataset': nom,
+                'hits': self.requetes[nom] - self.miss.get(nom, 0),
+                'miss': self.miss.get(nom, 0)
+            } for nom in self.requetes]
+        return pd.DataFrame(lignes)
+
+@st.cache_resource
+def get_cache_stats():
+    """Statistiques du cache, uniques pour tout le processus serveur"""
+    return CacheStats()
+
+@st.cache_data(ttl=CACHE_TTL_SECONDES, max_entries=CACHE_MAX_ENTREES, show_spinner=False)
+def _build_dataset(nom, colonnes, debut, fin, cle_source, _source):
+    """Charge un jeu de données depuis la source (exécuté uniquement en cas de miss)"""
+    get_cache_stats().record_miss(nom)
+    return _source.load(nom, colonnes, debut, fin)
+
+def charger_dataset(source, nom, colonnes=None, debut=None, fin=None):
+    """Retourne un jeu de données mis en cache par (source, nom, colonnes, période).
+    
+    Avec le stockage colonnaire, la version complète est projetée depuis le
+    disque et la période et les colonnes en sont des vues.
+    """
+    get_cache_stats().record_request(nom)
+    store = get_column_store()
+    if store is not None:
+        df = store.load(nom, source.cache_key(nom), lambda: _load_full_dataset(source, nom))
+        return select(df, nom, colonnes, debut, fin)
+    colonnes = tuple(colonnes) if colonnes is not None else None
+    return _build_dataset(nom, colonnes, debut, fin, source.cache_key(nom), source)
+
+def _load_full_dataset(source, nom):
+    """Lit un jeu de données complet depuis la source avant son écriture sur disque"""
+    get_cache_stats().record_miss(nom)
+    return source.load(nom)
+
+@st.cache_data(show_spinner=False)
+def rapport_memoire(seed, date_debut, date_fin):
+    """Octets par jeu de données avant et après conversion vers les dtypes compacts"""
+    return memory_report(DataEngine(seed, date_debut, date_fin))
+
+# Stockage colonnaire projeté en mémoire, partagé par les processus serveur
+# (REUNION_STORE_DIR vide : désactivé, les jeux sont alors mis en cache par session serveur)
+STORE_DIR = os.environ.get('REUNION_STORE_DIR', os.path.join(tempfile.gettempdir(), 'reunion-dashboard'))
+
+@st.cache_resource
+def get_column_store():
+    """Stockage colonnaire du processus (None si désactivé)"""
+    return ColumnStore(STORE_DIR) if STORE_DIR else None
+
+# Construction initiale des jeux de données : séquentielle dans le processus serveur par
+# défaut. Le démarrage d'un pool (~1 s par processus) ne se rentabilise que pour de gros
+# historiques ; REUNION_INIT_PROCESSUS=N l'active avec N processus (0 : un par cœur)
+INIT_PROCESSUS = int(os.environ.get('REUNION_INIT_PROCESSUS', '1')) or None
+
+@st.cache_resource
+def get_dataset_loader():
+    """Constructeur parallèle des jeux de données, partagé par toutes les sessions"""
+    return DatasetLoader(get_column_store(), workers=INIT_PROCESSUS)
+
+# Cache des figures Plotly, invalidé par version de jeu de données
+FIGURE_CACHE_MAX_ENTREES = 256
+# Nombre de points envoyés au navigateur par graphique de série temporelle
+MAX_POINTS_SERIE = 1200
+
+@st.cache_resource
+def get_figure_cache():
+    """Cache LRU des figures, partagé par toutes les sessions"""
+    return FigureCache(max_entries=FIGURE_CACHE_MAX_ENTREES)
+
+# Agrégats par période : indicateurs de flux sommés (les autres sont moyennés)
+# et fréquences calculées pour chaque jeu de données
+ROLLUP_SOMMES = {
+    'economic': ('exportations', 'importations', 'balance_commerciale'),
+    'tourism': ('arrivees_touristes', 'recettes_tourisme'),
+    'agriculture': ('production_canne_tonnes', 'production_fruits_tonnes', 'production_viande_tonnes', 'export_agricole'),
+    'energy': ('production_totale_mwh', 'production_solaire', 'production_eolien', 'production_biomasse',
+               'production_hydraulique', 'importation_energie'),
+}
+ROLLUP_FREQUENCES = {'tourism': ('M', 'Q', 'Y'), 'demographic': ('Y',)}
+
+def numeric_columns(nom):
+    """Indicateurs numériques d'un jeu de données"""
+    return [col for col, dtype in SCHEMAS[nom].items() if dtype != 'category']
+
+def rollup_options(nom):
+    """Paramètres de build_rollups pour un jeu de données : indicateurs numériques, fréquences, flux"""
+    return {
+        'colonnes': numeric_columns(nom),
+        'freqs': ROLLUP_FREQUENCES.get(nom, ('Q', 'Y')),
+        'sommes': ROLLUP_SOMMES.get(nom, ()),
+    }
+
+@st.cache_resource(max_entries=CACHE_MAX_ENTREES)
+def get_static_rollups(nom, version, _df):
+    """Agrégats d'un jeu de données historique, calculés une fois par version"""
+    return build_rollups(_df, **rollup_options(nom))
+
+# Projections : horizon en mois et options du modèle par jeu de données
+HORIZON_PROJECTIONS = 24
+PROJECTIONS = {
+    'economic': {},
+    'tourism': {'log': ('arrivees_touristes', 'recettes_tourisme')},
+    'energy': {'bornes': {'part_renouvelable': (0.0, 1.0)}},
+}
+
+@st.cache_resource(max_entries=CACHE_MAX_ENTREES)
+def get_forecast(nom, version, _df):
+    """Projections de tous les indicateurs d'un jeu de données, calculées une fois par version"""
+    return forecast(_df, numeric_columns(nom), HORIZON_PROJECTIONS, **PROJECTIONS[nom])
+
+# Scénarios Monte Carlo : processus de simulation (None : un par cœur) et horizon en mois
+SCENARIOS_PROCESSUS = None
+HORIZON_SCENARIOS = 36
+
+@st.cache_resource
+def get_scenario_engine(seed):
+    """Moteur de scénarios et son pool de processus, partagés par toutes les sessions"""
+    return ScenarioEngine(workers=SCENARIOS_PROCESSUS, seed=seed)
+
+@st.cache_data(ttl=CACHE_TTL_SECONDES, max_entries=CACHE_MAX_ENTREES, show_spinner=False)
+def simuler_scenarios(seed, debut, n_scenarios, probabilite_choc, pib_initial):
+    """Percentiles des trajectoires simulées, mis en cache par paramètres"""
+    return get_scenario_engine(seed).simulate(debut, HORIZON_SCENARIOS, n_scenarios,
+                                              probabilite_choc, pib_initial)
+
+@st.cache_resource
+def get_static_content(seed):
+    """Tables et figures du contenu fixe, construites une fois pour tout le processus"""
+    return StaticContent(seed)
+
+@st.cache_resource
+def get_sector_catalog(seed):
+    """Catalogue des secteurs (intégré, ou nomenclature de REUNION_SECTEURS), chargé une fois par processus"""
+    return load_catalog(seed=seed)
+
+# Instrumentation : fichier Prometheus (collecteur « textfile ») réécrit à chaque exécution,
+# et ligne de mesures dans les logs si REUNION_METRICS_LOG est défini
+METRICS_FILE = os.environ.get('REUNION_METRICS_FILE')
+if os.environ.get('REUNION_METRICS_LOG'):
+    enable_log_line()
+
+# Rafraîchissement automatique : un seul thread par processus produit les ticks
+LIVE_INTERVALLE_SECONDES = 30
+LIVE_MAX_RAFRAICHISSEMENTS = 4
+# Nombre maximal de mois conservés dans la série live (None : historique complet)
+LIVE_MAX_HISTORIQUE = None
+# Série live partagée par les processus serveur de l'hôte : un seul produit les ticks,
+# les autres lisent les mêmes pages (REUNION_LIVE_DIR vide : une série par processus)
+LIVE_DIR = os.environ.get('REUNION_LIVE_DIR', '/dev/shm/reunion-live' if os.path.isdir('/dev/shm') else '')
+
+# Source des ticks live : répertoire de fichiers NDJSON, 'unix:/chemin' ou 'tcp:hote:port'
+# (vide : ticks simulés). Seul le processus producteur lit la source.
+LIVE_SOURCE = os.environ.get('REUNION_LIVE_SOURCE', '')
+
+def live_path(source):
+    """Répertoire de la série live partagée d'une source (le même d'un jour à l'autre)"""
+    return os.path.join(LIVE_DIR, f"economic-{hashlib.sha1(repr(source.identity()).encode()).hexdigest()[:16]}")
+
+@st.cache_resource
+def get_live_producer():
+    """Dashboard unique du processus dont les données avancent à chaque tick"""
+    producteur = ReunionDashboard()
+    if LIVE_DIR:
+        racine = live_path(producteur.source)
+        producteur.economic_store = SharedTickStore.attach(racine, producteur.initialize_economic_data(),
+                                                           max_history=LIVE_MAX_HISTORIQUE, index_col='date')
+        # Séries d'autres sources (ou d'anciennes versions) qui n'ont plus de producteur : en RAM sous /dev/shm
+        SharedTickStore.prune(LIVE_DIR, 'economic-', racine)
+    # Agrégats de la série live, mis à jour à chaque tick par update_live_data
+    producteur.economic_rollups = build_rollups(producteur.economic_data, **rollup_options('economic'))
+    return producteur
+
+@st.cache_resource
+def get_live_scheduler():
+    """Planificateur des ticks temps réel, partagé par toutes les sessions"""
+    producteur = get_live_producer()
+    scheduler = LiveScheduler(producteur.live_tick,
+                              interval=LIVE_INTERVALLE_SECONDES,
+                              max_concurrent_refreshes=LIVE_MAX_RAFRAICHISSEMENTS)
+    # Avec une source de ticks, chaque lot reçu déclenche un tick sans attendre l'intervalle
+    producteur.live_notify = scheduler.tick_now
+    return scheduler.start()
+
+class ReunionDashboard:
+    def __init__(self, seed=DEFAULT_SEED, engine=None):
+        self.engine = engine or DataEngine(seed)
+        # Données simulées, ou extraits CSV/Parquet si REUNION_DATA_DIR est défini
+        self.source = source_from_env(self.engine)
+        # Navigation paresseuse : seul l'onglet actif est construit à chaque exécution
+        self.lazy_tabs = True
+        # Filtres de la sidebar (None : aucun filtre)
+        self.periode = None
+        self.secteurs_selectionnes = None
+        self.show_projections = False
+        self.diagnostic_panel = None
+        # Construction des jeux historiques lancée ici, attendue au premier accès
+        self.start_loading()
+        self.secteurs = get_sector_catalog(self.engine.seed)
+        # Série live : celle du producteur (sync_live_data), créée à la demande hors serveur
+        self._economic_store = None
+        self.economic_rollups = None
+        # Pipeline d'ingestion des ticks (REUNION_LIVE_SOURCE), démarré par le producteur
+        self.live_ingestor = None
+        self.live_notify = None
+        
+    @property
+    def economic_store(self):
+        """Stockage de la série économique live ; copie privée de l'historique, construite au premier accès"""
+        if self._economic_store is None:
+            self._economic_store = TickStore.from_frame(self.initialize_economic_data(),
+                                                        max_history=LIVE_MAX_HISTORIQUE, index_col='date')
+        return self._economic_store
+    
+    @economic_store.setter
+    def economic_store(self, store):
+        self._economic_store = store
+    
+    @property
+    def economic_data(self):
+        """Vue DataFrame (sans copie) de la série économique live"""
+        return self.economic_store.frame()
+    
+    @property
+    def tourism_data(self):
+        return self.initialize_tourism_data()
+    
+    @property
+    def agriculture_data(self):
+        return self.initialize_agriculture_data()
+    
+    @property
+    def energy_data(self):
+        return self.initialize_energy_data()
+    
+    @property
+    def demographic_data(self):
+        return self.initialize_demographic_data()
     
+    def load_dataset(self, nom, colonnes=None, debut=None, fin=None):
+        """Charge un jeu de données depuis le cache partagé entre les sessions.
+        
+        Seules les colonnes et la période demandées sont lues depuis la source.
+        """
+        return charger_dataset(self.source, nom, colonnes, debut, fin)
+    
+    def start_loading(self):
+        """Lance la construction des jeux de données qui ne sont pas encore disponibles"""
+        # Sources distantes : une requête conditionnelle par jeu, toutes en parallèle ;
+        # seuls les jeux sans copie locale sont attendus
+        self.source.refresh(list(GENERATEURS))
+        loader = get_dataset_loader()
+        for nom in GENERATEURS:
+            if loader.submit(self.source, nom, parallele=nom != 'economic'):
+                get_cache_stats().record_request(nom)
+                get_cache_stats().record_miss(nom)
+    
+    def load_initial_dataset(self, nom):
+        """Jeu de données complet construit au démarrage (attendu s'il est encore en construction)"""
+        get_cache_stats().record_request(nom)
+        return get_dataset_loader().get(self.source, nom)
+    
+    @timed
     def initialize_economic_data(self):
         """Initialise les données économiques historiques"""
-        # Correction: Utilisation de 'ME' au lieu de 'M'
-        dates = pd.date_range('2014-01-01', datetime.now(), freq='ME')
-        data = []
-        
-        for date in dates:
-            # Données économiques de base avec tendances réalistes
-            pib_base = 20.5  # Milliards EUR
-            croissance_base = 2.8  # %
-            
-            # Impact COVID (2020-2021)
-            if date.year == 2020:
-                covid_impact = random.uniform(-0.08, -0.03)  # -3% à -8%
-            elif date.year == 2021:
-                covid_impact = random.uniform(-0.02, 0.02)   # -2% à +2%
-            else:
-                covid_impact = random.uniform(0.02, 0.06)    # +2% à +6%
-            
-            inflation = random.uniform(1.5, 4.0)
-            chomage = random.uniform(18.0, 24.0)  # Taux de chômage structurellement élevé
-            
-            data.append({
-                'date': date,
-                'pib_mensuel': pib_base * (1 + croissance_base/100) ** ((date.year-2014)*12 + date.month-1),
-                'croissance_pib': croissance_base + covid_impact * 100,
-                'inflation': inflation,
-                'taux_chomage': chomage,
-                'revenu_median': random.uniform(1800, 2200),
-                'exportations': random.uniform(0.3, 0.6),  # Milliards EUR
-                'importations': random.uniform(4.5, 5.5),  # Milliards EUR
-                'balance_commerciale': random.uniform(-4.8, -4.2)  # Déficit structurel
-            })
-        
-        return pd.DataFrame(data)
+        return self.load_initial_dataset('economic')
     
+    @timed
     def initialize_tourism_data(self):
         """Initialise les données touristiques"""
-        # Correction: Utilisation de 'ME' au lieu de 'M'
-        dates = pd.date_range('2014-01-01', datetime.now(), freq='ME')
-        data = []
-        
-        for date in dates:
-            # Saisonnalité touristique très marquée
-            if date.month in [7, 8, 12, 1]:  # Haute saison (été austral + Noël)
-                base_touristes = 120000
-            elif date.month in [2, 3, 9, 10]:   # Moyenne saison
-                base_touristes = 80000
-            else:                               # Basse saison
-                base_touristes = 50000
-            
-            # Impact COVID très fort sur le tourisme
-            if date.year == 2020 or (date.year == 2021 and date.month <= 6):
-                covid_factor = random.uniform(0.02, 0.08)  # 2-8% de la normale
-            elif date.year == 2021:
-                covid_factor = random.uniform(0.2, 0.4)    # 20-40% de la normale
-            elif date.year == 2022:
-                covid_factor = random.uniform(0.6, 0.8)    # 60-80% de la normale
-            else:
-                covid_factor = random.uniform(0.9, 1.1)    # Retour à la normale
-            
-            touristes = base_touristes * covid_factor
-            recettes = touristes * random.uniform(1500, 2200)  # Dépense moyenne par touriste
-            
-            data.append({
-                'date': date,
-                'arrivees_touristes': touristes,
-                'recettes_tourisme': recettes,
-                'duree_sejour_moyenne': random.uniform(10, 16),
-                'taux_occupation_hotels': random.uniform(0.5, 0.85) * covid_factor,
-                'principaux_marches': random.choice(['France Métropolitaine', 'Mayotte', 'Maurice', 'Afrique du Sud'])
-            })
-        
-        return pd.DataFrame(data)
+        return self.load_initial_dataset('tourism')
     
+    @timed
     def initialize_agriculture_data(self):
         """Initialise les données agricoles"""
-        # Correction: Utilisation de 'ME' au lieu de 'M'
-        dates = pd.date_range('2014-01-01', datetime.now(), freq='ME')
-        produits = ['Canne à sucre', 'Fruits tropicaux', 'Viande bovine', 'Lait', 'Légumes', 'Fleurs']
-        
-        data = []
-        for date in dates:
-            # Production saisonnière
-            if date.month in [7, 8, 9]:  # Saison sèche
-                production_factor = 0.8
-            elif date.month in [1, 2, 3]:  # Saison des pluies
-                production_factor = 1.2
-            else:
-                production_factor = 1.0
-            
-            data.append({
-                'date': date,
-                'production_canne_tonnes': random.uniform(1500000, 1800000) * production_factor,
-                'production_fruits_tonnes': random.uniform(50000, 80000) * production_factor,
-                'production_viande_tonnes': random.uniform(4000, 6000),
-                'prix_sucre_tonne': random.uniform(400, 600),
-                'export_agricole': random.uniform(0.1, 0.3),  # Milliards EUR
-                'produit_principal': random.choice(produits)
-            })
-        
-        return pd.DataFrame(data)
+        return self.load_initial_dataset('agriculture')
     
+    @timed
     def initialize_energy_data(self):
         """Initialise les données énergétiques"""
-        # Correction: Utilisation de 'ME' au lieu de 'M'
-        dates = pd.date_range('2014-01-01', datetime.now(), freq='ME')
-        data = []
-        
-        for date in dates:
-            # Croissance des énergies renouvelables
-            if date.year <= 2016:
-                part_renouvelable = random.uniform(0.25, 0.35)
-            elif date.year <= 2020:
-                part_renouvelable = random.uniform(0.35, 0.45)
-            else:
-                part_renouvelable = random.uniform(0.45, 0.55)
-            
-            data.append({
-                'date': date,
-                'production_totale_mwh': random.uniform(250000, 350000),
-                'part_renouvelable': part_renouvelable,
-                'production_solaire': random.uniform(30000, 60000),
-                'production_eolien': random.uniform(15000, 30000),
-                'production_biomasse': random.uniform(40000, 80000),
-                'production_hydraulique': random.uniform(20000, 40000),
-                'importation_energie': random.uniform(0.05, 0.15)  # Milliards EUR
-            })
-        
-        return pd.DataFrame(data)
+        return self.load_initial_dataset('energy')
     
+    @timed
     def initialize_demographic_data(self):
         """Initialise les données démographiques"""
-        # Correction: Utilisation de 'YE' au lieu de 'Y' pour les données annuelles
-        dates = pd.date_range('2014-01-01', datetime.now(), freq='YE')
-        data = []
-        
-        population_base = 850000
-        for date in dates:
-            annee = date.year
-            croissance_pop = random.uniform(0.8, 1.2)  # Croissance démographique forte
-            
-            data.append({
-                'date': date,
-                'population': population_base * (1 + croissance_pop/100) ** (annee - 2014),
-                'taux_natalite': random.uniform(12.0, 15.0),
-                'taux_mortalite': random.uniform(5.0, 6.5),
-                'solde_migratoire': random.uniform(2000, 5000),
-                'densite_population': random.uniform(330, 360),
-                'population_jeune': random.uniform(32, 35),  # % < 25 ans
-                'population_agee': random.uniform(12, 15)    # % > 65 ans
-            })
-        
-        return pd.DataFrame(data)
+        return self.load_initial_dataset('demographic')
     
+    @timed
     def update_live_data(self):
-        """Met à jour les données en temps réel"""
+        """Met à jour les données en temps réel (retourne True si une ligne a été ajoutée)"""
+        if LIVE_SOURCE:
+            return self.ingest_live_data()
+        store = self.economic_store
         # Simulation de mises à jour économiques
-        dernier_pib = self.economic_data.iloc[-1]['croissance_pib']
-        nouvelle_croissance = dernier_pib + random.uniform(-0.1, 0.1)
+        dernier_pib = store.last('croissance_pib')
+        nouvelle_croissance = dernier_pib + self.engine.live_rng.uniform(-0.1, 0.1)
         
-        # Ajout de nouvelles données mensuelles si nécessaire
-        derniere_date = self.economic_data['date'].max()
+        # Ajout de nouvelles données mensuelles si nécessaire (série triée : la dernière date est la plus récente)
+        derniere_date = pd.Timestamp(store.last('date'))
         if datetime.now() - derniere_date > timedelta(days=30):
             nouvelle_date = derniere_date + timedelta(days=30)
             
-            nouvelle_ligne = {
+            ligne = {
                 'date': nouvelle_date,
-                'pib_mensuel': self.economic_data.iloc[-1]['pib_mensuel'] * (1 + nouvelle_croissance/100),
+                'pib_mensuel': store.last('pib_mensuel') * (1 + nouvelle_croissance/100),
                 'croissance_pib': nouvelle_croissance,
-                'inflation': random.uniform(1.8, 3.5),
-                'taux_chomage': random.uniform(19.0, 22.0),
-                'revenu_median': random.uniform(1850, 2250),
-                'exportations': random.uniform(0.35, 0.65),
-                'importations': random.uniform(4.6, 5.4),
-                'balance_commerciale': random.uniform(-4.7, -4.3)
+                'inflation': self.engine.live_rng.uniform(1.8, 3.5),
+                'taux_chomage': self.engine.live_rng.uniform(19.0, 22.0),
+                'revenu_median': self.engine.live_rng.uniform(1850, 2250),
+                'exportations': self.engine.live_rng.uniform(0.35, 0.65),
+                'importations': self.engine.live_rng.uniform(4.6, 5.4),
+                'balance_commerciale': self.engine.live_rng.uniform(-4.7, -4.3)
             }
-            
-            self.economic_data = pd.concat([self.economic_data, pd.DataFrame([nouvelle_ligne])], ignore_index=True)
+            store.append(ligne)
+            # Seule la période du nouveau mois est mise à jour dans les agrégats, avec les
+            # valeurs stockées (dtypes du schéma), comme dans les processus qui lisent la série
+            ligne = {col: store.last(col) for col in store.columns}
+            for rollup in (self.economic_rollups or {}).values():
+                rollup.append(ligne)
+            return True
+        return False
+    
+    def ingest_live_data(self):
+        """Ajoute les lots reçus de la source de ticks (pipeline démarré au premier appel)"""
+        if self.live_ingestor is None:
+            self.live_ingestor = TickIngestor(LIVE_SOURCE, 'economic', on_batch=self.live_notify).start()
+        return self.live_ingestor.drain(self.economic_store, self.economic_rollups) > 0
+    
+    def follow_live_data(self):
+        """Adopte les lignes publiées par le processus producteur (retourne True s'il y en a)"""
+        lignes = self.economic_store.refresh()
+        if lignes is None:
+            return False
+        for rollup in (self.economic_rollups or {}).values():
+            rollup.extend(lignes['date'], np.column_stack([lignes[col] for col in rollup.colonnes]))
+        return True
+    
+    def live_tick(self):
+        """Tick du planificateur : rattrape la série partagée, puis la prolonge si ce processus est producteur"""
+        # Le verrou est pris avant le rattrapage : aucune ligne ne peut être publiée entre les deux
+        producteur = self.economic_store.acquire_writer()
+        nouvelles = self.follow_live_data()
+        if producteur:
+            return self.update_live_data() or nouvelles
+        return nouvelles
+    
+    def sync_live_data(self):
+        """Récupère les dernières données produites par le planificateur du processus"""
+        live = get_live_scheduler()
+        # La version est lue avant les données : au pire, un rafraîchissement de trop
+        st.session_state['live_version'] = live.version
+        producteur = get_live_producer()
+        self.economic_store = producteur.economic_store
+        self.economic_rollups = producteur.economic_rollups
+    
+    def poll_live_updates(self):
+        """Relance la page uniquement si le planificateur a publié de nouvelles données"""
+        live = get_live_scheduler()
+        if live.version == st.session_state.get('live_version'):
+            return
+        jeton = live.acquire_refresh()
+        if jeton is not None:
+            st.session_state['live_refresh_slot'] = jeton
+            st.rerun(scope='app')
+    
+    def create_tabs(self, labels, key):
+        """Crée des onglets ; en mode paresseux, changer d'onglet relance le script"""
+        if self.lazy_tabs:
+            return st.tabs(labels, key=key, on_change='rerun')
+        return st.tabs(labels)
+    
+    @staticmethod
+    def is_open(tab):
+        """Indique si le contenu d'un onglet doit être construit"""
+        # tab.open vaut None lorsque l'état des onglets n'est pas suivi (mode non paresseux)
+        return tab.open is not False
+    
+    def dataset_version(self, nom):
+        """Version d'un jeu de données, utilisée pour indexer les caches de figures"""
+        if nom == 'secteurs':
+            return self.secteurs.version
+        if nom == 'economic':
+            return f"{self.source_version(nom)}:{self.economic_store.uid}:{self.economic_store.version}"
+        return self.source_version(nom)
+    
+    def source_version(self, nom):
+        """Version du contenu d'un jeu de données dans la source"""
+        return ':'.join(str(partie) for partie in self.source.cache_key(nom))
+    
+    def apply_filters(self, controls):
+        """Enregistre la période et les secteurs choisis dans la sidebar"""
+        self.periode = (pd.Timestamp(controls['date_debut']), pd.Timestamp(controls['date_fin']))
+        self.secteurs_selectionnes = tuple(controls['secteurs_selectionnes'])
+    
+    def sector_positions(self):
+        """Positions dans le catalogue des secteurs sélectionnés (par défaut, tout le premier niveau)"""
+        if self.secteurs_selectionnes is None:
+            return self.secteurs.level(0)
+        return self.secteurs.select(self.secteurs_selectionnes)
+    
+    def filter_state(self, nom):
+        """Filtres qui s'appliquent à un jeu de données (partie de la clé des caches)"""
+        if nom == 'secteurs':
+            return self.secteurs_selectionnes
+        return self.periode
+    
+    def rollups(self, nom):
+        """Agrégats précalculés d'un jeu de données, par fréquence ('M', 'Q', 'Y')"""
+        if nom == 'economic' and self.economic_rollups is not None:
+            return self.economic_rollups
+        return get_static_rollups(nom, self.dataset_version(nom), getattr(self, f'{nom}_data'))
+    
+    def filter_rollup(self, table):
+        """Périodes d'une table d'agrégats qui recoupent la période sélectionnée"""
+        if self.periode is None:
+            return table
+        debut, fin = self.periode
+        return table[(table.index.end_time >= debut) & (table.index.start_time <= fin)]
+    
+    def get_dataset(self, nom, colonnes=None):
+        """Retourne le jeu de données filtré (ou la table des secteurs sélectionnés).
+        
+        Hors série live, la période et les colonnes sont transmises à la source.
+        """
+        if nom == 'secteurs':
+            return self.secteurs.frame(self.sector_positions())
+        if nom != 'economic' and (self.periode is not None or colonnes is not None):
+            debut, fin = self.periode if self.periode is not None else (None, None)
+            return self.load_dataset(nom, colonnes, debut, fin)
+        df = getattr(self, f'{nom}_data')
+        if self.periode is not None:
+            df = slice_period(df, *self.periode)
+        return df
+    
+    def figure(self, chart_id, nom, builder, filtres=(), colonnes=None, extender=None):
+        """Retourne une figure depuis le cache du processus, construite au premier appel.
+        
+        Retourne None lorsque les filtres ne laissent aucune donnée. ``extender``
+        reçoit la figure de la version précédente et les données courantes.
+        """
+        def construire():
+            data = self.get_dataset(nom, colonnes)
+            return builder(data) if len(data) else None
+        prolonger = (lambda ancienne: extender(ancienne, self.get_dataset(nom, colonnes))) if extender else None
+        return get_figure_cache().get_or_build(chart_id, nom, self.dataset_version(nom),
+                                               (self.filter_state(nom),) + filtres, construire, prolonger)
+    
+    def plotly_chart(self, fig, **kwargs):
+        """Affiche une figure Plotly en la comptant dans les mesures de l'exécution.
+        
+        En mode diagnostic, la figure est aussi sérialisée pour mesurer sa taille.
+        """
+        run = current_run()
+        if run is not None:
+            if run.allocations:
+                debut = time.perf_counter()
+                octets = len(fig.to_json())
+                run.record_figure(octets, time.perf_counter() - debut)
+            else:
+                run.record_figure()
+        return st.plotly_chart(fig, **kwargs)
+    
+    def show_figure(self, chart_id, nom, builder):
+        """Affiche une figure mise en cache, ou un message si les filtres ne laissent rien"""
+        fig = self.figure(chart_id, nom, builder)
+        if fig is None:
+            st.info("Aucune donnée pour les filtres sélectionnés")
+            return
+        self.plotly_chart(fig, use_container_width=True)
     
     def display_header(self):
         """Affiche l'en-tête du dashboard"""
@@ -394,10 +631,13 @@ class ReunionDashboard:
         st.markdown('<h3 class="section-header">📊 INDICATEURS ÉCONOMIQUES CLÉS</h3>', 
                    unsafe_allow_html=True)
         
-        # Calcul des métriques à partir des dernières données
+        # Dernières valeurs et variations lues dans les agrégats précalculés
+        trimestres = self.rollups('economic')['Q']
+        delta_croissance = trimestres.last_delta('croissance_pib')[1]
+        delta_chomage = trimestres.last_delta('taux_chomage')[1]
         derniere_data = self.economic_data.iloc[-1]
-        derniers_touristes = self.tourism_data.iloc[-1]
-        derniere_demo = self.demographic_data.iloc[-1]
+        touristes, delta_touristes = self.rollups('tourism')['M'].last_delta('arrivees_touristes')
+        population, delta_population = self.rollups('demographic')['Y'].last_delta('population')
         
         col1, col2, col3, col4 = st.columns(4)
         
@@ -405,491 +645,598 @@ class ReunionDashboard:
             st.metric(
                 "Croissance du PIB",
                 f"{derniere_data['croissance_pib']:.1f}%",
-                f"{random.uniform(-0.3, 0.4):.1f}% vs trimestre précédent"
+                self.format_delta(delta_croissance, "{:.1f}% vs trimestre précédent")
             )
         
         with col2:
             st.metric(
                 "Taux de Chômage",
                 f"{derniere_data['taux_chomage']:.1f}%",
-                f"{random.uniform(-0.5, 0.3):.1f}% vs trimestre précédent",
+                self.format_delta(delta_chomage, "{:.1f}% vs trimestre précédent"),
                 delta_color="inverse"
             )
         
         with col3:
             st.metric(
                 "Arrivées Touristiques Mensuelles",
-                f"{derniers_touristes['arrivees_touristes']:,.0f}",
-                f"{random.randint(-3000, 8000):+,} vs mois précédent"
+                f"{touristes:,.0f}",
+                self.format_delta(delta_touristes, "{:+,.0f} vs mois précédent")
             )
         
         with col4:
             st.metric(
                 "Population",
-                f"{derniere_demo['population']:,.0f}",
-                f"+{random.randint(4000, 8000):,} vs année précédente"
+                f"{population:,.0f}",
+                self.format_delta(delta_population, "{:+,.0f} vs année précédente")
             )
     
+    @staticmethod
+    def format_delta(delta, modele):
+        """Libellé d'une variation, ou None si la période de comparaison est absente"""
+        return None if delta is None else modele.format(delta)
+    
+    def plot_series(self, chart_id, nom, builder, colonnes, projection=False):
+        """Affiche une série temporelle réduite côté serveur à MAX_POINTS_SERIE points.
+        
+        Une sélection rectangulaire sur le graphique recharge la période choisie
+        en pleine résolution (ou réduite à nouveau si elle reste trop longue).
+        Avec ``projection``, les prévisions sont ajoutées si l'option est cochée.
+        Pour la série live, un tick prolonge les traces de la figure précédente
+        avec les seuls nouveaux points au lieu de reconstruire tout l'historique.
+        """
+        zooms = st.session_state.setdefault('zooms', {})
+        generations = st.session_state.setdefault('zoom_generations', {})
+        zoom = zooms.get(chart_id)
+        projeter = projection and self.show_projections and zoom is None
+        
+        def construire(df):
+            if zoom is not None:
+                df = slice_period(df, *zoom)
+            if not len(df):
+                return None
+            fig = builder(downsample(df, 'date', colonnes, MAX_POINTS_SERIE))
+            if projeter:
+                self.add_projection(fig, nom, colonnes)
+            return fig
+        
+        def prolonger(ancienne, df):
+            # Points postérieurs au dernier point tracé ; reconstruction complète si l'historique
+            # a été tronqué au début (LIVE_MAX_HISTORIQUE) ou si la figure devient trop longue
+            x = ancienne.data[0].x
+            if not len(df) or x is None or not len(x) or df['date'].iloc[0] > pd.Timestamp(x[0]):
+                return None
+            nouvelles = df[df['date'] > pd.Timestamp(x[-1])]
+            if not len(nouvelles) or len(x) + len(nouvelles) > 2 * MAX_POINTS_SERIE:
+                return None
+            return extend_traces(ancienne, builder(nouvelles))
+        
+        incremental = nom == 'economic' and zoom is None and not projeter
+        fig = self.figure(chart_id, nom, construire, filtres=(zoom, projeter), colonnes=colonnes,
+                          extender=prolonger if incremental else None)
+        if fig is None:
+            st.info("Aucune donnée pour les filtres sélectionnés")
+        else:
+            event = self.plotly_chart(fig, use_container_width=True, on_select='rerun', selection_mode='box',
+                                    key=f"graphique_{chart_id}_{generations.get(chart_id, 0)}")
+            boites = event.selection.box if event else []
+            if boites:
+                periode = tuple(sorted(pd.Timestamp(x) for x in boites[0]['x']))
+                if periode != zoom:
+                    zooms[chart_id] = periode
+                    st.rerun()
+        if zoom is not None:
+            st.caption(f"Zoom: {zoom[0]:%d/%m/%Y} – {zoom[1]:%d/%m/%Y}")
+            if st.button("↺ Vue complète", key=f"dezoom_{chart_id}"):
+                del zooms[chart_id]
+                # Nouvelle clé : le graphique repart sans sélection
+                generations[chart_id] = generations.get(chart_id, 0) + 1
+                st.rerun()
+    
+    def projections(self, nom):
+        """Prévisions de tous les indicateurs d'un jeu de données (mises en cache par version)"""
+        return get_forecast(nom, self.dataset_version(nom), getattr(self, f'{nom}_data'))
+    
+    def add_projection(self, fig, nom, colonnes):
+        """Ajoute à une figure la projection des indicateurs et leur intervalle à 95 %"""
+        prevision = self.projections(nom)
+        contour = list(prevision.index) + list(prevision.index[::-1])
+        for col in colonnes:
+            fig.add_trace(go.Scatter(x=contour,
+                                     y=list(prevision[f'{col}_haut']) + list(prevision[f'{col}_bas'][::-1]),
+                                     fill='toself', fillcolor='rgba(108, 117, 125, 0.2)', line=dict(width=0),
+                                     hoverinfo='skip', showlegend=False))
+            fig.add_trace(go.Scatter(x=prevision.index, y=prevision[col], name=f"Projection {col}",
+                                     line=dict(color='#6c757d', dash='dash')))
+    
+    # Construction des figures : chaque méthode fig_* reçoit son jeu de données
+    # et retourne une figure qui sera mise en cache (elle ne doit plus être modifiée)
+    
+    def fig_croissance_pib(self, df):
+        fig = px.line(df, 
+                     x='date', 
+                     y='croissance_pib',
+                     title='Évolution de la Croissance du PIB (%)',
+                     color_discrete_sequence=['#0055A4'])
+        fig.add_hline(y=0, line_dash="dash", line_color="red")
+        return fig
+    
+    def fig_inflation_chomage(self, df):
+        fig = make_subplots(specs=[[{"secondary_y": True}]])
+        fig.add_trace(
+            go.Scatter(x=df['date'], y=df['inflation'],
+                      name="Inflation", line=dict(color='#EF4135')),
+            secondary_y=False,
+        )
+        fig.add_trace(
+            go.Scatter(x=df['date'], y=df['taux_chomage'],
+                      name="Chômage", line=dict(color='#0055A4')),
+            secondary_y=True,
+        )
+        fig.update_layout(title_text="Inflation et Taux de Chômage")
+        fig.update_yaxes(title_text="Inflation (%)", secondary_y=False)
+        fig.update_yaxes(title_text="Chômage (%)", secondary_y=True)
+        return fig
+    
+    def fig_commerce_exterieur(self, df):
+        return px.line(df, 
+                      x='date', 
+                      y=['exportations', 'importations'],
+                      title='Évolution des Exportations et Importations (Milliards EUR)',
+                      color_discrete_map={'exportations': '#28a745', 'importations': '#EF4135'})
+    
+    def fig_balance_commerciale(self, df):
+        fig = px.area(df, 
+                     x='date', 
+                     y='balance_commerciale',
+                     title='Balance Commerciale (Milliards EUR)',
+                     color_discrete_sequence=['#EF4135'])
+        fig.add_hline(y=0, line_dash="dash", line_color="red")
+        return fig
+    
+    def fig_croissance_par_periode(self, table):
+        fig = make_subplots(specs=[[{"secondary_y": True}]])
+        periodes = table.index.astype(str)
+        fig.add_trace(
+            go.Bar(x=periodes, y=table['croissance_pib'], name="Croissance du PIB", marker_color='#0055A4'),
+            secondary_y=False,
+        )
+        fig.add_trace(
+            go.Scatter(x=periodes, y=table['taux_chomage'], name="Chômage", line=dict(color='#EF4135')),
+            secondary_y=True,
+        )
+        fig.update_layout(title_text="Croissance du PIB et Chômage Moyens par Période")
+        fig.update_yaxes(title_text="Croissance (%)", secondary_y=False)
+        fig.update_yaxes(title_text="Chômage (%)", secondary_y=True)
+        return fig
+    
+    def fig_eventail(self, percentiles, titre, couleur):
+        fig = go.Figure()
+        contour = list(percentiles.index) + list(percentiles.index[::-1])
+        for bas, haut, opacite in (('p5', 'p95', 0.15), ('p25', 'p75', 0.3)):
+            fig.add_trace(go.Scatter(x=contour, y=list(percentiles[haut]) + list(percentiles[bas][::-1]),
+                                     fill='toself', fillcolor=couleur, opacity=opacite, line=dict(width=0),
+                                     name=f"{bas[1:]}-{haut[1:]} %", hoverinfo='skip'))
+        fig.add_trace(go.Scatter(x=percentiles.index, y=percentiles['p50'], name="Médiane",
+                                 line=dict(color=couleur)))
+        fig.update_layout(title_text=titre)
+        return fig
+    
+    def fig_population(self, df):
+        return px.line(df, 
+                      x='date', 
+                      y='population',
+                      title='Évolution de la Population',
+                      color_discrete_sequence=['#0055A4'])
+    
+    def fig_structure_ages(self, df):
+        derniere_annee = df.iloc[-1]
+        ages_data = {
+            'Tranche': ['0-25 ans', '25-65 ans', '65+ ans'],
+            'Pourcentage': [derniere_annee['population_jeune'], 
+                          100 - derniere_annee['population_jeune'] - derniere_annee['population_agee'],
+                          derniere_annee['population_agee']]
+        }
+        return px.pie(pd.DataFrame(ages_data), 
+                     values='Pourcentage', 
+                     names='Tranche',
+                     title='Structure de la Population par Âge (%)',
+                     color_discrete_sequence=['#0055A4', '#EF4135', '#FFD100'])
+    
+    def fig_pib_secteurs(self, df):
+        return px.pie(df, 
+                     values='poids_pib', 
+                     names='secteur',
+                     title='Répartition du PIB par Secteur (%)',
+                     color='secteur',
+                     color_discrete_map=self.secteurs.couleurs)
+    
+    def fig_croissance_secteurs(self, df):
+        fig = px.bar(df, 
+                    x='secteur', 
+                    y='croissance',
+                    title='Taux de Croissance par Secteur (%)',
+                    color='secteur',
+                    color_discrete_map=self.secteurs.couleurs)
+        fig.add_hline(y=0, line_dash="dash", line_color="red")
+        return fig
+    
+    def fig_emplois_secteurs(self, df):
+        return px.bar(df, 
+                     x='secteur', 
+                     y='emplois',
+                     title='Nombre d\'Emplois par Secteur',
+                     color='secteur',
+                     color_discrete_map=self.secteurs.couleurs)
+    
+    def fig_part_emploi_secteurs(self, df):
+        return px.pie(df, 
+                     values='part_emploi_total', 
+                     names='secteur',
+                     title='Répartition de l\'Emploi par Secteur (%)',
+                     color='secteur',
+                     color_discrete_map=self.secteurs.couleurs)
+    
+    def fig_arrivees_touristes(self, df):
+        return px.line(df, 
+                      x='date', 
+                      y='arrivees_touristes',
+                      title='Évolution des Arrivées Touristiques Mensuelles',
+                      color_discrete_sequence=['#EF4135'])
+    
+    def fig_recettes_tourisme(self, df):
+        return px.line(df, 
+                      x='date', 
+                      y='recettes_tourisme',
+                      title='Évolution des Recettes Touristiques (Millions EUR)',
+                      color_discrete_sequence=['#0055A4'])
+    
+    def fig_part_renouvelable(self, df):
+        fig = px.line(df, 
+                     x='date', 
+                     y='part_renouvelable',
+                     title='Évolution de la Part des Énergies Renouvelables (%)',
+                     color_discrete_sequence=['#28a745'])
+        fig.update_layout(yaxis_tickformat='.0%')
+        return fig
+    
+    def fig_mix_production(self, df):
+        derniere_data = df.iloc[-1]
+        production_data = {
+            'Type': ['Solaire', 'Éolien', 'Biomasse', 'Hydraulique', 'Fossile'],
+            'Production': [
+                derniere_data['production_solaire'],
+                derniere_data['production_eolien'],
+                derniere_data['production_biomasse'],
+                derniere_data['production_hydraulique'],
+                derniere_data['production_totale_mwh'] - (derniere_data['production_solaire'] + 
+                                                       derniere_data['production_eolien'] + 
+                                                       derniere_data['production_biomasse'] + 
+                                                       derniere_data['production_hydraulique'])
+            ]
+        }
+        return px.pie(pd.DataFrame(production_data), 
+                     values='Production', 
+                     names='Type',
+                     title='Mix de Production Électrique',
+                     color_discrete_sequence=['#FFD100', '#00A3E0', '#28a745', '#0055A4', '#6c757d'])
+    
+    @timed
     def create_economic_overview(self):
         """Crée la vue d'ensemble économique"""
         st.markdown('<h3 class="section-header">🏛️ VUE D\'ENSEMBLE ÉCONOMIQUE</h3>', 
                    unsafe_allow_html=True)
         
-        tab1, tab2, tab3, tab4 = st.tabs(["Indicateurs Macro", "Secteurs Économiques", "Commerce Extérieur", "Démographie"])
+        tab1, tab2, tab3, tab4, tab5 = self.create_tabs(["Indicateurs Macro", "Secteurs Économiques", "Commerce Extérieur", "Démographie", "Trimestriel & Annuel"], key='onglets_economie')
         
         with tab1:
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                # Évolution du PIB
-                fig = px.line(self.economic_data, 
-                             x='date', 
-                             y='croissance_pib',
-                             title='Évolution de la Croissance du PIB (%)',
-                             color_discrete_sequence=['#0055A4'])
-                fig.add_hline(y=0, line_dash="dash", line_color="red")
-                st.plotly_chart(fig, use_container_width=True)
-            
-            with col2:
-                # Inflation et chômage
-                fig = make_subplots(specs=[[{"secondary_y": True}]])
-                fig.add_trace(
-                    go.Scatter(x=self.economic_data['date'], y=self.economic_data['inflation'],
-                              name="Inflation", line=dict(color='#EF4135')),
-                    secondary_y=False,
-                )
-                fig.add_trace(
-                    go.Scatter(x=self.economic_data['date'], y=self.economic_data['taux_chomage'],
-                              name="Chômage", line=dict(color='#0055A4')),
-                    secondary_y=True,
-                )
-                fig.update_layout(title_text="Inflation et Taux de Chômage")
-                fig.update_yaxes(title_text="Inflation (%)", secondary_y=False)
-                fig.update_yaxes(title_text="Chômage (%)", secondary_y=True)
-                st.plotly_chart(fig, use_container_width=True)
+            if self.is_open(tab1):
+                col1, col2 = st.columns(2)
+                
+                with col1:
+                    # Évolution du PIB
+                    self.plot_series('croissance_pib', 'economic', self.fig_croissance_pib, ['croissance_pib'], projection=True)
+                
+                with col2:
+                    # Inflation et chômage
+                    self.plot_series('inflation_chomage', 'economic', self.fig_inflation_chomage, ['inflation', 'taux_chomage'])
         
         with tab2:
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                # Répartition du PIB par secteur
-                secteur_data = []
-                for secteur, info in self.secteurs.items():
-                    secteur_data.append({
-                        'secteur': secteur,
-                        'poids_pib': info['poids_pib'],
-                        'croissance': info['croissance'],
-                        'emplois': info['emplois']
-                    })
+            if self.is_open(tab2):
+                col1, col2 = st.columns(2)
                 
-                df_secteurs = pd.DataFrame(secteur_data)
-                fig = px.pie(df_secteurs, 
-                            values='poids_pib', 
-                            names='secteur',
-                            title='Répartition du PIB par Secteur (%)',
-                            color='secteur',
-                            color_discrete_map={secteur: info['couleur'] for secteur, info in self.secteurs.items()})
-                st.plotly_chart(fig, use_container_width=True)
-            
-            with col2:
-                # Croissance par secteur
-                fig = px.bar(df_secteurs, 
-                            x='secteur', 
-                            y='croissance',
-                            title='Taux de Croissance par Secteur (%)',
-                            color='secteur',
-                            color_discrete_map={secteur: info['couleur'] for secteur, info in self.secteurs.items()})
-                fig.add_hline(y=0, line_dash="dash", line_color="red")
-                st.plotly_chart(fig, use_container_width=True)
+                with col1:
+                    # Répartition du PIB par secteur
+                    self.show_figure('pib_secteurs', 'secteurs', self.fig_pib_secteurs)
+                
+                with col2:
+                    # Croissance par secteur
+                    self.show_figure('croissance_secteurs', 'secteurs', self.fig_croissance_secteurs)
         
         with tab3:
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                # Évolution du commerce extérieur
-                fig = px.line(self.economic_data, 
-                             x='date', 
-                             y=['exportations', 'importations'],
-                             title='Évolution des Exportations et Importations (Milliards EUR)',
-                             color_discrete_map={'exportations': '#28a745', 'importations': '#EF4135'})
-                st.plotly_chart(fig, use_container_width=True)
-            
-            with col2:
-                # Balance commerciale structurellement déficitaire
-                fig = px.area(self.economic_data, 
-                             x='date', 
-                             y='balance_commerciale',
-                             title='Balance Commerciale (Milliards EUR)',
-                             color_discrete_sequence=['#EF4135'])
-                fig.add_hline(y=0, line_dash="dash", line_color="red")
-                st.plotly_chart(fig, use_container_width=True)
+            if self.is_open(tab3):
+                col1, col2 = st.columns(2)
+                
+                with col1:
+                    # Évolution du commerce extérieur
+                    self.plot_series('commerce_exterieur', 'economic', self.fig_commerce_exterieur, ['exportations', 'importations'])
+                
+                with col2:
+                    # Balance commerciale structurellement déficitaire
+                    self.plot_series('balance_commerciale', 'economic', self.fig_balance_commerciale, ['balance_commerciale'])
         
         with tab4:
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                # Évolution démographique
-                fig = px.line(self.demographic_data, 
-                             x='date', 
-                             y='population',
-                             title='Évolution de la Population',
-                             color_discrete_sequence=['#0055A4'])
-                st.plotly_chart(fig, use_container_width=True)
-            
-            with col2:
-                # Structure par âge
-                derniere_annee = self.demographic_data.iloc[-1]
-                ages_data = {
-                    'Tranche': ['0-25 ans', '25-65 ans', '65+ ans'],
-                    'Pourcentage': [derniere_annee['population_jeune'], 
-                                  100 - derniere_annee['population_jeune'] - derniere_annee['population_agee'],
-                                  derniere_annee['population_agee']]
-                }
-                df_ages = pd.DataFrame(ages_data)
-                fig = px.pie(df_ages, 
-                            values='Pourcentage', 
-                            names='Tranche',
-                            title='Structure de la Population par Âge (%)',
-                            color_discrete_sequence=['#0055A4', '#EF4135', '#FFD100'])
-                st.plotly_chart(fig, use_container_width=True)
+            if self.is_open(tab4):
+                col1, col2 = st.columns(2)
+                
+                with col1:
+                    # Évolution démographique
+                    self.show_figure('population', 'demographic', self.fig_population)
+                
+                with col2:
+                    # Structure par âge
+                    self.show_figure('structure_ages', 'demographic', self.fig_structure_ages)
+        
+        with tab5:
+            if self.is_open(tab5):
+                freq = st.radio("Période d'agrégation", ['Q', 'Y'], horizontal=True, key='rollup_frequence',
+                                format_func=lambda f: {'Q': 'Trimestre', 'Y': 'Année'}[f])
+                rollup = self.rollups('economic')[freq]
+                table = self.filter_rollup(rollup.table())
+                if not len(table):
+                    st.info("Aucune donnée pour les filtres sélectionnés")
+                else:
+                    fig = get_figure_cache().get_or_build(
+                        'croissance_par_periode', 'economic', self.dataset_version('economic'),
+                        (self.periode, freq), lambda: self.fig_croissance_par_periode(table))
+                    self.plotly_chart(fig, use_container_width=True)
+                    
+                    # Variations sur un an de chaque indicateur, des périodes les plus récentes
+                    variations = self.filter_rollup(rollup.year_change()).tail(8).iloc[::-1]
+                    variations.index = variations.index.astype(str)
+                    st.markdown("**Variations sur un an**")
+                    st.dataframe(variations.style.format("{:+.2f}", na_rep="–"), use_container_width=True)
     
+    @timed
     def create_sectors_analysis(self):
         """Analyse détaillée par secteur"""
         st.markdown('<h3 class="section-header">🏢 ANALYSE PAR SECTEUR DÉTAILLÉE</h3>', 
                    unsafe_allow_html=True)
         
-        tab1, tab2, tab3 = st.tabs(["Performance Secteurs", "Emploi par Secteur", "Entreprises Clés"])
+        tab1, tab2, tab3 = self.create_tabs(["Performance Secteurs", "Emploi par Secteur", "Entreprises Clés"], key='onglets_secteurs')
         
         with tab1:
-            # Sélection du secteur à analyser
-            secteur_selectionne = st.selectbox("Sélectionnez un secteur:", 
-                                             list(self.secteurs.keys()))
-            
-            if secteur_selectionne:
-                info_secteur = self.secteurs[secteur_selectionne]
+            if self.is_open(tab1):
+                # Sélection du secteur à analyser
+                catalogue = self.secteurs
+                secteur_selectionne = st.selectbox("Sélectionnez un secteur:", 
+                                                 list(self.get_dataset('secteurs')['secteur']))
                 
-                col1, col2, col3 = st.columns(3)
+                if secteur_selectionne:
+                    i = catalogue.position[secteur_selectionne]
+                    
+                    col1, col2, col3 = st.columns(3)
+                    
+                    with col1:
+                        st.metric(
+                            "Poids dans le PIB",
+                            f"{catalogue.poids_pib[i]:.1f}%",
+                            f"{catalogue.delta_poids[i]:.1f}% vs année précédente"
+                        )
+                    
+                    with col2:
+                        st.metric(
+                            "Taux de Croissance",
+                            f"{catalogue.croissance[i]:.1f}%",
+                            f"{catalogue.delta_croissance[i]:.1f}% vs année précédente"
+                        )
+                    
+                    with col3:
+                        st.metric(
+                            "Emplois Directs",
+                            f"{catalogue.emplois[i]:,}",
+                            f"{catalogue.delta_emplois[i]:+,} vs année précédente"
+                        )
+                    
+                    st.markdown(f"**📋 Description:** {catalogue.description[i]}")
+                    st.markdown(f"**🔮 Perspectives:** {catalogue.perspectives[i]}")
+                    
+                    # Entreprises clés
+                    st.markdown("**🏢 Entreprises Clés:**")
+                    for entreprise in catalogue.entreprises_cles[i]:
+                        st.markdown(f"- {entreprise}")
+                    
+                    # Sous-secteurs (nomenclature hiérarchique) : part de l'emploi du secteur
+                    sous_secteurs = catalogue.frame(catalogue.children(i))
+                    if len(sous_secteurs):
+                        st.markdown("**🔎 Sous-secteurs:**")
+                        st.dataframe(sous_secteurs, use_container_width=True, hide_index=True)
+        
+        with tab2:
+            if self.is_open(tab2):
+                # Emploi par secteur
+                col1, col2 = st.columns(2)
                 
                 with col1:
-                    st.metric(
-                        "Poids dans le PIB",
-                        f"{info_secteur['poids_pib']}%",
-                        f"{random.uniform(-0.3, 0.4):.1f}% vs année précédente"
-                    )
+                    self.show_figure('emplois_secteurs', 'secteurs', self.fig_emplois_secteurs)
                 
                 with col2:
-                    st.metric(
-                        "Taux de Croissance",
-                        f"{info_secteur['croissance']}%",
-                        f"{random.uniform(-1, 1.5):.1f}% vs année précédente"
-                    )
-                
-                with col3:
-                    st.metric(
-                        "Emplois Directs",
-                        f"{info_secteur['emplois']:,}",
-                        f"{random.randint(-500, 1500):+,} vs année précédente"
-                    )
-                
-                st.markdown(f"**📋 Description:** {info_secteur['description']}")
-                st.markdown(f"**🔮 Perspectives:** {info_secteur['perspectives']}")
-                
-                # Entreprises clés
-                st.markdown("**🏢 Entreprises Clés:**")
-                for entreprise in info_secteur['entreprises_cles']:
-                    st.markdown(f"- {entreprise}")
-        
-        with tab2:
-            # Emploi par secteur
-            emploi_data = []
-            for secteur, info in self.secteurs.items():
-                emploi_data.append({
-                    'secteur': secteur,
-                    'emplois': info['emplois'],
-                    'part_emploi_total': (info['emplois'] / sum([s['emplois'] for s in self.secteurs.values()])) * 100
-                })
-            
-            df_emploi = pd.DataFrame(emploi_data)
-            
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                fig = px.bar(df_emploi, 
-                            x='secteur', 
-                            y='emplois',
-                            title='Nombre d\'Emplois par Secteur',
-                            color='secteur',
-                            color_discrete_map={secteur: info['couleur'] for secteur, info in self.secteurs.items()})
-                st.plotly_chart(fig, use_container_width=True)
-            
-            with col2:
-                fig = px.pie(df_emploi, 
-                            values='part_emploi_total', 
-                            names='secteur',
-                            title='Répartition de l\'Emploi par Secteur (%)',
-                            color='secteur',
-                            color_discrete_map={secteur: info['couleur'] for secteur, info in self.secteurs.items()})
-                st.plotly_chart(fig, use_container_width=True)
+                    self.show_figure('part_emploi_secteurs', 'secteurs', self.fig_part_emploi_secteurs)
         
         with tab3:
-            # Carte des entreprises réunionnaises
-            st.subheader("Carte des Principales Entreprises Réunionnaises")
-            
-            entreprises_data = []
-            for secteur, info in self.secteurs.items():
-                for entreprise in info['entreprises_cles']:
-                    entreprises_data.append({
-                        'entreprise': entreprise,
-                        'secteur': secteur,
-                        'chiffre_affaires_estime': random.uniform(5, 300),  # Millions EUR
-                        'employes': random.randint(50, 3000),
-                        'localisation': random.choice(['Saint-Denis', 'Saint-Pierre', 'Le Port', 'Saint-Paul', 'Saint-André'])
-                    })
-            
-            df_entreprises = pd.DataFrame(entreprises_data)
-            st.dataframe(df_entreprises, use_container_width=True)
+            if self.is_open(tab3):
+                # Carte des entreprises réunionnaises
+                st.subheader("Carte des Principales Entreprises Réunionnaises")
+                
+                df_entreprises = self.secteurs.companies(self.sector_positions())
+                st.dataframe(df_entreprises, use_container_width=True)
     
+    @timed
     def create_tourism_analysis(self):
         """Analyse détaillée du tourisme"""
         st.markdown('<h3 class="section-header">🏖️ ANALYSE DU SECTEUR TOURISTIQUE</h3>', 
                    unsafe_allow_html=True)
         
-        tab1, tab2, tab3 = st.tabs(["Performance Touristique", "Marchés Émetteurs", "Infrastructures"])
+        tab1, tab2, tab3 = self.create_tabs(["Performance Touristique", "Marchés Émetteurs", "Infrastructures"], key='onglets_tourisme')
         
         with tab1:
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                # Arrivées touristiques
-                fig = px.line(self.tourism_data, 
-                             x='date', 
-                             y='arrivees_touristes',
-                             title='Évolution des Arrivées Touristiques Mensuelles',
-                             color_discrete_sequence=['#EF4135'])
-                st.plotly_chart(fig, use_container_width=True)
-            
-            with col2:
-                # Recettes touristiques
-                fig = px.line(self.tourism_data, 
-                             x='date', 
-                             y='recettes_tourisme',
-                             title='Évolution des Recettes Touristiques (Millions EUR)',
-                             color_discrete_sequence=['#0055A4'])
-                st.plotly_chart(fig, use_container_width=True)
+            if self.is_open(tab1):
+                col1, col2 = st.columns(2)
+                
+                with col1:
+                    # Arrivées touristiques
+                    self.plot_series('arrivees_touristes', 'tourism', self.fig_arrivees_touristes, ['arrivees_touristes'], projection=True)
+                
+                with col2:
+                    # Recettes touristiques
+                    self.plot_series('recettes_tourisme', 'tourism', self.fig_recettes_tourisme, ['recettes_tourisme'])
         
         with tab2:
-            # Analyse des marchés émetteurs
-            marches_data = {
-                'Marché': ['France Métropolitaine', 'Mayotte', 'Maurice', 'Afrique du Sud', 'Europe', 'Autres'],
-                'Part_Marché': [65, 12, 8, 5, 7, 3],
-                'Croissance': [4.2, 8.7, 6.1, 12.3, 5.8, 9.4]
-            }
-            
-            df_marches = pd.DataFrame(marches_data)
-            
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                fig = px.pie(df_marches, 
-                            values='Part_Marché', 
-                            names='Marché',
-                            title='Répartition des Marchés Émetteurs (%)',
-                            color_discrete_sequence=px.colors.qualitative.Set3)
-                st.plotly_chart(fig, use_container_width=True)
-            
-            with col2:
-                fig = px.bar(df_marches, 
-                            x='Marché', 
-                            y='Croissance',
-                            title='Croissance par Marché Émetteur (%)',
-                            color='Croissance',
-                            color_continuous_scale='Viridis')
-                st.plotly_chart(fig, use_container_width=True)
+            if self.is_open(tab2):
+                # Analyse des marchés émetteurs
+                statique = get_static_content(self.engine.seed)
+                col1, col2 = st.columns(2)
+                
+                with col1:
+                    self.plotly_chart(statique.figures['marches_repartition'], use_container_width=True)
+                
+                with col2:
+                    self.plotly_chart(statique.figures['marches_croissance'], use_container_width=True)
         
         with tab3:
-            st.subheader("Infrastructures Touristiques")
-            
-            infrastructures = [
-                {'Type': 'Hôtels', 'Nombre': 125, 'Capacité': '15,000 chambres', 'Taux Occupation': '68%'},
-                {'Type': 'Résidences de tourisme', 'Nombre': 85, 'Capacité': '3,200 appartements', 'Taux Occupation': '62%'},
-                {'Type': 'Gîtes et meublés', 'Nombre': 1200, 'Capacité': '8,500 lits', 'Taux Occupation': '58%'},
-                {'Type': 'Campings', 'Nombre': 25, 'Capacité': '1,200 emplacements', 'Taux Occupation': '72%'},
-                {'Type': 'Restaurants', 'Nombre': 1800, 'Capacité': '85,000 couverts', 'Taux Occupation': '65%'},
-            ]
-            
-            for infra in infrastructures:
-                with st.expander(f"🏨 {infra['Type']} - {infra['Capacité']}"):
-                    st.write(f"**Nombre:** {infra['Nombre']}")
-                    st.write(f"**Taux d'occupation:** {infra['Taux Occupation']}")
-                    st.write(f"**Tendance:** {random.choice(['En hausse', 'Stable', 'En baisse modérée'])}")
+            if self.is_open(tab3):
+                st.subheader("Infrastructures Touristiques")
+                
+                for infra in get_static_content(self.engine.seed).infrastructures:
+                    with st.expander(f"🏨 {infra['Type']} - {infra['Capacité']}"):
+                        st.write(f"**Nombre:** {infra['Nombre']}")
+                        st.write(f"**Taux d'occupation:** {infra['Taux Occupation']}")
+                        st.write(f"**Tendance:** {infra['Tendance']}")
     
+    @timed
     def create_energy_analysis(self):
         """Analyse de la transition énergétique"""
         st.markdown('<h3 class="section-header">⚡ TRANSITION ÉNERGÉTIQUE</h3>', 
                    unsafe_allow_html=True)
         
-        tab1, tab2, tab3 = st.tabs(["Mix Énergétique", "Énergies Renouvelables", "Projets"])
+        tab1, tab2, tab3 = self.create_tabs(["Mix Énergétique", "Énergies Renouvelables", "Projets"], key='onglets_energie')
         
         with tab1:
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                # Évolution de la part renouvelable
-                fig = px.line(self.energy_data, 
-                             x='date', 
-                             y='part_renouvelable',
-                             title='Évolution de la Part des Énergies Renouvelables (%)',
-                             color_discrete_sequence=['#28a745'])
-                fig.update_layout(yaxis_tickformat='.0%')
-                st.plotly_chart(fig, use_container_width=True)
-            
-            with col2:
-                # Production par type d'énergie
-                derniere_data = self.energy_data.iloc[-1]
-                production_data = {
-                    'Type': ['Solaire', 'Éolien', 'Biomasse', 'Hydraulique', 'Fossile'],
-                    'Production': [
-                        derniere_data['production_solaire'],
-                        derniere_data['production_eolien'],
-                        derniere_data['production_biomasse'],
-                        derniere_data['production_hydraulique'],
-                        derniere_data['production_totale_mwh'] - (derniere_data['production_solaire'] + 
-                                                               derniere_data['production_eolien'] + 
-                                                               derniere_data['production_biomasse'] + 
-                                                               derniere_data['production_hydraulique'])
-                    ]
-                }
+            if self.is_open(tab1):
+                col1, col2 = st.columns(2)
                 
-                df_production = pd.DataFrame(production_data)
-                fig = px.pie(df_production, 
-                            values='Production', 
-                            names='Type',
-                            title='Mix de Production Électrique',
-                            color_discrete_sequence=['#FFD100', '#00A3E0', '#28a745', '#0055A4', '#6c757d'])
-                st.plotly_chart(fig, use_container_width=True)
-        
-        with tab2:
-            # Projets d'énergies renouvelables
-            projets_energie = [
-                {'Nom': 'Centrale photovoltaïque du Gol', 'Type': 'Solaire', 'Puissance': '10 MW', 'Avancement': '95%'},
-                {'Nom': 'Parc éolien de Sainte-Rose', 'Type': 'Éolien', 'Puissance': '12 MW', 'Avancement': '75%'},
-                {'Nom': 'Unité de méthanisation du Tampon', 'Type': 'Biomasse', 'Puissance': '5 MW', 'Avancement': '60%'},
-                {'Nom': 'Centrale biomasse de Bois Rouge', 'Type': 'Biomasse', 'Puissance': '40 MW', 'Avancement': '85%'},
-                {'Nom': 'Centrale hydroélectrique de Takamaka', 'Type': 'Hydraulique', 'Puissance': '7 MW', 'Avancement': '100%'},
-            ]
-            
-            for projet in projets_energie:
-                col1, col2, col3 = st.columns([3, 2, 1])
                 with col1:
-                    st.write(f"**{projet['Nom']}**")
-                    st.write(f"Type: {projet['Type']} - {projet['Puissance']}")
+                    # Évolution de la part renouvelable
+                    self.plot_series('part_renouvelable', 'energy', self.fig_part_renouvelable, ['part_renouvelable'], projection=True)
+                
                 with col2:
-                    st.write(f"Statut: {projet['Avancement']}")
-                with col3:
-                    progress = int(projet['Avancement'].replace('%', ''))
-                    st.progress(progress/100)
+                    # Production par type d'énergie
+                    self.show_figure('mix_production', 'energy', self.fig_mix_production)
+        
+        with tab2:
+            if self.is_open(tab2):
+                # Projets d'énergies renouvelables
+                for projet in get_static_content(self.engine.seed).projets_energie:
+                    col1, col2, col3 = st.columns([3, 2, 1])
+                    with col1:
+                        st.write(f"**{projet['Nom']}**")
+                        st.write(f"Type: {projet['Type']} - {projet['Puissance']}")
+                    with col2:
+                        st.write(f"Statut: {projet['Avancement']}")
+                    with col3:
+                        st.progress(projet['Progression'])
         
         with tab3:
-            st.subheader("Objectifs de Transition Énergétique")
-            
-            objectifs = {
-                'Année': ['2020', '2023', '2025', '2030'],
-                'Part_ENR': [35, 45, 60, 75],
-                'Autonomie_energetique': [25, 35, 50, 65],
-                'Reduction_GES': [15, 25, 40, 60]
-            }
-            
-            df_objectifs = pd.DataFrame(objectifs)
-            
-            fig = px.line(df_objectifs, 
-                         x='Année', 
-                         y=['Part_ENR', 'Autonomie_energetique', 'Reduction_GES'],
-                         title='Objectifs de Transition Énergétique (%)',
-                         markers=True,
-                         color_discrete_map={'Part_ENR': '#28a745', 'Autonomie_energetique': '#0055A4', 'Reduction_GES': '#EF4135'})
-            st.plotly_chart(fig, use_container_width=True)
+            if self.is_open(tab3):
+                st.subheader("Objectifs de Transition Énergétique")
+                
+                self.plotly_chart(get_static_content(self.engine.seed).figures['objectifs_transition'],
+                                use_container_width=True)
+    
+    @timed
+    def create_scenarios_analysis(self):
+        """Crée la vue des scénarios simulés (graphiques en éventail)"""
+        st.markdown('<h3 class="section-header">🎲 SCÉNARIOS SIMULÉS</h3>', 
+                   unsafe_allow_html=True)
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            n_scenarios = st.select_slider("Nombre de scénarios", [1000, 2000, 5000, 10000, 20000],
+                                           value=5000, key='scenarios_nombre')
+        with col2:
+            probabilite_choc = st.slider("Probabilité d'un choc de type COVID (%)", 0, 50, 10,
+                                         key='scenarios_choc') / 100
+        
+        # Les trajectoires partent du dernier mois de la série live
+        debut = pd.Timestamp(self.economic_store.last('date')) + pd.offsets.MonthEnd(1)
+        pib_initial = float(self.economic_store.last('pib_mensuel'))
+        with st.spinner("Simulation des scénarios..."):
+            resultats = simuler_scenarios(self.engine.seed, debut, n_scenarios, probabilite_choc, pib_initial)
+        st.caption(f"{n_scenarios:,} trajectoires sur {HORIZON_SCENARIOS} mois à partir de {debut:%m/%Y} "
+                   f"— bandes 5-95 % et 25-75 %, médiane en trait plein")
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            self.plotly_chart(self.fig_eventail(resultats['pib_mensuel'], "PIB Mensuel Simulé", '#0055A4'),
+                            use_container_width=True)
+        with col2:
+            self.plotly_chart(self.fig_eventail(resultats['croissance_pib'], "Croissance du PIB Simulée (%)", '#0055A4'),
+                            use_container_width=True)
+        col1, col2 = st.columns(2)
+        with col1:
+            self.plotly_chart(self.fig_eventail(resultats['arrivees_touristes'], "Arrivées Touristiques Simulées", '#EF4135'),
+                            use_container_width=True)
+        with col2:
+            self.plotly_chart(self.fig_eventail(resultats['part_renouvelable'], "Part Renouvelable Simulée", '#28a745'),
+                            use_container_width=True)
     
+    @timed
     def create_regional_analysis(self):
         """Analyse par micro-régions"""
         st.markdown('<h3 class="section-header">🗺️ ANALYSE PAR MICRO-RÉGIONS</h3>', 
                    unsafe_allow_html=True)
         
         # Données par micro-région
-        micro_regions_data = {
-            'Micro-région': ['Nord', 'Ouest', 'Sud', 'Est', 'Cirques'],
-            'Population': [215000, 185000, 205000, 130000, 75000],
-            'PIB_Regional': [6.2, 5.1, 4.8, 3.2, 1.2],
-            'Taux_Chomage': [20.1, 22.5, 24.8, 26.2, 28.5],
-            'Activite_Principale': ['Services/Admin', 'Tourisme/Commerce', 'Tourisme/Agriculture', 'Agriculture', 'Agriculture'],
-            'Croissance': [3.2, 4.1, 3.8, 2.5, 1.8]
-        }
+        statique = get_static_content(self.engine.seed)
         
-        df_regions = pd.DataFrame(micro_regions_data)
-        
-        tab1, tab2, tab3 = st.tabs(["Carte Économique", "Spécialisations", "Développement Territorial"])
+        tab1, tab2, tab3 = self.create_tabs(["Carte Économique", "Spécialisations", "Développement Territorial"], key='onglets_regions')
         
         with tab1:
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                # PIB par micro-région
-                fig = px.bar(df_regions, 
-                            x='Micro-région', 
-                            y='PIB_Regional',
-                            title='PIB par Micro-région (Milliards EUR)',
-                            color='Micro-région',
-                            color_discrete_sequence=px.colors.qualitative.Set3)
-                st.plotly_chart(fig, use_container_width=True)
-            
-            with col2:
-                # Chômage par micro-région
-                fig = px.bar(df_regions, 
-                            x='Micro-région', 
-                            y='Taux_Chomage',
-                            title='Taux de Chômage par Micro-région (%)',
-                            color='Taux_Chomage',
-                            color_continuous_scale='Reds')
-                st.plotly_chart(fig, use_container_width=True)
+            if self.is_open(tab1):
+                col1, col2 = st.columns(2)
+                
+                with col1:
+                    # PIB par micro-région
+                    self.plotly_chart(statique.figures['regions_pib'], use_container_width=True)
+                
+                with col2:
+                    # Chômage par micro-région
+                    self.plotly_chart(statique.figures['regions_chomage'], use_container_width=True)
         
         with tab2:
-            st.subheader("Spécialisations Régionales")
-            
-            specialisations = {
-                'Nord': ['Administration', 'Services', 'Enseignement supérieur', 'Santé'],
-                'Ouest': ['Tourisme balnéaire', 'Commerce', 'Immobilier', 'Services'],
-                'Sud': ['Tourisme nature', 'Agriculture', 'Artisanat', 'Énergie renouvelable'],
-                'Est': ['Agriculture', 'Pêche', 'Énergie', 'Industrie'],
-                'Cirques': ['Agriculture de montagne', 'Tourisme rural', 'Artisanat', 'Produits locaux']
-            }
-            
-            for region, specialites in specialisations.items():
-                with st.expander(f"🏞️ {region}"):
-                    for specialite in specialites:
-                        st.markdown(f"- {specialite}")
+            if self.is_open(tab2):
+                st.subheader("Spécialisations Régionales")
+                
+                for region, specialites in statique.specialisations.items():
+                    with st.expander(f"🏞️ {region}"):
+                        for specialite in specialites:
+                            st.markdown(f"- {specialite}")
         
         with tab3:
-            st.subheader("Projets de Développement Territorial")
-            
-            projets_regionaux = [
-                {'Nom': 'NEO Réunion', 'Région': 'Toute l\'île', 'Budget': '2.1 Md€', 'Échéance': '2030'},
-                {'Nom': 'Tram-Train', 'Région': 'Nord-Ouest', 'Budget': '1.7 Md€', 'Échéance': '2028'},
-                {'Nom': 'Pôle d\'excellence rural', 'Région': 'Cirques', 'Budget': '150 M€', 'Échéance': '2026'},
-                {'Nom': 'Zone industrialo-portuaire', 'Région': 'Ouest', 'Budget': '300 M€', 'Échéance': '2027'},
-                {'Nom': 'Pôle de compétitivité numérique', 'Région': 'Nord', 'Budget': '80 M€', 'Échéance': '2025'},
-            ]
-            
-            for projet in projets_regionaux:
-                col1, col2, col3 = st.columns([3, 2, 1])
-                with col1:
-                    st.write(f"**{projet['Nom']}**")
-                    st.write(f"Région: {projet['Région']}")
-                with col2:
-                    st.write(f"Budget: {projet['Budget']}")
-                with col3:
-                    progress = random.randint(15, 65)
-                    st.write(f"Progression: {progress}%")
-                    st.progress(progress/100)
+            if self.is_open(tab3):
+                st.subheader("Projets de Développement Territorial")
+                
+                for projet in statique.projets_regionaux:
+                    col1, col2, col3 = st.columns([3, 2, 1])
+                    with col1:
+                        st.write(f"**{projet['Nom']}**")
+                        st.write(f"Région: {projet['Région']}")
+                    with col2:
+                        st.write(f"Budget: {projet['Budget']}")
+                    with col3:
+                        st.write(f"Progression: {projet['Progression']}%")
+                        st.progress(projet['Progression']/100)
     
+    @timed
     def create_sidebar(self):
         """Crée la sidebar avec les contrôles"""
         st.sidebar.markdown("## 🎛️ CONTRÔLES D'ANALYSE")
@@ -905,20 +1252,61 @@ class ReunionDashboard:
         st.sidebar.markdown("### 🏢 Filtres sectoriels")
         secteurs_selectionnes = st.sidebar.multiselect(
             "Secteurs à afficher:",
-            list(self.secteurs.keys()),
-            default=list(self.secteurs.keys())[:4]
+            list(self.secteurs.codes[self.secteurs.level(0)]),
+            default=list(self.secteurs.codes[self.secteurs.level(0)][:4])
         )
         
         # Options d'affichage
         st.sidebar.markdown("### ⚙️ Options")
         auto_refresh = st.sidebar.checkbox("Rafraîchissement automatique", value=True)
         show_projections = st.sidebar.checkbox("Afficher les projections", value=True)
+        lazy_tabs = st.sidebar.checkbox("Construire uniquement l'onglet affiché", value=True,
+                                        help="Réduit le calcul et le volume envoyé au navigateur à chaque exécution")
+        diagnostic = st.sidebar.checkbox("🛠️ Panneau de diagnostic", value=False, key='diagnostic',
+                                         on_change=lambda: st.session_state.get('diagnostic') or stop_allocations(),
+                                         help="Temps, allocations et figures par section (ralentit l'exécution)")
         
         # Bouton de rafraîchissement manuel
         if st.sidebar.button("🔄 Rafraîchir les données"):
-            self.update_live_data()
+            get_live_scheduler().tick_now()
             st.rerun()
         
+        with st.sidebar.expander("🗄️ Cache des données"):
+            st.caption(f"Source: {self.source.describe()}")
+            if getattr(self.source, 'status', None):
+                st.dataframe(pd.DataFrame([{'dataset': nom, **etat} for nom, etat in self.source.status.items()]),
+                             hide_index=True, use_container_width=True)
+            if get_column_store() is not None:
+                st.caption(f"Stockage colonnaire: {STORE_DIR}")
+            ingestion = get_live_producer().live_ingestor if LIVE_SOURCE else None
+            if ingestion is not None:
+                stats = ingestion.stats.snapshot()
+                retard = f"{stats['retard_s']:.1f}s" if stats['retard_s'] is not None else "—"
+                st.caption(f"Ticks: {LIVE_SOURCE} — {stats['ajoutees']:,} ajoutés, {stats['rejetees']:,} rejetés, "
+                           f"{stats['lignes_par_s']:.2f} lignes/s, retard {retard}")
+            if isinstance(self.economic_store, SharedTickStore):
+                role = "producteur" if self.economic_store.is_writer else "lecteur"
+                st.caption(f"Série live partagée: {self.economic_store.racine} ({role})")
+            st.caption(f"Instantané: {self.engine.snapshot_id} (graine {self.engine.seed})")
+            st.dataframe(get_cache_stats().snapshot(), hide_index=True, use_container_width=True)
+            rapport = rapport_memoire(self.engine.seed, self.engine.date_debut, self.engine.date_fin)
+            st.caption(f"Mémoire des jeux de données: {rapport['octets_avant'].sum() / 1024:,.0f} Ko → "
+                       f"{rapport['octets_apres'].sum() / 1024:,.0f} Ko")
+            st.dataframe(rapport[['dataset', 'octets_avant', 'octets_apres']], hide_index=True,
+                         use_container_width=True)
+            durees = get_dataset_loader().timings
+            if durees:
+                st.caption("Construction initiale (s)")
+                st.dataframe(pd.DataFrame([{'dataset': nom, **duree} for nom, duree in durees.items()]).round(3),
+                             hide_index=True, use_container_width=True)
+            stats_figures = get_figure_cache().stats()
+            st.caption(f"Figures en cache: {stats_figures['figures']} "
+                       f"({stats_figures['hits']} hits, {stats_figures['miss']} miss, "
+                       f"{stats_figures['extensions']} prolongées)")
+        
+        # Rempli en fin d'exécution, une fois toutes les sections mesurées
+        self.diagnostic_panel = st.sidebar.expander("🛠️ Diagnostic", expanded=True) if diagnostic else None
+        
         # Informations La Réunion
         st.sidebar.markdown("---")
         st.sidebar.markdown("### 🇫🇷 LA RÉUNION")
@@ -933,35 +1321,56 @@ class ReunionDashboard:
         
         # Comparaison avec autres DROM
         st.sidebar.markdown("### 🌴 COMPARAISON DROM")
-        drom_comparison = {
-            'Réunion': {'PIB/hab': 23700, 'Croissance': 2.8, 'Chômage': 21.5},
-            'Martinique': {'PIB/hab': 24500, 'Croissance': 1.8, 'Chômage': 16.2},
-            'Guadeloupe': {'PIB/hab': 22100, 'Croissance': 2.1, 'Chômage': 19.8},
-            'Guyane': {'PIB/hab': 15300, 'Croissance': 3.5, 'Chômage': 23.1}
-        }
-        
-        for territoire, data in drom_comparison.items():
-            st.sidebar.metric(
-                territoire,
-                f"{data['PIB/hab']:,} EUR/hab",
-                f"{data['Croissance']}% croissance"
-            )
+        for territoire, valeur, delta in get_static_content(self.engine.seed).drom:
+            st.sidebar.metric(territoire, valeur, delta)
         
         return {
             'date_debut': date_debut,
             'date_fin': date_fin,
             'secteurs_selectionnes': secteurs_selectionnes,
             'auto_refresh': auto_refresh,
-            'show_projections': show_projections
+            'show_projections': show_projections,
+            'lazy_tabs': lazy_tabs
         }
 
     def run_dashboard(self):
         """Exécute le dashboard complet"""
-        # Mise à jour des données live
-        self.update_live_data()
+        start_run(allocations=st.session_state.get('diagnostic', False))
+        try:
+            self._run_dashboard()
+        finally:
+            # Libère le créneau de rafraîchissement réservé par poll_live_updates
+            jeton = st.session_state.pop('live_refresh_slot', None)
+            if jeton is not None:
+                get_live_scheduler().release_refresh(jeton)
+            end_run()
+            if METRICS_FILE:
+                write_prometheus(METRICS_FILE)
+    
+    def display_diagnostics(self):
+        """Affiche les mesures de l'exécution en cours dans le panneau de diagnostic"""
+        run = current_run()
+        if self.diagnostic_panel is None or run is None:
+            return
+        with self.diagnostic_panel:
+            st.caption("Mesures inclusives de l'exécution en cours (hors envoi au navigateur)")
+            lignes = pd.DataFrame(run.rows())
+            lignes['ms'] = (lignes.pop('secondes') * 1000).round(1)
+            lignes['serialisation_ms'] = (lignes.pop('serialisation_s') * 1000).round(1)
+            st.dataframe(lignes[['section', 'ms', 'appels', 'octets_alloues', 'figures', 'octets_figures',
+                                 'serialisation_ms']], hide_index=True, use_container_width=True)
+            st.download_button("📥 Métriques Prometheus", registre.prometheus(),
+                               file_name='metrics.prom', mime='text/plain')
+    
+    def _run_dashboard(self):
+        # Données live partagées par le processus
+        self.sync_live_data()
         
         # Sidebar
         controls = self.create_sidebar()
+        self.lazy_tabs = controls['lazy_tabs']
+        self.show_projections = controls['show_projections']
+        self.apply_filters(controls)
         
         # Header
         self.display_header()
@@ -970,124 +1379,138 @@ class ReunionDashboard:
         self.display_key_metrics()
         
         # Navigation par onglets
-        tab1, tab2, tab3, tab4, tab5, tab6, tab7 = st.tabs([
+        tab1, tab2, tab3, tab4, tab5, tab6, tab7, tab8 = self.create_tabs([
             "📈 Économie", 
             "🏢 Secteurs", 
             "🏖️ Tourisme", 
             "⚡ Énergie", 
             "🗺️ Régions",
+            "🎲 Scénarios",
             "💡 Défis",
             "ℹ️ À Propos"
-        ])
+        ], key='onglets_principaux')
         
         with tab1:
-            self.create_economic_overview()
+            if self.is_open(tab1):
+                self.create_economic_overview()
         
         with tab2:
-            self.create_sectors_analysis()
+            if self.is_open(tab2):
+                self.create_sectors_analysis()
         
         with tab3:
-            self.create_tourism_analysis()
+            if self.is_open(tab3):
+                self.create_tourism_analysis()
         
         with tab4:
-            self.create_energy_analysis()
+            if self.is_open(tab4):
+                self.create_energy_analysis()
         
         with tab5:
-            self.create_regional_analysis()
+            if self.is_open(tab5):
+                self.create_regional_analysis()
         
         with tab6:
-            st.markdown("## 💡 DÉFIS ET OPPORTUNITÉS")
-            
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                st.markdown("""
-                ### 🎯 POINTS FORTS
+            if self.is_open(tab6):
+                self.create_scenarios_analysis()
+        
+        with tab7:
+            if self.is_open(tab7):
+                st.markdown("## 💡 DÉFIS ET OPPORTUNITÉS")
+                
+                col1, col2 = st.columns(2)
                 
-                **💎 Atouts Naturels:**
-                - Biodiversité exceptionnelle
-                - Potentiel énergétique renouvelable important
-                - Attractivité touristique forte
+                with col1:
+                    st.markdown("""
+                    ### 🎯 POINTS FORTS
+                    
+                    **💎 Atouts Naturels:**
+                    - Biodiversité exceptionnelle
+                    - Potentiel énergétique renouvelable important
+                    - Attractivité touristique forte
+                    
+                    **👨‍💼 Capital Humain:**
+                    - Population jeune et dynamique
+                    - Système éducatif développé
+                    - Couverture sociale complète
+                    
+                    **🏗️ Infrastructures:**
+                    - Équipements publics de qualité
+                    - Réseaux de communication modernes
+                    - Projets structurants (NEO, Tram-Train)
+                    """)
+                
+                with col2:
+                    st.markdown("""
+                    ### 🚨 DÉFIS STRUCTURELS
+                    
+                    **⚡ Économie:**
+                    - Taux de chômage structurellement élevé
+                    - Déficit commercial important
+                    - Dépendance aux transferts publics
+                    
+                    **🌍 Insularité:**
+                    - Éloignement et coûts de transport
+                    - Dépendance énergétique
+                    - Vulnérabilité aux aléas climatiques
+                    
+                    **🏞️ Environnement:**
+                    - Préservation de la biodiversité
+                    - Gestion des déchets et ressources
+                    - Adaptation au changement climatique
+                    """)
                 
-                **👨‍💼 Capital Humain:**
-                - Population jeune et dynamique
-                - Système éducatif développé
-                - Couverture sociale complète
+                st.markdown("""
+                ### 📋 AXES STRATÉGIQUES
                 
-                **🏗️ Infrastructures:**
-                - Équipements publics de qualité
-                - Réseaux de communication modernes
-                - Projets structurants (NEO, Tram-Train)
+                1. **Transition Écologique:** Autonomie énergétique et économie verte
+                2. **Innovation:** Développement du numérique et des filières d'excellence
+                3. **Formation:** Adaptation des compétences aux besoins économiques
+                4. **Connectivité:** Amélioration des liaisons régionales et internationales
+                5. **Cohésion Sociale:** Réduction des inégalités territoriales
                 """)
-            
-            with col2:
+        
+        with tab8:
+            if self.is_open(tab8):
+                st.markdown("## 📋 À propos de ce dashboard")
                 st.markdown("""
-                ### 🚨 DÉFIS STRUCTURELS
+                Ce dashboard présente une analyse économique complète de La Réunion,
+                département et région d'outre-mer français dans l'océan Indien.
                 
-                **⚡ Économie:**
-                - Taux de chômage structurellement élevé
-                - Déficit commercial important
-                - Dépendance aux transferts publics
+                **Sources des données:**
+                - INSEE Réunion
+                - CEROM (Comptes Économiques Rapides de l'Outre-Mer)
+                - IEDOM La Réunion
+                - Observatoire du Tourisme de La Réunion
+                - Région Réunion
                 
-                **🌍 Insularité:**
-                - Éloignement et coûts de transport
-                - Dépendance énergétique
-                - Vulnérabilité aux aléas climatiques
+                **Période couverte:**
+                - Données historiques: 2014-2024
+                - Analyses sectorielles détaillées
+                - Projections et tendances
                 
-                **🏞️ Environnement:**
-                - Préservation de la biodiversité
-                - Gestion des déchets et ressources
-                - Adaptation au changement climatique
+                **⚠️ Note:** 
+                Les données présentées sont simulées pour la démonstration.
+                Les données réelles sont disponibles sur les sites officiels des institutions.
+                
+                **🔒 Confidentialité:** 
+                Toutes les données sensibles sont anonymisées.
+                """)
+                
+                st.markdown("---")
+                st.markdown("""
+                **📞 Contact:**
+                - INSEE Réunion: www.insee.fr
+                - Région Réunion: www.regionreunion.com
+                - Préfecture de La Réunion: www.reunion.gouv.fr
                 """)
-            
-            st.markdown("""
-            ### 📋 AXES STRATÉGIQUES
-            
-            1. **Transition Écologique:** Autonomie énergétique et économie verte
-            2. **Innovation:** Développement du numérique et des filières d'excellence
-            3. **Formation:** Adaptation des compétences aux besoins économiques
-            4. **Connectivité:** Amélioration des liaisons régionales et internationales
-            5. **Cohésion Sociale:** Réduction des inégalités territoriales
-            """)
         
-        with tab7:
-            st.markdown("## 📋 À propos de ce dashboard")
-            st.markdown("""
-            Ce dashboard présente une analyse économique complète de La Réunion,
-            département et région d'outre-mer français dans l'océan Indien.
-            
-            **Sources des données:**
-            - INSEE Réunion
-            - CEROM (Comptes Économiques Rapides de l'Outre-Mer)
-            - IEDOM La Réunion
-            - Observatoire du Tourisme de La Réunion
-            - Région Réunion
-            
-            **Période couverte:**
-            - Données historiques: 2014-2024
-            - Analyses sectorielles détaillées
-            - Projections et tendances
-            
-            **⚠️ Note:** 
-            Les données présentées sont simulées pour la démonstration.
-            Les données réelles sont disponibles sur les sites officiels des institutions.
-            
-            **🔒 Confidentialité:** 
-            Toutes les données sensibles sont anonymisées.
-            """)
-            
-            st.markdown("---")
-            st.markdown("""
-            **📞 Contact:**
-            - INSEE Réunion: www.insee.fr
-            - Région Réunion: www.regionreunion.com
-            - Préfecture de La Réunion: www.reunion.gouv.fr
-            """)
-        
-        # Rafraîchissement automatique
+        self.display_diagnostics()
+        
+        # Rafraîchissement automatique : un fragment léger surveille la version des
+        # données sans bloquer le thread de la session
         if controls['auto_refresh']:
-            time.sleep(30)  # Rafraîchissement toutes les 30 secondes
-            st.rerun()
+            st.fragment(self.poll_live_updates, run_every=LIVE_INTERVALLE_SECONDES)()
 
 # Lancement du dashboard
 if __name__ == "__main__":
@@ -0,0 +1,318 @@
+# benchmark.py
+"""Benchmark du dashboard, exécutable sans navigateur.
+
+Suites :
+- ``generateurs`` : boucles historiques vs générateurs vectorisés ;
+- ``dashboard`` : le constructeur, chaque ``initialize_*``, ``update_live_data`` sur N ticks,
+  chaque section ``create_*`` (temps, nombre de figures et taille sérialisée)
+  et la section économique après un tick, pour plusieurs longueurs d'historique.
+
+Les résultats sont écrits en JSON (``--json``) ; ``--reference`` compare à un
+fichier précédent et termine en erreur si une mesure régresse au-delà du seuil.
+
+Usage:
+    python benchmark.py
+    python benchmark.py --suites generateurs --tailles 100 10000 1000000 --repetitions 3
+    python benchmark.py --suites dashboard --historiques 120 1200 --ticks 50 --json resultats.json
+    python benchmark.py --json nouveau.json --reference resultats.json --seuil 1.2
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from data_engine import (generate_agriculture_data, generate_economic_data,
+                         generate_energy_data, generate_tourism_data)
+from headless import SECTIONS, capture_figures, import_dashboard
+
+
+# Implémentations historiques (une itération Python par ligne), conservées
+# comme référence pour mesurer le gain de la version vectorisée
+
+def legacy_economic_data(dates, rng):
+    data = []
+    for date in dates:
+        pib_base = 20.5
+        croissance_base = 2.8
+        if date.year == 2020:
+            covid_impact = rng.uniform(-0.08, -0.03)
+        elif date.year == 2021:
+            covid_impact = rng.uniform(-0.02, 0.02)
+        else:
+            covid_impact = rng.uniform(0.02, 0.06)
+        data.append({
+            'date': date,
+            'pib_mensuel': pib_base * (1 + croissance_base/100) ** ((date.year-2014)*12 + date.month-1),
+            'croissance_pib': croissance_base + covid_impact * 100,
+            'inflation': rng.uniform(1.5, 4.0),
+            'taux_chomage': rng.uniform(18.0, 24.0),
+            'revenu_median': rng.uniform(1800, 2200),
+            'exportations': rng.uniform(0.3, 0.6),
+            'importations': rng.uniform(4.5, 5.5),
+            'balance_commerciale': rng.uniform(-4.8, -4.2)
+        })
+    return pd.DataFrame(data)
+
+
+def legacy_tourism_data(dates, rng):
+    data = []
+    for date in dates:
+        if date.month in [7, 8, 12, 1]:
+            base_touristes = 120000
+        elif date.month in [2, 3, 9, 10]:
+            base_touristes = 80000
+        else:
+            base_touristes = 50000
+        if date.year == 2020 or (date.year == 2021 and date.month <= 6):
+            covid_factor = rng.uniform(0.02, 0.08)
+        elif date.year == 2021:
+            covid_factor = rng.uniform(0.2, 0.4)
+        elif date.year == 2022:
+            covid_factor = rng.uniform(0.6, 0.8)
+        else:
+            covid_factor = rng.uniform(0.9, 1.1)
+        touristes = base_touristes * covid_factor
+        data.append({
+            'date': date,
+            'arrivees_touristes': touristes,
+            'recettes_tourisme': touristes * rng.uniform(1500, 2200),
+            'duree_sejour_moyenne': rng.uniform(10, 16),
+            'taux_occupation_hotels': rng.uniform(0.5, 0.85) * covid_factor,
+            'principaux_marches': rng.choice(['France Métropolitaine', 'Mayotte', 'Maurice', 'Afrique du Sud'])
+        })
+    return pd.DataFrame(data)
+
+
+def legacy_agriculture_data(dates, rng):
+    produits = ['Canne à sucre', 'Fruits tropicaux', 'Viande bovine', 'Lait', 'Légumes', 'Fleurs']
+    data = []
+    for date in dates:
+        if date.month in [7, 8, 9]:
+            production_factor = 0.8
+        elif date.month in [1, 2, 3]:
+            production_factor = 1.2
+        else:
+            production_factor = 1.0
+        data.append({
+            'date': date,
+            'production_canne_tonnes': rng.uniform(1500000, 1800000) * production_factor,
+            'production_fruits_tonnes': rng.uniform(50000, 80000) * production_factor,
+            'production_viande_tonnes': rng.uniform(4000, 6000),
+            'prix_sucre_tonne': rng.uniform(400, 600),
+            'export_agricole': rng.uniform(0.1, 0.3),
+            'produit_principal': rng.choice(produits)
+        })
+    return pd.DataFrame(data)
+
+
+def legacy_energy_data(dates, rng):
+    data = []
+    for date in dates:
+        if date.year <= 2016:
+            part_renouvelable = rng.uniform(0.25, 0.35)
+        elif date.year <= 2020:
+            part_renouvelable = rng.uniform(0.35, 0.45)
+        else:
+            part_renouvelable = rng.uniform(0.45, 0.55)
+        data.append({
+            'date': date,
+            'production_totale_mwh': rng.uniform(250000, 350000),
+            'part_renouvelable': part_renouvelable,
+            'production_solaire': rng.uniform(30000, 60000),
+            'production_eolien': rng.uniform(15000, 30000),
+            'production_biomasse': rng.uniform(40000, 80000),
+            'production_hydraulique': rng.uniform(20000, 40000),
+            'importation_energie': rng.uniform(0.05, 0.15)
+        })
+    return pd.DataFrame(data)
+
+
+# (nom, implémentation historique, implémentation vectorisée)
+GENERATEURS = [
+    ('economic', legacy_economic_data, generate_economic_data),
+    ('tourism', legacy_tourism_data, generate_tourism_data),
+    ('agriculture', legacy_agriculture_data, generate_agriculture_data),
+    ('energy', legacy_energy_data, generate_energy_data),
+]
+
+
+def mesurer(fonction, repetitions):
+    """Retourne le meilleur temps (secondes) sur plusieurs répétitions"""
+    meilleur = float('inf')
+    for _ in range(repetitions):
+        debut = time.perf_counter()
+        fonction()
+        meilleur = min(meilleur, time.perf_counter() - debut)
+    return meilleur
+
+
+def bench_generateurs(tailles, repetitions):
+    """Compare les deux implémentations pour chaque taille d'historique"""
+    resultats = []
+    for taille in tailles:
+        # Pas horaire pour pouvoir atteindre 10⁶ lignes sans dépasser les bornes de datetime64
+        dates = pd.date_range('2014-01-01', periods=taille, freq='h')
+        for nom, legacy, vectorise in GENERATEURS:
+            t_legacy = mesurer(lambda: legacy(dates, random.Random(974)), repetitions)
+            t_vectorise = mesurer(lambda: vectorise(dates, np.random.default_rng(974)), repetitions)
+            resultats.append({
+                'dataset': nom,
+                'lignes': taille,
+                'boucle_s': t_legacy,
+                'vectorise_s': t_vectorise,
+                'acceleration': t_legacy / t_vectorise,
+            })
+    return pd.DataFrame(resultats)
+
+
+def bench_dashboard(historiques, ticks):
+    """Mesure l'initialisation, les ticks live et les sections pour chaque longueur d'historique (mois)"""
+    from data_engine import DataEngine
+    Dashboard = import_dashboard(tempfile.mkdtemp(prefix='reunion-bench-'))
+    resultats = []
+    for mois in historiques:
+        # La série se termine assez tôt pour que chaque tick ajoute un mois
+        fin = pd.Timestamp.today().normalize() - pd.DateOffset(months=ticks + 1)
+        engine = DataEngine(date_debut=fin - pd.DateOffset(months=mois), date_fin=fin)
+
+        # Constructeur seul : les jeux de données sont construits au premier accès
+        debut = time.perf_counter()
+        dashboard = Dashboard.ReunionDashboard(engine=engine)
+        resultats.append({'suite': 'dashboard', 'mesure': 'ReunionDashboard', 'historique': mois,
+                          'secondes': time.perf_counter() - debut})
+        for nom in ['economic', 'tourism', 'agriculture', 'energy', 'demographic']:
+            methode = f'initialize_{nom}_data'
+            debut = time.perf_counter()
+            getattr(dashboard, methode)()
+            resultats.append({'suite': 'dashboard', 'mesure': methode, 'historique': mois,
+                              'secondes': time.perf_counter() - debut})
+
+        # Ticks sur le stockage live, agrégats compris comme pour le producteur du processus
+        dashboard.economic_rollups = Dashboard.build_rollups(dashboard.economic_data,
+                                                             **Dashboard.rollup_options('economic'))
+        debut = time.perf_counter()
+        ajouts = sum(bool(dashboard.update_live_data()) for _ in range(ticks))
+        duree = time.perf_counter() - debut
+        resultats.append({'suite': 'dashboard', 'mesure': 'update_live_data', 'historique': mois,
+                          'ticks': ticks, 'ajouts': ajouts, 'secondes': duree,
+                          'secondes_par_tick': duree / max(ticks, 1)})
+
+        # Sections construites à froid (cache des figures vidé), tous les sous-onglets inclus
+        dashboard.lazy_tabs = False
+        Dashboard.get_figure_cache.clear()
+        for section in SECTIONS:
+            with capture_figures() as figures:
+                debut = time.perf_counter()
+                getattr(dashboard, section)()
+                duree = time.perf_counter() - debut
+            resultats.append({'suite': 'dashboard', 'mesure': section, 'historique': mois, 'secondes': duree,
+                              'figures': len(figures), 'octets': sum(len(fig.to_json()) for fig in figures)})
+
+        # Section économique après un tick live : les séries sont prolongées, pas reconstruites
+        dashboard.economic_store.append({**{col: dashboard.economic_store.last(col) for col in dashboard.economic_store.columns},
+                                         'date': dashboard.economic_store.last('date') + np.timedelta64(31, 'D')})
+        with capture_figures() as figures:
+            debut = time.perf_counter()
+            dashboard.create_economic_overview()
+            duree = time.perf_counter() - debut
+        resultats.append({'suite': 'dashboard', 'mesure': 'create_economic_overview_tick', 'historique': mois,
+                          'secondes': duree, 'figures': len(figures),
+                          'octets': sum(len(fig.to_json()) for fig in figures)})
+    return pd.DataFrame(resultats)
+
+
+def metadonnees():
+    """Contexte de la mesure, pour comparer des exécutions entre commits"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        'commit': commit,
+        'date': pd.Timestamp.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'machine': platform.machine(),
+        'cpu': os.cpu_count(),
+    }
+
+
+def cle_mesure(ligne):
+    """Identifie une mesure d'une exécution à l'autre"""
+    return (ligne['suite'], ligne.get('mesure') or ligne.get('dataset'),
+            ligne.get('historique') or ligne.get('lignes'))
+
+
+def comparer(resultats, reference, seuil):
+    """Mesures dont le temps dépasse ``seuil`` fois celui de la référence"""
+    anciens = {cle_mesure(ligne): ligne for ligne in reference['resultats']}
+    regressions = []
+    for ligne in resultats:
+        ancien = anciens.get(cle_mesure(ligne))
+        for champ in ('secondes', 'vectorise_s'):
+            if ancien and ligne.get(champ) and ancien.get(champ) and ligne[champ] > seuil * ancien[champ]:
+                regressions.append({'mesure': cle_mesure(ligne), 'champ': champ,
+                                    'reference': ancien[champ], 'actuel': ligne[champ],
+                                    'ratio': ligne[champ] / ancien[champ]})
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--suites', nargs='+', choices=['generateurs', 'dashboard'],
+                        default=['generateurs', 'dashboard'], help="suites à exécuter")
+    parser.add_argument('--tailles', type=int, nargs='+', default=[10**2, 10**4, 10**6],
+                        help="nombres de lignes à générer (suite generateurs)")
+    parser.add_argument('--repetitions', type=int, default=3,
+                        help="répétitions par mesure (le meilleur temps est retenu)")
+    parser.add_argument('--historiques', type=int, nargs='+', default=[120, 1200],
+                        help="longueurs d'historique en mois (suite dashboard)")
+    parser.add_argument('--ticks', type=int, default=50, help="nombre de ticks live (suite dashboard)")
+    parser.add_argument('--json', help="fichier de résultats JSON ('-' : sortie standard)")
+    parser.add_argument('--reference', help="résultats JSON d'une exécution précédente à comparer")
+    parser.add_argument('--seuil', type=float, default=1.2,
+                        help="ratio de temps au-delà duquel une mesure est une régression")
+    args = parser.parse_args()
+
+    tables = []
+    if 'generateurs' in args.suites:
+        tables.append(bench_generateurs(args.tailles, args.repetitions).assign(suite='generateurs'))
+    if 'dashboard' in args.suites:
+        tables.append(bench_dashboard(args.historiques, args.ticks))
+    format_nombre = lambda v: f"{v:.5f}"
+    for table in tables:
+        print(table.to_string(index=False, float_format=format_nombre), file=sys.stderr if args.json == '-' else sys.stdout)
+
+    resultats = [{k: v for k, v in ligne.items() if pd.notna(v)}
+                 for table in tables for ligne in json.loads(table.to_json(orient='records'))]
+    if args.json:
+        document = json.dumps({'meta': metadonnees(), 'resultats': resultats}, indent=2, ensure_ascii=False)
+        if args.json == '-':
+            print(document)
+        else:
+            with open(args.json, 'w', encoding='utf-8') as fichier:
+                fichier.write(document)
+
+    if args.reference:
+        with open(args.reference, encoding='utf-8') as fichier:
+            regressions = comparer(resultats, json.load(fichier), args.seuil)
+        for regression in regressions:
+            print(f"RÉGRESSION {regression['mesure']} {regression['champ']}: "
+                  f"{regression['reference']:.5f}s -> {regression['actuel']:.5f}s (x{regression['ratio']:.2f})",
+                  file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,141 @@
+# charts.py
+"""Cache des figures Plotly et réduction des séries temporelles côté serveur."""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import plotly.graph_objects as go
+
+
+class FigureCache:
+    """Cache LRU de figures indexé par (graphique, jeu de données, version, filtres).
+
+    Lorsqu'un jeu de données change de version (nouveau tick live), les figures
+    construites sur l'ancienne version sont évincées dès la première demande
+    portant la nouvelle version. Une figure mise en cache ne doit plus être
+    modifiée : Streamlit la sérialise à partir d'une copie (``to_dict``).
+
+    Avec ``extender``, une figure de la version précédente est prolongée au lieu
+    d'être reconstruite : ``extender(ancienne)`` retourne la nouvelle figure, ou
+    None pour revenir à builder().
+    """
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.extensions = 0
+        self._figures = OrderedDict()
+        self._versions = {}
+        self._precedentes = {}
+        self._lock = threading.Lock()
+
+    def get_or_build(self, chart_id, dataset, version, filtres, builder, extender=None):
+        """Retourne la figure en cache, la prolonge depuis la version précédente, ou la construit avec builder()"""
+        cle = (chart_id, dataset, version, filtres)
+        with self._lock:
+            fig = self._figures.get(cle)
+            if fig is not None:
+                self._figures.move_to_end(cle)
+                self.hits += 1
+                return fig
+            if self._versions.get(dataset) != version:
+                self._invalidate(dataset)
+                self._versions[dataset] = version
+            self.misses += 1
+            ancienne = self._precedentes.get((chart_id, dataset, filtres)) if extender is not None else None
+
+        # Construction hors verrou : les autres sessions ne sont pas bloquées
+        fig = extender(ancienne) if ancienne is not None else None
+        if fig is not None:
+            with self._lock:
+                self.extensions += 1
+        else:
+            fig = builder()
+        with self._lock:
+            self._figures[cle] = fig
+            self._figures.move_to_end(cle)
+            while len(self._figures) > self.max_entries:
+                self._figures.popitem(last=False)
+        return fig
+
+    def _invalidate(self, dataset):
+        # Les figures évincées restent disponibles pour être prolongées à la version suivante
+        for cle in [cle for cle in self._precedentes if cle[1] == dataset]:
+            del self._precedentes[cle]
+        for cle in [cle for cle in self._figures if cle[1] == dataset]:
+            chart_id, _, _, filtres = cle
+            fig = self._figures.pop(cle)
+            if fig is not None:
+                self._precedentes[(chart_id, dataset, filtres)] = fig
+
+    def __len__(self):
+        return len(self._figures)
+
+    def stats(self):
+        """Compteurs du cache"""
+        with self._lock:
+            return {'figures': len(self._figures), 'hits': self.hits, 'miss': self.misses,
+                    'extensions': self.extensions}
+
+
+def extend_traces(fig, ajout):
+    """Nouvelle figure : les points de chaque trace de ``ajout`` sont ajoutés à la trace correspondante de ``fig``.
+
+    Les deux figures doivent provenir du même constructeur (mêmes traces, dans
+    le même ordre) ; la mise en page de ``fig`` est reprise telle quelle.
+    """
+    if len(fig.data) != len(ajout.data):
+        raise ValueError("Figures de structures différentes")
+    traces = []
+    for trace, points in zip(fig.data, ajout.data):
+        trace = trace.to_plotly_json()
+        trace['x'] = np.concatenate([np.asarray(trace['x']), np.asarray(points.x)])
+        trace['y'] = np.concatenate([np.asarray(trace['y']), np.asarray(points.y)])
+        traces.append(trace)
+    return go.Figure(data=traces, layout=fig.layout)
+
+
+def lttb_indices(x, y, n_out):
+    """Indices retenus par l'algorithme Largest-Triangle-Three-Buckets.
+
+    Le premier et le dernier point sont conservés ; chaque seau intermédiaire
+    garde le point formant le plus grand triangle avec le point retenu
+    précédemment et la moyenne du seau suivant, ce qui préserve pics et creux.
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    bords = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    indices = np.empty(n_out, dtype=np.int64)
+    indices[0], indices[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        debut, fin = bords[i], bords[i + 1]
+        if i == n_out - 3:
+            moy_x, moy_y = x[n - 1], y[n - 1]
+        else:
+            suivant = slice(bords[i + 1], bords[i + 2])
+            moy_x, moy_y = x[suivant].mean(), y[suivant].mean()
+        aires = np.abs((x[a] - moy_x) * (y[debut:fin] - y[a]) - (x[a] - x[debut:fin]) * (moy_y - y[a]))
+        a = debut + int(np.argmax(aires))
+        indices[i + 1] = a
+    return indices
+
+
+def downsample(df, x, colonnes, max_points):
+    """Réduit un DataFrame à environ max_points lignes en préservant la forme des séries.
+
+    Les indices LTTB de chaque colonne sont réunis, de sorte que toutes les
+    séries d'un même graphique gardent leurs extrema.
+    """
+    if len(df) <= max_points:
+        return df
+    xs = df[x].to_numpy()
+    if np.issubdtype(xs.dtype, np.datetime64):
+        xs = xs.astype('datetime64[ns]').astype(np.int64)
+    xs = xs.astype(np.float64)
+    par_colonne = max(3, max_points // len(colonnes))
+    indices = np.unique(np.concatenate([
+        lttb_indices(xs, df[col].to_numpy(dtype=np.float64), par_colonne) for col in colonnes
+    ]))
+    return df.iloc[indices]
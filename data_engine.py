@@ -0,0 +1,304 @@
+# data_engine.py
+"""Génération des jeux de données simulés de La Réunion.
+
+Les générateurs sont indépendants de l'interface Streamlit : ils reçoivent
+les dates à simuler et un ``numpy.random.Generator``, et produisent chaque
+colonne en un seul tirage vectorisé (masques de saisonnalité par mois,
+régimes COVID par année) au lieu d'une boucle Python par ligne. Chaque
+DataFrame est indexé par ses dates (DatetimeIndex trié) en plus de la
+colonne ``date`` utilisée par les graphiques.
+"""
+import hashlib
+import zlib
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+# Début de l'historique simulé
+DATE_DEBUT_HISTORIQUE = '2014-01-01'
+
+# Graine par défaut (code départemental de La Réunion)
+DEFAULT_SEED = 974
+
+# À incrémenter dès qu'un générateur change : invalide les snapshot_id existants
+GENERATEURS_VERSION = 2
+
+
+def generate_economic_data(dates, rng):
+    """Génère les données économiques historiques"""
+    n = len(dates)
+    annees = dates.year.to_numpy()
+    mois = dates.month.to_numpy()
+
+    # Données économiques de base avec tendances réalistes
+    pib_base = 20.5  # Milliards EUR
+    croissance_base = 2.8  # %
+
+    # Impact COVID (2020-2021) : 2020 de -8% à -3%, 2021 de -2% à +2%, sinon +2% à +6%
+    regimes = [annees == 2020, annees == 2021]
+    covid_impact = rng.uniform(np.select(regimes, [-0.08, -0.02], 0.02),
+                               np.select(regimes, [-0.03, 0.02], 0.06))
+
+    return pd.DataFrame(index=dates, data={
+        'date': dates,
+        'pib_mensuel': pib_base * (1 + croissance_base/100) ** ((annees-2014)*12 + mois-1),
+        'croissance_pib': croissance_base + covid_impact * 100,
+        'inflation': rng.uniform(1.5, 4.0, n),
+        'taux_chomage': rng.uniform(18.0, 24.0, n),  # Taux de chômage structurellement élevé
+        'revenu_median': rng.uniform(1800, 2200, n),
+        'exportations': rng.uniform(0.3, 0.6, n),  # Milliards EUR
+        'importations': rng.uniform(4.5, 5.5, n),  # Milliards EUR
+        'balance_commerciale': rng.uniform(-4.8, -4.2, n)  # Déficit structurel
+    })
+
+
+def generate_tourism_data(dates, rng):
+    """Génère les données touristiques"""
+    n = len(dates)
+    annees = dates.year.to_numpy()
+    mois = dates.month.to_numpy()
+
+    # Saisonnalité touristique très marquée : haute saison (été austral + Noël),
+    # moyenne saison, basse saison
+    base_touristes = np.select([np.isin(mois, [7, 8, 12, 1]), np.isin(mois, [2, 3, 9, 10])],
+                               [120000, 80000], 50000)
+
+    # Impact COVID très fort sur le tourisme : 2-8%, 20-40%, 60-80% puis retour à la normale
+    regimes = [(annees == 2020) | ((annees == 2021) & (mois <= 6)), annees == 2021, annees == 2022]
+    covid_factor = rng.uniform(np.select(regimes, [0.02, 0.2, 0.6], 0.9),
+                               np.select(regimes, [0.08, 0.4, 0.8], 1.1))
+
+    touristes = base_touristes * covid_factor
+    recettes = touristes * rng.uniform(1500, 2200, n)  # Dépense moyenne par touriste
+
+    return pd.DataFrame(index=dates, data={
+        'date': dates,
+        'arrivees_touristes': touristes,
+        'recettes_tourisme': recettes,
+        'duree_sejour_moyenne': rng.uniform(10, 16, n),
+        'taux_occupation_hotels': rng.uniform(0.5, 0.85, n) * covid_factor,
+        'principaux_marches': rng.choice(['France Métropolitaine', 'Mayotte', 'Maurice', 'Afrique du Sud'], n)
+    })
+
+
+def generate_agriculture_data(dates, rng):
+    """Génère les données agricoles"""
+    n = len(dates)
+    mois = dates.month.to_numpy()
+    produits = ['Canne à sucre', 'Fruits tropicaux', 'Viande bovine', 'Lait', 'Légumes', 'Fleurs']
+
+    # Production saisonnière : saison sèche, saison des pluies, reste de l'année
+    production_factor = np.select([np.isin(mois, [7, 8, 9]), np.isin(mois, [1, 2, 3])],
+                                  [0.8, 1.2], 1.0)
+
+    return pd.DataFrame(index=dates, data={
+        'date': dates,
+        'production_canne_tonnes': rng.uniform(1500000, 1800000, n) * production_factor,
+        'production_fruits_tonnes': rng.uniform(50000, 80000, n) * production_factor,
+        'production_viande_tonnes': rng.uniform(4000, 6000, n),
+        'prix_sucre_tonne': rng.uniform(400, 600, n),
+        'export_agricole': rng.uniform(0.1, 0.3, n),  # Milliards EUR
+        'produit_principal': rng.choice(produits, n)
+    })
+
+
+def generate_energy_data(dates, rng):
+    """Génère les données énergétiques"""
+    n = len(dates)
+    annees = dates.year.to_numpy()
+
+    # Croissance des énergies renouvelables par paliers
+    paliers = [annees <= 2016, annees <= 2020]
+    part_renouvelable = rng.uniform(np.select(paliers, [0.25, 0.35], 0.45),
+                                    np.select(paliers, [0.35, 0.45], 0.55))
+
+    return pd.DataFrame(index=dates, data={
+        'date': dates,
+        'production_totale_mwh': rng.uniform(250000, 350000, n),
+        'part_renouvelable': part_renouvelable,
+        'production_solaire': rng.uniform(30000, 60000, n),
+        'production_eolien': rng.uniform(15000, 30000, n),
+        'production_biomasse': rng.uniform(40000, 80000, n),
+        'production_hydraulique': rng.uniform(20000, 40000, n),
+        'importation_energie': rng.uniform(0.05, 0.15, n)  # Milliards EUR
+    })
+
+
+def generate_demographic_data(dates, rng):
+    """Génère les données démographiques"""
+    n = len(dates)
+    annees = dates.year.to_numpy()
+
+    population_base = 850000
+    croissance_pop = rng.uniform(0.8, 1.2, n)  # Croissance démographique forte
+
+    return pd.DataFrame(index=dates, data={
+        'date': dates,
+        'population': population_base * (1 + croissance_pop/100) ** (annees - 2014),
+        'taux_natalite': rng.uniform(12.0, 15.0, n),
+        'taux_mortalite': rng.uniform(5.0, 6.5, n),
+        'solde_migratoire': rng.uniform(2000, 5000, n),
+        'densite_population': rng.uniform(330, 360, n),
+        'population_jeune': rng.uniform(32, 35, n),  # % < 25 ans
+        'population_agee': rng.uniform(12, 15, n)    # % > 65 ans
+    })
+
+
+# Générateur associé à chaque jeu de données
+GENERATEURS = {
+    'economic': generate_economic_data,
+    'tourism': generate_tourism_data,
+    'agriculture': generate_agriculture_data,
+    'energy': generate_energy_data,
+    'demographic': generate_demographic_data,
+}
+
+# Fréquence d'échantillonnage par défaut de chaque jeu de données
+FREQUENCES = {
+    'economic': 'ME',
+    'tourism': 'ME',
+    'agriculture': 'ME',
+    'energy': 'ME',
+    'demographic': 'YE',
+}
+
+
+# Schéma déclaré de chaque jeu de données : colonne -> dtype. La colonne 'date'
+# (datetime64, triée) est commune à tous les jeux et sert d'index. float32 suffit
+# aux indicateurs (7 chiffres significatifs) ; float64 est conservé pour les
+# montants cumulés (PIB composé à chaque tick, recettes en EUR) ; les libellés
+# répétés sont des catégories.
+SCHEMAS = {
+    'economic': {
+        'pib_mensuel': 'float64',
+        'croissance_pib': 'float32',
+        'inflation': 'float32',
+        'taux_chomage': 'float32',
+        'revenu_median': 'float32',
+        'exportations': 'float32',
+        'importations': 'float32',
+        'balance_commerciale': 'float32',
+    },
+    'tourism': {
+        'arrivees_touristes': 'float32',
+        'recettes_tourisme': 'float64',
+        'duree_sejour_moyenne': 'float32',
+        'taux_occupation_hotels': 'float32',
+        'principaux_marches': 'category',
+    },
+    'agriculture': {
+        'production_canne_tonnes': 'float32',
+        'production_fruits_tonnes': 'float32',
+        'production_viande_tonnes': 'float32',
+        'prix_sucre_tonne': 'float32',
+        'export_agricole': 'float32',
+        'produit_principal': 'category',
+    },
+    'energy': {
+        'production_totale_mwh': 'float32',
+        'part_renouvelable': 'float32',
+        'production_solaire': 'float32',
+        'production_eolien': 'float32',
+        'production_biomasse': 'float32',
+        'production_hydraulique': 'float32',
+        'importation_energie': 'float32',
+    },
+    'demographic': {
+        'population': 'float32',
+        'taux_natalite': 'float32',
+        'taux_mortalite': 'float32',
+        'solde_migratoire': 'float32',
+        'densite_population': 'float32',
+        'population_jeune': 'float32',
+        'population_agee': 'float32',
+    },
+}
+
+
+class DataEngine:
+    """Moteur de données déterministe.
+
+    Chaque jeu de données possède sa propre ``SeedSequence`` dérivée de la
+    graine et de son nom : pour une même graine et une même période, les
+    DataFrames produits sont identiques octet pour octet, quel que soit
+    l'ordre dans lequel ils sont demandés.
+    """
+    def __init__(self, seed=DEFAULT_SEED, date_debut=DATE_DEBUT_HISTORIQUE, date_fin=None):
+        self.seed = seed
+        self.date_debut = pd.Timestamp(date_debut).normalize()
+        self.date_fin = pd.Timestamp(date_fin if date_fin is not None else date.today()).normalize()
+        self._seeds = {nom: self._seed_sequence(nom) for nom in GENERATEURS}
+        # Générateur des mises à jour en temps réel, qui avance à chaque tick
+        self.live_rng = np.random.Generator(np.random.PCG64(self._seed_sequence('live')))
+
+    def _seed_sequence(self, nom):
+        return np.random.SeedSequence(self.seed, spawn_key=(zlib.crc32(nom.encode()),))
+
+    @property
+    def snapshot_id(self):
+        """Identifiant court du jeu de données complet (graine, période, version des générateurs)"""
+        cle = f"{GENERATEURS_VERSION}|{self.seed}|{self.date_debut.date()}|{self.date_fin.date()}"
+        return hashlib.sha1(cle.encode()).hexdigest()[:12]
+
+    def rng(self, nom):
+        """Retourne un générateur neuf, toujours dans le même état initial, pour un jeu de données"""
+        if nom not in GENERATEURS:
+            raise ValueError(f"Jeu de données inconnu: {nom}")
+        return np.random.Generator(np.random.PCG64(self._seeds[nom]))
+
+    def dates(self, nom):
+        """Dates simulées d'un jeu de données sur la période du moteur"""
+        return pd.date_range(self.date_debut, self.date_fin, freq=FREQUENCES[nom])
+
+    def dataset(self, nom):
+        """Génère un jeu de données de façon reproductible, aux dtypes compacts de SCHEMAS"""
+        return apply_schema(self.raw_dataset(nom), nom)
+
+    def raw_dataset(self, nom):
+        """Jeu de données tel que produit par son générateur (float64, chaînes)"""
+        return GENERATEURS[nom](self.dates(nom), self.rng(nom))
+
+    def datasets(self):
+        """Génère tous les jeux de données"""
+        return {nom: self.dataset(nom) for nom in GENERATEURS}
+
+
+def slice_period(df, debut, fin):
+    """Lignes d'un jeu de données comprises entre deux dates (bornes incluses, jour entier pour fin).
+
+    Le DatetimeIndex trié des jeux de données permet une recherche dichotomique
+    en O(log n) ; le résultat est une vue, sans masque booléen sur la colonne.
+    """
+    index = df.index
+    debut = index.searchsorted(pd.Timestamp(debut), side='left')
+    fin = index.searchsorted(pd.Timestamp(fin).normalize() + pd.Timedelta(days=1), side='left')
+    return df.iloc[debut:fin]
+
+
+def apply_schema(df, nom):
+    """Convertit les colonnes d'un jeu de données vers les dtypes déclarés dans SCHEMAS"""
+    dtypes = {col: dtype for col, dtype in SCHEMAS[nom].items() if col in df.columns}
+    return df.astype(dtypes)
+
+
+def frame_bytes(df):
+    """Mémoire occupée par un DataFrame, index et chaînes compris"""
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+def memory_report(engine):
+    """Octets par jeu de données avant et après conversion vers SCHEMAS"""
+    lignes = []
+    for nom in GENERATEURS:
+        brut = engine.raw_dataset(nom)
+        avant, apres = frame_bytes(brut), frame_bytes(apply_schema(brut, nom))
+        lignes.append({'dataset': nom, 'lignes': len(brut), 'octets_avant': avant,
+                       'octets_apres': apres, 'gain': 1 - apres / avant})
+    return pd.DataFrame(lignes)
+
+
+def frame_digest(df):
+    """Empreinte SHA-1 du contenu d'un DataFrame, pour comparer deux instantanés"""
+    empreintes = pd.util.hash_pandas_object(df, index=True).to_numpy()
+    return hashlib.sha1(empreintes.tobytes() + '|'.join(df.columns).encode()).hexdigest()
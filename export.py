@@ -0,0 +1,140 @@
+# export.py
+"""Export des graphiques du dashboard en rapport HTML autonome, sans navigateur.
+
+Les sections ``create_*`` du dashboard sont exécutées en mode bare, tous les
+sous-onglets dépliés, et leurs figures interceptées. Les données passent par
+les mêmes caches que le serveur : le stockage colonnaire sur disque
+(``REUNION_STORE_DIR``) déjà écrit par un serveur est relu tel quel.
+
+Le rendu (HTML de chaque figure, images statiques) est réparti par section
+entre les processus d'un pool ; plotly.js n'est inclus qu'une fois dans le
+rapport. Les images (``--images``) demandent le paquet ``kaleido``.
+
+Usage:
+    python export.py --sortie rapport.html
+    python export.py --sortie rapport.html --images images --format png --sections create_tourism_analysis
+"""
+import argparse
+import html
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import get_context
+
+import pandas as pd
+
+from data_engine import DEFAULT_SEED
+from headless import SECTIONS, capture_figures, import_dashboard
+
+logger = logging.getLogger(__name__)
+
+FORMATS_IMAGES = ('png', 'svg', 'pdf')
+
+
+def collect_figures(sections, seed=DEFAULT_SEED):
+    """Exécute les sections demandées ; retourne (dashboard, {section: [figures]})"""
+    Dashboard = import_dashboard()
+    dashboard = Dashboard.ReunionDashboard(seed)
+    dashboard.lazy_tabs = False
+    figures = {}
+    for section in sections:
+        with capture_figures() as emises:
+            getattr(dashboard, section)()
+        figures[section] = emises
+    return dashboard, figures
+
+
+def _render_section(section, figures, repertoire_images=None, format_image='png'):
+    """Tâche d'un processus : fragments HTML des figures d'une section (et images sur disque)"""
+    import plotly.io as pio
+    fragments = []
+    for i, figure in enumerate(figures, start=1):
+        fragments.append(pio.to_html(figure, full_html=False, include_plotlyjs=False, validate=False,
+                                     div_id=f'{section}-{i}'))
+        if repertoire_images is not None:
+            pio.write_image(figure, os.path.join(repertoire_images, f'{section}-{i:02d}.{format_image}'),
+                            format=format_image, validate=False)
+    return section, fragments
+
+
+def render_sections(figures, workers=None, repertoire_images=None, format_image='png'):
+    """Rendu de chaque section dans un pool de processus (séquentiel avec un seul processus)"""
+    taches = [(section, [figure.to_dict() for figure in liste], repertoire_images, format_image)
+              for section, liste in figures.items()]
+    workers = workers if workers is not None else os.cpu_count() or 1
+    if workers > 1 and len(taches) > 1:
+        try:
+            with ProcessPoolExecutor(min(workers, len(taches)), mp_context=get_context('spawn')) as pool:
+                return dict(pool.map(_render_section, *zip(*taches)))
+        except (BrokenProcessPool, OSError):
+            logger.exception("Pool de rendu indisponible, repli séquentiel")
+    return dict(_render_section(*tache) for tache in taches)
+
+
+def build_report(dashboard, fragments):
+    """Document HTML autonome : sommaire, une partie par section, plotly.js inclus une fois"""
+    from plotly.offline import get_plotlyjs
+    engine = dashboard.engine
+    sommaire = ''.join(f'<li><a href="#{section}">{html.escape(SECTIONS[section])}</a></li>'
+                       for section in fragments)
+    parties = ''.join(
+        f'<section id="{section}"><h2>{html.escape(SECTIONS[section])}</h2>{"".join(liste)}</section>'
+        for section, liste in fragments.items())
+    return f"""<!DOCTYPE html>
+<html lang="fr">
+<head>
+<meta charset="utf-8">
+<title>Dashboard Économique La Réunion</title>
+<style>
+body {{ font-family: sans-serif; margin: 2rem; color: #1f2937; }}
+h1 {{ color: #2E8B57; }}
+section {{ margin-top: 3rem; }}
+</style>
+<script>{get_plotlyjs()}</script>
+</head>
+<body>
+<h1>🌋 Dashboard Économique La Réunion</h1>
+<p>Généré le {pd.Timestamp.now():%d/%m/%Y %H:%M} — instantané {html.escape(engine.snapshot_id)} (graine {engine.seed}),
+données du {engine.date_debut:%d/%m/%Y} au {engine.date_fin:%d/%m/%Y}</p>
+<ul>{sommaire}</ul>
+{parties}
+</body>
+</html>
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sortie', default='rapport.html', help="fichier HTML du rapport")
+    parser.add_argument('--sections', nargs='+', choices=list(SECTIONS), default=list(SECTIONS),
+                        help="sections à exporter")
+    parser.add_argument('--images', help="répertoire des images statiques (nécessite kaleido)")
+    parser.add_argument('--format', choices=FORMATS_IMAGES, default='png', help="format des images statiques")
+    parser.add_argument('--workers', type=int, help="processus de rendu (défaut : nombre de cœurs)")
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED, help="graine des données simulées")
+    args = parser.parse_args()
+
+    if args.images:
+        try:
+            import kaleido  # noqa: F401
+        except ImportError:
+            parser.error("--images nécessite le paquet kaleido (pip install kaleido)")
+        os.makedirs(args.images, exist_ok=True)
+
+    debut = time.perf_counter()
+    dashboard, figures = collect_figures(args.sections, args.seed)
+    collecte = time.perf_counter() - debut
+    fragments = render_sections(figures, args.workers, args.images, args.format)
+    temporaire = f"{args.sortie}.tmp"
+    with open(temporaire, 'w', encoding='utf-8') as fichier:
+        fichier.write(build_report(dashboard, fragments))
+    os.replace(temporaire, args.sortie)
+    print(f"{sum(map(len, figures.values()))} figures, {len(figures)} sections -> {args.sortie} "
+          f"(collecte {collecte:.1f}s, rendu {time.perf_counter() - debut - collecte:.1f}s)", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
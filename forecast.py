@@ -0,0 +1,67 @@
+# forecast.py
+"""Projections des séries mensuelles par un modèle tendance + saisonnalité ajusté avec NumPy.
+
+Pour un jeu de données, tous les indicateurs demandés sont ajustés en une seule
+résolution des moindres carrés : la matrice de conception (constante, tendance
+linéaire, une indicatrice par mois) est commune, seules les colonnes de la
+matrice des observations changent. Les séries multiplicatives (arrivées
+touristiques, dont la saisonnalité est proportionnelle au niveau) sont ajustées
+sur leur logarithme.
+"""
+import numpy as np
+import pandas as pd
+
+# Mois exclus de l'ajustement : les régimes COVID fausseraient tendance et saisonnalité
+PERIODE_COVID = ('2020-01-01', '2022-12-31')
+
+# Quantile normal de l'intervalle de prévision à 95 %
+Z_95 = 1.959964
+
+
+def _design(ordinaux):
+    """Matrice de conception : constante, tendance (en années), indicatrices des mois 2 à 12"""
+    mois = ordinaux % 12
+    X = np.zeros((len(ordinaux), 13))
+    X[:, 0] = 1.0
+    X[:, 1] = ordinaux / 12.0
+    # Janvier (mois 0) sert de référence
+    lignes = np.flatnonzero(mois > 0)
+    X[lignes, 1 + mois[lignes]] = 1.0
+    return X
+
+
+def forecast(df, colonnes, horizon=24, log=(), bornes=None, exclure=(PERIODE_COVID,)):
+    """Prévisions mensuelles de plusieurs indicateurs d'un même jeu de données.
+
+    Retourne un DataFrame indexé par les dates futures (fins de mois) avec, pour
+    chaque indicateur, les colonnes ``<col>``, ``<col>_bas`` et ``<col>_haut``
+    (intervalle à 95 %). ``bornes`` limite les valeurs prévues (ex. part entre 0 et 1).
+    """
+    dates = pd.DatetimeIndex(df['date'])
+    ordinaux = dates.to_period('M').asi8
+    Y = df[colonnes].to_numpy(dtype=np.float64, copy=True)
+    en_log = np.array([col in log for col in colonnes])
+    Y[:, en_log] = np.log(np.maximum(Y[:, en_log], 1e-9))
+
+    garder = np.ones(len(dates), dtype=bool)
+    for debut, fin in exclure:
+        garder &= ~((dates >= pd.Timestamp(debut)) & (dates <= pd.Timestamp(fin)))
+    X = _design(ordinaux)
+    coefficients, _, rang, _ = np.linalg.lstsq(X[garder], Y[garder], rcond=None)
+    residus = Y[garder] - X[garder] @ coefficients
+    sigma = np.sqrt((residus ** 2).sum(axis=0) / max(garder.sum() - rang, 1))
+
+    futurs = ordinaux[-1] + np.arange(1, horizon + 1)
+    prevision = _design(futurs) @ coefficients
+    bas, haut = prevision - Z_95 * sigma, prevision + Z_95 * sigma
+    prevision[:, en_log], bas[:, en_log], haut[:, en_log] = (
+        np.exp(prevision[:, en_log]), np.exp(bas[:, en_log]), np.exp(haut[:, en_log]))
+
+    resultat = {}
+    for i, col in enumerate(colonnes):
+        valeurs = (prevision[:, i], bas[:, i], haut[:, i])
+        if bornes and col in bornes:
+            valeurs = tuple(np.clip(v, *bornes[col]) for v in valeurs)
+        resultat[col], resultat[f'{col}_bas'], resultat[f'{col}_haut'] = valeurs
+    index = pd.PeriodIndex.from_ordinals(futurs, freq='M').to_timestamp(how='end').normalize()
+    return pd.DataFrame(resultat, index=index).rename_axis('date')
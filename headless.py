@@ -0,0 +1,53 @@
+# headless.py
+"""Exécution du dashboard sans navigateur (benchmark, export de rapports).
+
+Le script est importé hors de ``streamlit run`` (mode bare) : les appels
+d'affichage de Streamlit ne produisent rien, et les figures Plotly émises par
+les sections sont interceptées au passage.
+"""
+import contextlib
+import os
+
+# Sections construites par le dashboard, avec le titre de leur onglet
+SECTIONS = {
+    'create_economic_overview': "📈 Économie",
+    'create_sectors_analysis': "🏢 Secteurs",
+    'create_tourism_analysis': "🏖️ Tourisme",
+    'create_energy_analysis': "⚡ Énergie",
+    'create_regional_analysis': "🗺️ Régions",
+    'create_scenarios_analysis': "🎲 Scénarios",
+}
+
+
+def import_dashboard(store_dir=None):
+    """Importe le dashboard en mode bare ; ``store_dir`` remplace le répertoire du stockage colonnaire"""
+    if store_dir is not None:
+        os.environ['REUNION_STORE_DIR'] = store_dir
+    import streamlit as st
+    from streamlit.logger import set_log_level
+    # Avertissements « missing ScriptRunContext » émis à chaque appel en mode bare, y compris
+    # par les loggers créés plus tard ; le niveau est rétabli à la lecture de la configuration
+    set_log_level('error')
+    import Dashboard
+    set_log_level('error')
+    # Aucune relance de script en dehors d'un serveur Streamlit
+    st.rerun = lambda *args, **kwargs: None
+    return Dashboard
+
+
+@contextlib.contextmanager
+def capture_figures():
+    """Intercepte st.plotly_chart et collecte les figures émises, dans l'ordre d'affichage"""
+    import streamlit as st
+    original = st.plotly_chart
+    figures = []
+
+    def plotly_chart(fig, *args, **kwargs):
+        figures.append(fig)
+        return original(fig, *args, **kwargs)
+
+    st.plotly_chart = plotly_chart
+    try:
+        yield figures
+    finally:
+        st.plotly_chart = original
@@ -0,0 +1,105 @@
+# http_client.py
+"""Client HTTP/1.1 asyncio minimal, avec connexions persistantes réutilisées par hôte.
+
+Suffisant pour télécharger les extraits des organismes statistiques (GET,
+réponses ``Content-Length``, ``chunked`` ou jusqu'à fermeture) sans dépendance
+supplémentaire. Le nombre de connexions simultanées est limité par hôte ; une
+connexion inactive refermée par le serveur est remplacée une fois.
+"""
+import asyncio
+import ssl
+from collections import defaultdict
+from urllib.parse import urlsplit
+
+
+class ConnectionPool:
+    """Connexions HTTP keep-alive par (schéma, hôte, port), à utiliser dans une seule boucle asyncio"""
+    def __init__(self, max_par_hote=4):
+        self.max_par_hote = max_par_hote
+        self._libres = defaultdict(list)
+        self._limites = {}
+
+    async def get(self, url, entetes=None):
+        """Requête GET ; retourne (statut, en-têtes en minuscules, corps)"""
+        cible = urlsplit(url)
+        if cible.scheme not in ('http', 'https'):
+            raise ValueError(f"URL non HTTP: {url}")
+        cle = (cible.scheme, cible.hostname, cible.port or (443 if cible.scheme == 'https' else 80))
+        limite = self._limites.setdefault(cle, asyncio.Semaphore(self.max_par_hote))
+        async with limite:
+            for tentative in range(2):
+                reutilisee = bool(self._libres[cle])
+                reader, writer = self._libres[cle].pop() if reutilisee else await self._connect(cle)
+                try:
+                    statut, reponse, corps, garder = await self._exchange(reader, writer, cible, entetes or {})
+                except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+                    writer.close()
+                    # Connexion inactive fermée par le serveur entre-temps : une nouvelle tentative
+                    if reutilisee and tentative == 0:
+                        continue
+                    raise
+                except BaseException:
+                    # Délai dépassé (annulation) : la connexion est dans un état inconnu
+                    writer.close()
+                    raise
+                if garder:
+                    self._libres[cle].append((reader, writer))
+                else:
+                    writer.close()
+                return statut, reponse, corps
+
+    async def _connect(self, cle):
+        schema, hote, port = cle
+        contexte = ssl.create_default_context() if schema == 'https' else None
+        return await asyncio.open_connection(hote, port, ssl=contexte)
+
+    async def _exchange(self, reader, writer, cible, entetes):
+        chemin = (cible.path or '/') + (f'?{cible.query}' if cible.query else '')
+        lignes = [f"GET {chemin} HTTP/1.1", f"Host: {cible.netloc}", "Connection: keep-alive",
+                  "Accept-Encoding: identity"] + [f"{nom}: {valeur}" for nom, valeur in entetes.items()]
+        writer.write(('\r\n'.join(lignes) + '\r\n\r\n').encode('latin-1'))
+        await writer.drain()
+
+        ligne_statut = await reader.readline()
+        if not ligne_statut:
+            raise ConnectionError("Connexion fermée par le serveur")
+        version, statut = ligne_statut.decode('latin-1').split(maxsplit=2)[:2]
+        statut = int(statut)
+        reponse = {}
+        while True:
+            ligne = await reader.readline()
+            if ligne in (b'\r\n', b'\n', b''):
+                break
+            nom, _, valeur = ligne.decode('latin-1').partition(':')
+            reponse[nom.strip().lower()] = valeur.strip()
+
+        garder = version == 'HTTP/1.1' and reponse.get('connection', '').lower() != 'close'
+        if statut in (204, 304) or 100 <= statut < 200:
+            corps = b''
+        elif reponse.get('transfer-encoding', '').lower() == 'chunked':
+            corps = await self._read_chunked(reader)
+        elif 'content-length' in reponse:
+            corps = await reader.readexactly(int(reponse['content-length']))
+        else:
+            corps = await reader.read()
+            garder = False
+        return statut, reponse, corps, garder
+
+    @staticmethod
+    async def _read_chunked(reader):
+        morceaux = []
+        while True:
+            taille = int((await reader.readline()).split(b';')[0].strip(), 16)
+            if taille == 0:
+                # En-têtes de fin éventuels, jusqu'à la ligne vide
+                while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                    pass
+                return b''.join(morceaux)
+            morceaux.append(await reader.readexactly(taille))
+            await reader.readexactly(2)
+
+    def close(self):
+        for connexions in self._libres.values():
+            for _, writer in connexions:
+                writer.close()
+        self._libres.clear()
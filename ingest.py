@@ -0,0 +1,354 @@
+# ingest.py
+"""Ingestion en continu des ticks temps réel (JSON délimité par des retours à la ligne).
+
+Le pipeline est une chaîne de générateurs tirée par un thread :
+
+    lignes (répertoire suivi ou socket local) -> parse -> validate -> micro_batches
+
+Chaque élément avance à la demande : tant que la file des lots est pleine
+(le tableau de bord n'a pas encore ajouté les lots précédents), le thread est
+bloqué et plus rien n'est lu. Un fichier n'avance donc pas au-delà de la
+dernière ligne traitée, et un client du socket est freiné par le tampon du
+système. La mémoire est bornée par la taille de la file, celle d'un lot et la
+longueur maximale d'une ligne.
+
+Les sources émettent None lorsqu'elles n'ont rien reçu pendant ``intervalle``
+secondes : ces battements traversent la chaîne pour que le lot en cours soit
+publié même sans nouvelles lignes.
+"""
+import glob
+import json
+import logging
+import math
+import os
+import queue
+import selectors
+import socket
+import threading
+import time
+from collections import Counter, deque
+
+import numpy as np
+import pandas as pd
+
+from data_engine import SCHEMAS
+
+logger = logging.getLogger(__name__)
+
+# Longueur maximale d'une ligne reçue (octets) : au-delà, la ligne ou la connexion est abandonnée
+MAX_LIGNE = 64 * 1024
+
+# Fenêtre du débit affiché (secondes)
+FENETRE_DEBIT = 60
+
+
+def tail_directory(repertoire, motif='*.ndjson', intervalle=1.0, stop=None):
+    """Lignes complètes des fichiers déposés dans un répertoire, au fur et à mesure de leur écriture.
+
+    Les fichiers sont lus dans l'ordre de leur nom ; une ligne sans retour
+    final (fichier en cours d'écriture) est relue au passage suivant.
+    """
+    positions = {}
+    while stop is None or not stop.is_set():
+        recues = False
+        fichiers = sorted(glob.glob(os.path.join(repertoire, motif)))
+        for chemin in fichiers:
+            try:
+                taille = os.path.getsize(chemin)
+            except OSError:
+                continue
+            if taille <= positions.get(chemin, 0):
+                continue
+            with open(chemin, 'rb') as fichier:
+                fichier.seek(positions.get(chemin, 0))
+                while True:
+                    ligne = fichier.readline(MAX_LIGNE + 1)
+                    if not ligne.endswith(b'\n'):
+                        if len(ligne) > MAX_LIGNE:
+                            logger.warning("Ligne trop longue ignorée dans %s", chemin)
+                            fichier.readline()
+                            positions[chemin] = fichier.tell()
+                            continue
+                        break
+                    positions[chemin] = fichier.tell()
+                    recues = True
+                    yield ligne.decode('utf-8', 'replace')
+        # Fichiers supprimés : leur position n'est plus utile
+        for chemin in positions.keys() - set(fichiers):
+            del positions[chemin]
+        if not recues:
+            yield None
+            if stop is not None:
+                stop.wait(intervalle)
+            else:
+                time.sleep(intervalle)
+
+
+def _listen(adresse):
+    """Socket d'écoute pour 'unix:/chemin' ou 'tcp:hote:port' (hôte local par défaut)"""
+    famille, _, cible = adresse.partition(':')
+    if famille == 'unix':
+        if os.path.exists(cible):
+            os.unlink(cible)
+        serveur = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        serveur.bind(cible)
+    elif famille == 'tcp':
+        hote, _, port = cible.rpartition(':')
+        serveur = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        serveur.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        serveur.bind((hote or '127.0.0.1', int(port)))
+    else:
+        raise ValueError(f"Adresse de socket inconnue: {adresse}")
+    serveur.listen()
+    serveur.setblocking(False)
+    return serveur
+
+
+def socket_lines(adresse, intervalle=1.0, stop=None):
+    """Lignes reçues sur un socket local, de tous les clients connectés"""
+    serveur = _listen(adresse)
+    selecteur = selectors.DefaultSelector()
+    selecteur.register(serveur, selectors.EVENT_READ)
+    tampons = {}
+    try:
+        while stop is None or not stop.is_set():
+            evenements = selecteur.select(intervalle)
+            if not evenements:
+                yield None
+                continue
+            for cle, _ in evenements:
+                if cle.fileobj is serveur:
+                    connexion, _ = serveur.accept()
+                    connexion.setblocking(False)
+                    selecteur.register(connexion, selectors.EVENT_READ)
+                    tampons[connexion] = b''
+                    continue
+                connexion = cle.fileobj
+                try:
+                    donnees = connexion.recv(MAX_LIGNE)
+                except OSError:
+                    donnees = b''
+                *lignes, reste = (tampons[connexion] + donnees).split(b'\n')
+                if not donnees or len(reste) > MAX_LIGNE:
+                    if donnees:
+                        logger.warning("Ligne trop longue, connexion fermée")
+                    selecteur.unregister(connexion)
+                    connexion.close()
+                    del tampons[connexion]
+                else:
+                    tampons[connexion] = reste
+                for ligne in lignes:
+                    yield ligne.decode('utf-8', 'replace')
+    finally:
+        for connexion in tampons:
+            connexion.close()
+        selecteur.close()
+        serveur.close()
+        if adresse.startswith('unix:') and os.path.exists(adresse[5:]):
+            os.unlink(adresse[5:])
+
+
+def source_lines(adresse, intervalle=1.0, stop=None):
+    """Lignes d'une source de ticks : répertoire suivi, 'unix:/chemin' ou 'tcp:hote:port'"""
+    if adresse.startswith(('unix:', 'tcp:')):
+        return socket_lines(adresse, intervalle, stop)
+    return tail_directory(adresse, intervalle=intervalle, stop=stop)
+
+
+class IngestStats:
+    """Compteurs de l'ingestion : lignes reçues, rejetées (par motif), ajoutées, débit et retard"""
+    def __init__(self):
+        self.recues = 0
+        self.ajoutees = 0
+        self.rejets = Counter()
+        self.retard_s = None
+        self.retard_max_s = 0.0
+        self._ajouts = deque()
+        self._lock = threading.Lock()
+
+    def received(self):
+        with self._lock:
+            self.recues += 1
+
+    def reject(self, motif, n=1):
+        with self._lock:
+            self.rejets[motif] += n
+
+    def record_batch(self, n, recu):
+        """Enregistre un lot ajouté ; ``recu`` est l'heure de réception de sa plus ancienne ligne"""
+        maintenant = time.time()
+        with self._lock:
+            self.ajoutees += n
+            self.retard_s = maintenant - recu
+            self.retard_max_s = max(self.retard_max_s, self.retard_s)
+            self._ajouts.append((maintenant, n))
+            while self._ajouts and self._ajouts[0][0] < maintenant - FENETRE_DEBIT:
+                self._ajouts.popleft()
+
+    def rate(self):
+        """Lignes ajoutées par seconde sur la dernière fenêtre"""
+        with self._lock:
+            return sum(n for _, n in self._ajouts) / FENETRE_DEBIT
+
+    def snapshot(self):
+        debit = self.rate()
+        with self._lock:
+            return {'recues': self.recues, 'ajoutees': self.ajoutees, 'rejetees': sum(self.rejets.values()),
+                    'lignes_par_s': debit, 'retard_s': self.retard_s, 'retard_max_s': self.retard_max_s,
+                    'motifs_rejet': dict(self.rejets)}
+
+
+def parse(lignes, stats):
+    """Décode chaque ligne JSON ; produit (enregistrement, heure de réception) ou None (battement)"""
+    for ligne in lignes:
+        if ligne is None:
+            yield None
+            continue
+        if not ligne.strip():
+            continue
+        stats.received()
+        try:
+            enregistrement = json.loads(ligne)
+        except ValueError:
+            stats.reject('json invalide')
+            continue
+        if not isinstance(enregistrement, dict):
+            stats.reject('json invalide')
+            continue
+        yield enregistrement, time.time()
+
+
+def validate(enregistrements, nom, stats):
+    """Contrôle chaque enregistrement contre SCHEMAS[nom] (date et toutes les colonnes, valeurs finies)"""
+    schema = SCHEMAS[nom]
+    for element in enregistrements:
+        if element is None:
+            yield None
+            continue
+        enregistrement, recu = element
+        try:
+            date = pd.Timestamp(enregistrement['date'])
+            if date.tzinfo is not None:
+                date = date.tz_convert(None)
+            ligne = {'date': date.to_datetime64()}
+            for col, dtype in schema.items():
+                valeur = enregistrement[col]
+                if dtype == 'category':
+                    ligne[col] = str(valeur)
+                    continue
+                valeur = float(valeur)
+                if not math.isfinite(valeur):
+                    raise ValueError(col)
+                ligne[col] = valeur
+        except KeyError:
+            stats.reject('colonne manquante')
+            continue
+        except (TypeError, ValueError):
+            stats.reject('valeur invalide')
+            continue
+        yield ligne, recu
+
+
+def micro_batches(lignes, nom, taille=256, delai=1.0):
+    """Regroupe les lignes validées en lots colonnaires (colonne -> tableau, réception la plus ancienne).
+
+    Un lot est publié dès ``taille`` lignes, ou ``delai`` secondes après sa
+    première ligne (au plus tard au battement suivant).
+    """
+    dtypes = {'date': 'datetime64[us]', **{col: object if dtype == 'category' else dtype
+                                          for col, dtype in SCHEMAS[nom].items()}}
+    lot, premiere = [], None
+    for element in lignes:
+        if element is not None:
+            lot.append(element[0])
+            premiere = element[1] if premiere is None else premiere
+        if lot and (len(lot) >= taille or time.time() - premiere >= delai):
+            yield {col: np.array([ligne[col] for ligne in lot], dtype=dtype) for col, dtype in dtypes.items()}, premiere
+            lot, premiere = [], None
+
+
+class TickIngestor:
+    """Thread d'ingestion : alimente une file bornée de lots, vidée par drain() dans le stockage live.
+
+    ``on_batch`` est appelé (dans le thread d'ingestion) après chaque lot mis en
+    file, par exemple pour déclencher un tick du planificateur sans attendre
+    son intervalle.
+    """
+    def __init__(self, adresse, nom='economic', taille_lot=256, delai_lot=1.0, max_lots=16, on_batch=None):
+        self.adresse = adresse
+        self.nom = nom
+        self.taille_lot = taille_lot
+        self.delai_lot = delai_lot
+        self.on_batch = on_batch
+        self.stats = IngestStats()
+        self._file = queue.Queue(maxsize=max_lots)
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Démarre le thread d'ingestion (sans effet s'il tourne déjà)"""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='live-ingest', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.delai_lot + 5)
+
+    def _run(self):
+        lignes = source_lines(self.adresse, self.delai_lot, self._stop)
+        try:
+            lots = micro_batches(validate(parse(lignes, self.stats), self.nom, self.stats),
+                                 self.nom, self.taille_lot, self.delai_lot)
+            for lot in lots:
+                # File pleine : le pipeline reste bloqué ici, et plus rien n'est lu
+                while not self._stop.is_set():
+                    try:
+                        self._file.put(lot, timeout=self.delai_lot)
+                        break
+                    except queue.Full:
+                        continue
+                if self._stop.is_set():
+                    return
+                if self.on_batch is not None:
+                    try:
+                        self.on_batch()
+                    except Exception:
+                        logger.exception("Échec du tick déclenché par l'ingestion")
+        except Exception:
+            logger.exception("Arrêt de l'ingestion des ticks (%s)", self.adresse)
+        finally:
+            lignes.close()
+
+    def drain(self, store, rollups=None):
+        """Ajoute au stockage les lots en file, sans attendre ; retourne le nombre de lignes ajoutées.
+
+        Les lignes sont triées par date ; celles qui ne prolongent pas la série
+        (date déjà présente ou antérieure) sont rejetées, et pour une même date
+        seule la dernière reçue est conservée.
+        """
+        ajoutees = 0
+        while True:
+            try:
+                colonnes, recu = self._file.get_nowait()
+            except queue.Empty:
+                return ajoutees
+            ordre = np.argsort(colonnes['date'], kind='stable')
+            colonnes = {col: valeurs[ordre] for col, valeurs in colonnes.items()}
+            dates = colonnes['date']
+            garder = dates > np.datetime64(store.last('date'), 'us')
+            garder &= np.append(dates[1:] != dates[:-1], True)
+            if not garder.all():
+                self.stats.reject('hors ordre', int((~garder).sum()))
+            if garder.any():
+                # Valeurs converties aux dtypes du stockage : les agrégats reçoivent exactement
+                # les valeurs stockées, comme dans les processus qui lisent la série
+                colonnes = {col: colonnes[col][garder].astype(store.dtypes[col], copy=False) for col in store.columns}
+                store.extend(colonnes)
+                for rollup in (rollups or {}).values():
+                    rollup.extend(colonnes['date'], np.column_stack([colonnes[col] for col in rollup.colonnes]))
+                ajoutees += int(garder.sum())
+            self.stats.record_batch(int(garder.sum()), recu)
@@ -0,0 +1,218 @@
+# instrumentation.py
+"""Mesures des chemins critiques : temps, allocations et figures émises par section.
+
+Les méthodes décorées par ``timed`` enregistrent une mesure dans l'exécution
+courante du thread (une exécution du script Streamlit), ou, hors exécution
+(thread du planificateur live), directement dans le registre du processus. Les
+mesures sont inclusives : une section qui charge un jeu de données compte aussi
+le temps de ce chargement. Les allocations (octets nets conservés) ne sont
+suivies que lorsque ``tracemalloc`` est actif, c'est-à-dire en mode diagnostic.
+"""
+import functools
+import logging
+import os
+import threading
+import time
+import tracemalloc
+from collections import defaultdict
+
+logger = logging.getLogger(__name__)
+
+_courant = threading.local()
+
+# tracemalloc est global au processus, le mode diagnostic propre à chaque session :
+# le suivi n'est arrêté qu'une fois terminées toutes les exécutions qui l'utilisent
+_suivi = {'executions': 0, 'arret_demande': False}
+_suivi_lock = threading.Lock()
+
+
+class RunMetrics:
+    """Mesures d'une exécution du script"""
+    def __init__(self, allocations=False):
+        self.allocations = allocations
+        self.debut = time.perf_counter()
+        self.duree = None
+        self.mesures = defaultdict(lambda: {'appels': 0, 'secondes': 0.0, 'octets_alloues': 0,
+                                            'figures': 0, 'octets_figures': 0, 'serialisation_s': 0.0})
+        self._pile = []
+
+    def start(self, nom):
+        self._pile.append((nom, time.perf_counter(), self._memoire()))
+
+    def stop(self):
+        nom, debut, memoire = self._pile.pop()
+        mesure = self.mesures[nom]
+        mesure['appels'] += 1
+        mesure['secondes'] += time.perf_counter() - debut
+        fin = self._memoire()
+        # Suivi arrêté ou relancé en cours de section : allocations non mesurées
+        if memoire is not None and fin is not None:
+            mesure['octets_alloues'] += max(0, fin - memoire)
+
+    def _memoire(self):
+        return tracemalloc.get_traced_memory()[0] if self.allocations and tracemalloc.is_tracing() else None
+
+    def record_figure(self, octets=0, secondes=0.0):
+        """Compte une figure émise dans l'exécution et dans chaque section en cours"""
+        for nom in ['exécution'] + [nom for nom, _, _ in self._pile]:
+            mesure = self.mesures[nom]
+            mesure['figures'] += 1
+            mesure['octets_figures'] += octets
+            mesure['serialisation_s'] += secondes
+
+    def finish(self):
+        self.duree = time.perf_counter() - self.debut
+        mesure = self.mesures['exécution']
+        mesure['appels'] += 1
+        mesure['secondes'] += self.duree
+        return self
+
+    def rows(self):
+        """Mesures sous forme de lignes, triées par temps décroissant (exécution en cours comprise)"""
+        lignes = [{'section': nom, **mesure} for nom, mesure in self.mesures.items()]
+        if self.duree is None:
+            lignes = [ligne for ligne in lignes if ligne['section'] != 'exécution']
+            lignes.append({**self.mesures['exécution'], 'section': 'exécution', 'appels': 1,
+                           'secondes': time.perf_counter() - self.debut})
+        return sorted(lignes, key=lambda ligne: -ligne['secondes'])
+
+    def log_line(self):
+        """Résumé sur une ligne, une mesure par section"""
+        return ' '.join(f"{ligne['section']}={ligne['secondes'] * 1000:.1f}ms"
+                        + (f"/{ligne['figures']}fig/{ligne['octets_figures']}B" if ligne['figures'] else '')
+                        for ligne in self.rows())
+
+
+class MetricsRegistry:
+    """Cumul des mesures du processus, exposé au format texte de Prometheus"""
+    def __init__(self):
+        self.executions = 0
+        self.totaux = defaultdict(lambda: defaultdict(float))
+        self.dernieres = {}
+        self._lock = threading.Lock()
+
+    def record(self, nom, mesure):
+        with self._lock:
+            for champ, valeur in mesure.items():
+                self.totaux[nom][champ] += valeur
+            self.dernieres[nom] = dict(mesure)
+
+    def record_run(self, run):
+        with self._lock:
+            self.executions += 1
+        for nom, mesure in run.mesures.items():
+            self.record(nom, mesure)
+
+    def prometheus(self):
+        """Texte d'exposition Prometheus des compteurs cumulés et des dernières durées"""
+        metriques = [
+            ('reunion_section_calls_total', 'counter', "Appels par section", 'appels'),
+            ('reunion_section_seconds_total', 'counter', "Temps cumulé par section (s)", 'secondes'),
+            ('reunion_section_alloc_bytes_total', 'counter', "Octets nets alloués par section", 'octets_alloues'),
+            ('reunion_section_figures_total', 'counter', "Figures émises par section", 'figures'),
+            ('reunion_section_figure_bytes_total', 'counter', "Octets de figures sérialisées par section", 'octets_figures'),
+        ]
+        with self._lock:
+            lignes = [
+                "# HELP reunion_runs_total Exécutions du script",
+                "# TYPE reunion_runs_total counter",
+                f"reunion_runs_total {self.executions}",
+            ]
+            for nom_metrique, type_metrique, aide, champ in metriques:
+                lignes += [f"# HELP {nom_metrique} {aide}", f"# TYPE {nom_metrique} {type_metrique}"]
+                lignes += [f'{nom_metrique}{{section="{section}"}} {totaux[champ]:g}'
+                           for section, totaux in sorted(self.totaux.items())]
+            lignes += ["# HELP reunion_section_last_seconds Durée du dernier appel par section (s)",
+                       "# TYPE reunion_section_last_seconds gauge"]
+            lignes += [f'reunion_section_last_seconds{{section="{section}"}} {mesure["secondes"]:g}'
+                       for section, mesure in sorted(self.dernieres.items())]
+        return '\n'.join(lignes) + '\n'
+
+
+# Registre unique du processus (ce module n'est importé qu'une fois, contrairement au script)
+registre = MetricsRegistry()
+
+
+def start_run(allocations=False):
+    """Commence les mesures d'une exécution du script dans le thread courant"""
+    if allocations:
+        with _suivi_lock:
+            _suivi['executions'] += 1
+            _suivi['arret_demande'] = False
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+    _courant.run = RunMetrics(allocations)
+    return _courant.run
+
+
+def stop_allocations():
+    """Arrête le suivi des allocations (coûteux) à la sortie du mode diagnostic.
+
+    Si d'autres sessions ont une exécution diagnostique en cours, l'arrêt est
+    reporté à la fin de la dernière.
+    """
+    with _suivi_lock:
+        if _suivi['executions']:
+            _suivi['arret_demande'] = True
+        elif tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+
+def end_run():
+    """Termine les mesures de l'exécution courante et les ajoute au registre du processus"""
+    run = getattr(_courant, 'run', None)
+    _courant.run = None
+    if run is None:
+        return None
+    if run.allocations:
+        with _suivi_lock:
+            _suivi['executions'] -= 1
+            if not _suivi['executions'] and _suivi['arret_demande']:
+                _suivi['arret_demande'] = False
+                tracemalloc.stop()
+    registre.record_run(run.finish())
+    logger.info("rerun %s", run.log_line())
+    return run
+
+
+def enable_log_line():
+    """Écrit la ligne de mesures de chaque exécution sur la sortie d'erreur (idempotent)"""
+    if not logger.handlers:
+        gestionnaire = logging.StreamHandler()
+        gestionnaire.setFormatter(logging.Formatter('%(asctime)s %(name)s %(message)s'))
+        logger.addHandler(gestionnaire)
+    logger.setLevel(logging.INFO)
+
+
+def write_prometheus(chemin):
+    """Écrit le texte Prometheus dans un fichier (collecteur « textfile »), de façon atomique"""
+    temporaire = f"{chemin}.tmp"
+    with open(temporaire, 'w', encoding='utf-8') as fichier:
+        fichier.write(registre.prometheus())
+    os.replace(temporaire, chemin)
+
+
+def current_run():
+    """Mesures de l'exécution en cours dans ce thread (None hors exécution)"""
+    return getattr(_courant, 'run', None)
+
+
+def timed(fonction):
+    """Décorateur : mesure chaque appel dans l'exécution courante (ou le registre hors exécution)"""
+    nom = fonction.__name__
+
+    @functools.wraps(fonction)
+    def mesuree(*args, **kwargs):
+        run = current_run()
+        if run is None:
+            debut = time.perf_counter()
+            try:
+                return fonction(*args, **kwargs)
+            finally:
+                registre.record(nom, {'appels': 1, 'secondes': time.perf_counter() - debut})
+        run.start(nom)
+        try:
+            return fonction(*args, **kwargs)
+        finally:
+            run.stop()
+    return mesuree
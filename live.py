@@ -0,0 +1,463 @@
+# live.py
+"""Mises à jour en temps réel partagées par toutes les sessions d'un processus, ou par les processus d'un hôte."""
+import itertools
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:  # Windows : pas de verrou entre processus, chaque processus écrit
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Identifiants uniques des stockages, pour distinguer deux historiques de même version
+_store_ids = itertools.count(1)
+
+
+class LiveScheduler:
+    """Exécute un tick à intervalle régulier dans un unique thread du processus.
+
+    Le tick retourne True lorsqu'il a produit de nouvelles données : la version
+    est alors incrémentée et seules les sessions qui observent un changement de
+    version se rafraîchissent. Le nombre de rafraîchissements simultanés est
+    plafonné, les sessions refusées réessaient au tour suivant. Un créneau non
+    libéré (session fermée avant la relance) expire après ``slot_ttl`` secondes,
+    trois intervalles par défaut.
+    """
+    def __init__(self, tick, interval=30, max_concurrent_refreshes=4, slot_ttl=None):
+        self._tick = tick
+        self.interval = interval
+        self.version = 0
+        self.last_tick = None
+        self.max_concurrent_refreshes = max_concurrent_refreshes
+        self.slot_ttl = slot_ttl if slot_ttl is not None else 3 * interval
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        # Créneaux réservés : jeton -> instant de la réservation
+        self._slots = {}
+        self._slots_lock = threading.Lock()
+        self._slot_ids = itertools.count(1)
+        self._thread = None
+
+    def start(self):
+        """Démarre le thread du planificateur (sans effet s'il tourne déjà)"""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='live-scheduler', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        """Arrête le thread du planificateur"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.tick_now()
+            except Exception:
+                logger.exception("Échec du tick temps réel")
+
+    def tick_now(self):
+        """Exécute un tick immédiatement et retourne la version courante"""
+        with self._lock:
+            if self._tick():
+                self.version += 1
+            self.last_tick = time.time()
+            return self.version
+
+    def acquire_refresh(self):
+        """Réserve un rafraîchissement ; retourne son jeton, ou None si le plafond est atteint"""
+        maintenant = time.monotonic()
+        with self._slots_lock:
+            for jeton, debut in list(self._slots.items()):
+                if maintenant - debut > self.slot_ttl:
+                    del self._slots[jeton]
+            if len(self._slots) >= self.max_concurrent_refreshes:
+                return None
+            jeton = next(self._slot_ids)
+            self._slots[jeton] = maintenant
+            return jeton
+
+    def release_refresh(self, jeton):
+        """Libère un rafraîchissement réservé par acquire_refresh (sans effet s'il a expiré)"""
+        with self._slots_lock:
+            self._slots.pop(jeton, None)
+
+
+class TickStore:
+    """Stockage colonnaire en ajout seul pour une série temps réel.
+
+    Chaque colonne est un tableau NumPy préalloué dont la capacité double
+    lorsqu'il est plein : un ajout coûte O(1) amorti au lieu de recopier tout
+    le DataFrame. Avec ``max_history``, seules les dernières lignes sont
+    conservées. Les lignes déjà publiées ne sont jamais réécrites (croissance et
+    éviction allouent de nouveaux tableaux), si bien que ``frame()`` peut
+    exposer des vues en lecture seule, sans copie. ``index_col`` désigne la
+    colonne de dates servant aussi d'index (trié) aux vues.
+    """
+    def __init__(self, dtypes, capacity=64, max_history=None, index_col=None):
+        self.columns = list(dtypes)
+        self.dtypes = {col: np.dtype(dtype) for col, dtype in dtypes.items()}
+        self.max_history = max_history
+        self.index_col = index_col
+        self.uid = next(_store_ids)
+        self.version = 0
+        self._arrays = {col: np.empty(capacity, dtype=dtype) for col, dtype in dtypes.items()}
+        self._start = 0
+        self._end = 0
+        self._view = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_frame(cls, df, max_history=None, index_col=None):
+        """Crée un stockage initialisé avec le contenu d'un DataFrame"""
+        dtypes = {col: np.asarray(df[col]).dtype for col in df.columns}
+        store = cls(dtypes, capacity=max(64, 2 * len(df)), max_history=max_history, index_col=index_col)
+        store.extend({col: np.asarray(df[col]) for col in df.columns})
+        return store
+
+    def __len__(self):
+        return self._end - self._start
+
+    @property
+    def capacity(self):
+        return len(self._arrays[self.columns[0]])
+
+    def append(self, ligne):
+        """Ajoute une ligne (dictionnaire colonne -> valeur)"""
+        self.extend({col: [ligne[col]] for col in self.columns})
+
+    def extend(self, colonnes):
+        """Ajoute un lot de lignes (dictionnaire colonne -> séquence de valeurs)"""
+        k = len(colonnes[self.columns[0]])
+        with self._lock:
+            self._reserve(k)
+            for col in self.columns:
+                self._arrays[col][self._end:self._end + k] = colonnes[col]
+            self._end += k
+            if self.max_history is not None and len(self) > self.max_history:
+                self._start = self._end - self.max_history
+            self._view = None
+            self.version += 1
+
+    def _reserve(self, k):
+        """Garantit la place pour k lignes, en réallouant géométriquement si besoin"""
+        if self._end + k <= self.capacity:
+            return
+        conserve = len(self)
+        if self.max_history is not None:
+            conserve = min(conserve, self.max_history)
+        capacite = max(64, 2 * (conserve + k))
+        for col in self.columns:
+            ancien = self._arrays[col]
+            nouveau = np.empty(capacite, dtype=ancien.dtype)
+            nouveau[:conserve] = ancien[self._end - conserve:self._end]
+            self._arrays[col] = nouveau
+        self._start, self._end = 0, conserve
+
+    def acquire_writer(self):
+        """Un stockage local n'a qu'un processus : il est toujours producteur"""
+        return True
+
+    def refresh(self):
+        """Un stockage local est toujours à jour : aucune ligne à rattraper"""
+        return None
+
+    def last(self, col):
+        """Dernière valeur d'une colonne"""
+        with self._lock:
+            return self._arrays[col][self._end - 1]
+
+    def frame(self):
+        """DataFrame en lecture seule partageant la mémoire du stockage"""
+        with self._lock:
+            if self._view is None:
+                colonnes = {}
+                for col in self.columns:
+                    vue = self._arrays[col][self._start:self._end]
+                    vue.flags.writeable = False
+                    colonnes[col] = vue
+                index = pd.DatetimeIndex(colonnes[self.index_col], copy=False) if self.index_col else None
+                self._view = pd.DataFrame(colonnes, index=index, copy=False)
+            return self._view
+
+
+# Champs de l'en-tête d'une série partagée ; SEQUENCE est impaire pendant une écriture
+GENERATION, DEBUT, FIN, TOTAL, SEQUENCE = range(5)
+# Attente maximale d'une écriture en cours (s) : au-delà, le producteur est considéré
+# mort pendant la publication et la version adoptée est conservée
+LECTURE_MAX_SECONDES = 1.0
+
+
+class SharedTickStore:
+    """Série temps réel partagée par les processus serveur d'un même hôte.
+
+    Même interface que TickStore, mais les colonnes sont des fichiers projetés
+    en mémoire dans ``racine`` (sous /dev/shm, ils restent en RAM) : tous les
+    processus lisent les mêmes pages, sans copie. Seul le processus qui détient
+    le verrou ``writer.lock`` ajoute des lignes ; les autres n'adoptent la
+    dernière version publiée qu'à l'appel de refresh(), qui retourne les lignes
+    nouvelles pour tenir leurs agrégats à jour.
+
+    L'en-tête (génération, début, fin, total) est protégé par un compteur de
+    séquence : un lecteur relit tant qu'une écriture est en cours, au plus
+    ``LECTURE_MAX_SECONDES``. Si le producteur meurt pendant une écriture, le
+    processus qui reprend le verrou répare l'en-tête. Comme dans
+    TickStore, les lignes publiées ne sont jamais réécrites : la croissance
+    crée une nouvelle génération de fichiers, et les lecteurs gardent leur
+    projection de l'ancienne jusqu'au refresh() suivant.
+
+    Chaque processus qui projette la série garde un verrou partagé sur
+    ``lecteurs.lock`` tant que l'objet existe : prune() ne supprime que les
+    séries dont aucun processus ne détient ce bail.
+    """
+    def __init__(self, racine, max_history=None, index_col=None):
+        self.racine = racine
+        self._bail = self._lease(racine)
+        with open(os.path.join(racine, 'meta.json'), encoding='utf-8') as fichier:
+            meta = json.load(fichier)
+        self.columns = meta['colonnes']
+        self.dtypes = {col: np.dtype(dtype) for col, dtype in zip(self.columns, meta['dtypes'])}
+        self.max_history = max_history
+        self.index_col = index_col
+        self.uid = next(_store_ids)
+        self.version = 0
+        self._entete = np.memmap(os.path.join(racine, 'header'), dtype=np.int64, mode='r+')
+        self._generation = None
+        self._arrays = {}
+        self._start = 0
+        self._end = 0
+        self._total = 0
+        self._view = None
+        self._verrou = None
+        self._lock = threading.Lock()
+        # Aucune version lisible : producteur mort pendant une écriture, à remplacer
+        while self.refresh() is None and self._generation is None:
+            self.acquire_writer()
+
+    @classmethod
+    def attach(cls, racine, df, max_history=None, index_col=None):
+        """Ouvre la série partagée de ``racine``, en la créant à partir de df si elle n'existe pas encore"""
+        if not os.path.exists(os.path.join(racine, 'meta.json')):
+            parent = os.path.dirname(os.path.abspath(racine))
+            os.makedirs(parent, exist_ok=True)
+            temporaire = tempfile.mkdtemp(prefix='.live-', dir=parent)
+            n = len(df)
+            for i, col in enumerate(df.columns):
+                valeurs = np.asarray(df[col])
+                colonne = np.memmap(cls._fichier(temporaire, i, 0), dtype=valeurs.dtype, mode='w+',
+                                    shape=(max(64, 2 * n),))
+                colonne[:n] = valeurs
+                colonne.flush()
+            entete = np.memmap(os.path.join(temporaire, 'header'), dtype=np.int64, mode='w+', shape=(8,))
+            debut = n - min(n, max_history) if max_history is not None else 0
+            entete[[GENERATION, DEBUT, FIN, TOTAL]] = (0, debut, n, n)
+            entete.flush()
+            with open(os.path.join(temporaire, 'meta.json'), 'w', encoding='utf-8') as fichier:
+                json.dump({'colonnes': list(df.columns),
+                           'dtypes': [np.asarray(df[col]).dtype.str for col in df.columns]}, fichier)
+            try:
+                os.rename(temporaire, racine)
+            except OSError:
+                # Créée entre-temps par un autre processus
+                shutil.rmtree(temporaire, ignore_errors=True)
+        try:
+            return cls(racine, max_history, index_col)
+        except FileNotFoundError:
+            # Supprimée par prune() entre-temps : recréée
+            return cls.attach(racine, df, max_history, index_col)
+
+    @staticmethod
+    def _lease(racine):
+        """Bail de lecture : verrou partagé sur ``lecteurs.lock``, libéré à la fermeture du fichier"""
+        if fcntl is None:
+            return None
+        fichier = open(os.path.join(racine, 'lecteurs.lock'), 'a')
+        fcntl.flock(fichier, fcntl.LOCK_SH)
+        if not os.path.exists(os.path.join(racine, 'meta.json')):
+            # Verrou obtenu après la suppression de la série par prune()
+            fichier.close()
+            raise FileNotFoundError(racine)
+        return fichier
+
+    @staticmethod
+    def prune(repertoire, prefixe, garder, age_min=60):
+        """Supprime les séries ``<prefixe>*`` abandonnées, autres que ``garder``.
+
+        Une série est abandonnée si aucun processus ne détient de bail sur elle
+        (ni producteur ni lecteur) ; les séries de moins de ``age_min`` secondes,
+        dont le créateur n'a peut-être pas encore pris son bail, sont conservées.
+        """
+        if fcntl is None or not os.path.isdir(repertoire):
+            return
+        for entree in os.listdir(repertoire):
+            chemin = os.path.join(repertoire, entree)
+            if not entree.startswith(prefixe) or chemin == garder or time.time() - os.path.getmtime(chemin) < age_min:
+                continue
+            try:
+                with open(os.path.join(chemin, 'lecteurs.lock'), 'a') as bail:
+                    fcntl.flock(bail, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    shutil.rmtree(chemin, ignore_errors=True)
+            except OSError:
+                # Série projetée par un processus (ou déjà supprimée)
+                continue
+
+    @staticmethod
+    def _fichier(racine, i, generation):
+        return os.path.join(racine, f"{i}-{generation}.bin")
+
+    def __len__(self):
+        return self._end - self._start
+
+    @property
+    def capacity(self):
+        return len(self._arrays[self.columns[0]])
+
+    def _read_header(self):
+        """Lecture cohérente de l'en-tête (génération, début, fin, total) ; None si l'écriture ne se termine pas"""
+        limite = time.monotonic() + LECTURE_MAX_SECONDES
+        while time.monotonic() < limite:
+            sequence = int(self._entete[SEQUENCE])
+            if sequence % 2 == 0:
+                champs = tuple(int(v) for v in self._entete[[GENERATION, DEBUT, FIN, TOTAL]])
+                if int(self._entete[SEQUENCE]) == sequence:
+                    return champs
+            time.sleep(0)
+        logger.warning("Série partagée %s : écriture interrompue, en attente d'un nouveau producteur", self.racine)
+        return None
+
+    def _map(self, generation, mode='r+'):
+        return {col: np.memmap(self._fichier(self.racine, i, generation), dtype=self.dtypes[col], mode=mode)
+                for i, col in enumerate(self.columns)}
+
+    def refresh(self):
+        """Adopte la dernière version publiée ; retourne les lignes nouvelles (colonne -> tableau) ou None"""
+        with self._lock:
+            while True:
+                entete = self._read_header()
+                if entete is None:
+                    return None
+                generation, debut, fin, total = entete
+                if total == self._total and generation == self._generation:
+                    return None
+                try:
+                    if generation != self._generation:
+                        self._arrays = self._map(generation)
+                    break
+                except FileNotFoundError:
+                    # Génération remplacée entre la lecture de l'en-tête et la projection
+                    continue
+            nouvelles = min(total - self._total, fin - debut)
+            self._generation, self._start, self._end, self._total = generation, debut, fin, total
+            self._view = None
+            self.version += 1
+            if nouvelles <= 0:
+                return None
+            return {col: np.asarray(self._arrays[col][fin - nouvelles:fin]) for col in self.columns}
+
+    @property
+    def is_writer(self):
+        """Indique si ce processus est le producteur de la série"""
+        return self._verrou is not None or fcntl is None
+
+    def acquire_writer(self):
+        """Tente de devenir le processus producteur ; le verrou est gardé jusqu'à la fin du processus"""
+        if self.is_writer:
+            return True
+        fichier = open(os.path.join(self.racine, 'writer.lock'), 'a')
+        try:
+            fcntl.flock(fichier, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            fichier.close()
+            return False
+        self._verrou = fichier
+        self._repair()
+        return True
+
+    def _repair(self):
+        """Nouveau producteur : clôt l'écriture interrompue par la mort du précédent et supprime ses fichiers orphelins"""
+        with self._lock:
+            if int(self._entete[SEQUENCE]) % 2:
+                logger.warning("Série partagée %s : en-tête réparé après une écriture interrompue", self.racine)
+                self._entete[SEQUENCE] += 1
+            generation = int(self._entete[GENERATION])
+            # Génération créée mais jamais publiée, ou ancienne génération pas encore supprimée
+            for nom in os.listdir(self.racine):
+                if nom.endswith('.bin') and int(nom[:-4].rsplit('-', 1)[1]) != generation:
+                    os.remove(os.path.join(self.racine, nom))
+
+    def append(self, ligne):
+        """Ajoute une ligne (dictionnaire colonne -> valeur) ; réservé au processus producteur"""
+        self.extend({col: [ligne[col]] for col in self.columns})
+
+    def extend(self, colonnes):
+        """Ajoute et publie un lot de lignes ; réservé au processus producteur"""
+        if not self.acquire_writer():
+            raise RuntimeError("Série partagée : un autre processus est producteur")
+        k = len(colonnes[self.columns[0]])
+        with self._lock:
+            ancienne = self._generation
+            self._entete[SEQUENCE] += 1
+            try:
+                self._reserve(k)
+                for col in self.columns:
+                    self._arrays[col][self._end:self._end + k] = colonnes[col]
+                self._end += k
+                self._total += k
+                if self.max_history is not None and len(self) > self.max_history:
+                    self._start = self._end - self.max_history
+                self._entete[[GENERATION, DEBUT, FIN, TOTAL]] = (self._generation, self._start, self._end, self._total)
+            finally:
+                self._entete[SEQUENCE] += 1
+            self._view = None
+            self.version += 1
+        if self._generation != ancienne:
+            for i in range(len(self.columns)):
+                os.remove(self._fichier(self.racine, i, ancienne))
+
+    def _reserve(self, k):
+        """Garantit la place pour k lignes, dans une nouvelle génération de fichiers si besoin"""
+        if self._end + k <= self.capacity:
+            return
+        conserve = len(self)
+        if self.max_history is not None:
+            conserve = min(conserve, self.max_history)
+        capacite = max(64, 2 * (conserve + k))
+        generation = self._generation + 1
+        for i, col in enumerate(self.columns):
+            nouveau = np.memmap(self._fichier(self.racine, i, generation), dtype=self.dtypes[col],
+                                mode='w+', shape=(capacite,))
+            nouveau[:conserve] = self._arrays[col][self._end - conserve:self._end]
+        self._arrays = self._map(generation)
+        self._generation = generation
+        self._start, self._end = 0, conserve
+
+    def last(self, col):
+        """Dernière valeur d'une colonne dans la version adoptée"""
+        with self._lock:
+            return self._arrays[col][self._end - 1]
+
+    def frame(self):
+        """DataFrame en lecture seule sur les pages partagées de la version adoptée"""
+        with self._lock:
+            if self._view is None:
+                colonnes = {}
+                for col in self.columns:
+                    vue = np.asarray(self._arrays[col][self._start:self._end])
+                    vue.flags.writeable = False
+                    colonnes[col] = vue
+                index = pd.DatetimeIndex(colonnes[self.index_col], copy=False) if self.index_col else None
+                self._view = pd.DataFrame(colonnes, index=index, copy=False)
+            return self._view
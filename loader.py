@@ -0,0 +1,134 @@
+# loader.py
+"""Construction parallèle des jeux de données au démarrage.
+
+Les jeux de données sont indépendants : chacun est construit dans un processus
+du pool pendant que le dashboard s'affiche, et seul le jeu demandé par la
+section en cours est attendu. Avec le stockage colonnaire, le processus écrit
+directement les colonnes sur disque et le processus serveur n'a plus qu'à les
+projeter en mémoire ; sans lui, le DataFrame est renvoyé au processus serveur.
+Sans pool (``workers=1``, un seul cœur, pool cassé), chaque jeu est construit à
+la demande, séquentiellement.
+"""
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import get_context
+
+from store import ColumnStore
+
+logger = logging.getLogger(__name__)
+
+
+def _build(source, nom, racine, cle):
+    """Tâche d'un processus : construit un jeu de données ; retourne (DataFrame ou None, durée)"""
+    debut = time.perf_counter()
+    if racine is not None:
+        ColumnStore(racine).ensure(nom, cle, lambda: source.load(nom))
+        return None, time.perf_counter() - debut
+    df = source.load(nom)
+    return df, time.perf_counter() - debut
+
+
+class DatasetLoader:
+    """Construit les jeux de données dans un pool de processus et mémorise le résultat de la dernière version.
+
+    Seule la dernière version de chaque jeu est conservée : une nouvelle clé de
+    cache remplace la précédente et libère son DataFrame. ``timings`` enregistre,
+    pour chaque jeu construit, la durée de construction dans le processus et le
+    temps écoulé jusqu'à sa disponibilité.
+    """
+    def __init__(self, store=None, workers=None):
+        self.store = store
+        self.workers = workers if workers is not None else os.cpu_count() or 1
+        self.timings = {}
+        self._pool = None
+        # nom -> (clé, future, tâche, séquentiel) de la dernière version demandée
+        self._jeux = {}
+        self._lock = threading.Lock()
+
+    def pool(self):
+        """Pool de processus créé au premier besoin (None en mode séquentiel)"""
+        if self.workers <= 1:
+            return None
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(self.workers, mp_context=get_context('spawn'))
+        return self._pool
+
+    def submit(self, source, nom, parallele=True):
+        """Lance la construction d'un jeu de données si besoin ; retourne True si elle est nécessaire.
+
+        Avec ``parallele=False``, le jeu sera construit par le premier get(), dans
+        le processus serveur : utile pour celui qui est attendu immédiatement.
+        """
+        cle = source.cache_key(nom)
+        with self._lock:
+            if nom in self._jeux and self._jeux[nom][0] == cle:
+                return False
+            tache = (source, nom, self.store.racine if self.store is not None else None, cle)
+            sequentiel, construction = False, True
+            if self.store is not None and os.path.exists(os.path.join(self.store.path(nom, cle), 'meta.json')):
+                # Déjà sur disque (autre processus serveur) : rien à construire
+                future = Future()
+                future.set_result((None, 0.0))
+                construction = False
+            else:
+                future = self._submit_to_pool(tache) if parallele else None
+                sequentiel = future is None
+                future = future or Future()
+            self._jeux[nom] = (cle, future, tache, sequentiel)
+        soumis = time.perf_counter()
+        future.add_done_callback(lambda f: self._record(nom, cle, soumis, f))
+        return construction
+
+    def _submit_to_pool(self, tache):
+        """Confie une tâche au pool ; None si elle doit être exécutée séquentiellement"""
+        pool = self.pool()
+        if pool is None:
+            return None
+        try:
+            return pool.submit(_build, *tache)
+        except (BrokenProcessPool, RuntimeError, OSError):
+            logger.exception("Pool de construction indisponible, repli séquentiel")
+            self.workers = 1
+            self._pool = None
+            return None
+
+    def _record(self, nom, cle, soumis, future):
+        if future.cancelled() or future.exception() is not None:
+            return
+        self.timings[nom] = {'construction_s': future.result()[1], 'disponible_s': time.perf_counter() - soumis}
+
+    def get(self, source, nom):
+        """Attend un jeu de données (lancé par submit) et le retourne"""
+        cle = source.cache_key(nom)
+        self.submit(source, nom)
+        with self._lock:
+            # Version plus récente demandée entre-temps : elle sert aussi cet appel
+            _, future, tache, sequentiel = self._jeux[nom]
+            # Construction séquentielle par le premier thread qui en a besoin, les autres attendent
+            construire = (sequentiel and not future.running() and not future.done()
+                          and future.set_running_or_notify_cancel())
+        if construire:
+            try:
+                future.set_result(_build(*tache))
+            except Exception as exc:
+                future.set_exception(exc)
+        try:
+            df, _ = future.result()
+        except BrokenProcessPool:
+            logger.exception("Échec de la construction parallèle de %s, repli séquentiel", nom)
+            self.workers = 1
+            self._pool = None
+            resultat = _build(*tache)
+            df = resultat[0]
+            with self._lock:
+                future = Future()
+                future.set_result(resultat)
+                if self._jeux.get(nom, (None,))[0] == cle:
+                    self._jeux[nom] = (cle, future, tache, False)
+        if self.store is not None:
+            return self.store.load(nom, cle, lambda: source.load(nom))
+        return df
@@ -0,0 +1,120 @@
+# rollups.py
+"""Agrégats trimestriels et annuels des séries, tenus à jour de façon incrémentale."""
+import threading
+
+import numpy as np
+import pandas as pd
+
+# Nombre de périodes par an, pour les variations sur un an
+PERIODES_PAR_AN = {'M': 12, 'Q': 4, 'Y': 1}
+
+
+class Rollup:
+    """Agrégats d'une série par période (mois, trimestre ou année).
+
+    Pour chaque période sont conservés la somme de chaque indicateur et le
+    nombre de lignes : un ajout met à jour la période concernée sans relire
+    les lignes brutes. Les colonnes de ``sommes`` (flux : arrivées, recettes…)
+    sont agrégées par somme, les autres par moyenne.
+    """
+    def __init__(self, colonnes, freq='Q', sommes=()):
+        self.colonnes = list(colonnes)
+        self.freq = freq
+        self.sommes = set(sommes)
+        self.version = 0
+        self._periodes = np.empty(0, dtype=np.int64)
+        self._totaux = np.empty((0, len(self.colonnes)))
+        self._effectifs = np.empty(0, dtype=np.int64)
+        self._table = None
+        self._deltas = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_frame(cls, df, colonnes, freq='Q', sommes=()):
+        """Agrège un jeu de données complet"""
+        rollup = cls(colonnes, freq, sommes)
+        rollup.extend(df['date'], df[rollup.colonnes].to_numpy(dtype=np.float64))
+        return rollup
+
+    def append(self, ligne):
+        """Ajoute une ligne (dictionnaire contenant 'date' et les indicateurs)"""
+        self.extend([ligne['date']], [[ligne[col] for col in self.colonnes]])
+
+    def extend(self, dates, valeurs):
+        """Ajoute un lot de lignes (dates et tableau lignes x indicateurs)"""
+        ordinaux = pd.PeriodIndex(pd.DatetimeIndex(dates), freq=self.freq).asi8
+        periodes, inverse = np.unique(ordinaux, return_inverse=True)
+        totaux = np.zeros((len(periodes), len(self.colonnes)))
+        np.add.at(totaux, inverse, np.asarray(valeurs, dtype=np.float64))
+        effectifs = np.bincount(inverse, minlength=len(periodes))
+
+        with self._lock:
+            positions = np.searchsorted(self._periodes, periodes)
+            existantes = positions < len(self._periodes)
+            existantes[existantes] = self._periodes[positions[existantes]] == periodes[existantes]
+            self._totaux[positions[existantes]] += totaux[existantes]
+            self._effectifs[positions[existantes]] += effectifs[existantes]
+            nouvelles = ~existantes
+            if nouvelles.any():
+                self._periodes = np.insert(self._periodes, positions[nouvelles], periodes[nouvelles])
+                self._totaux = np.insert(self._totaux, positions[nouvelles], totaux[nouvelles], axis=0)
+                self._effectifs = np.insert(self._effectifs, positions[nouvelles], effectifs[nouvelles])
+            self._table = None
+            self._deltas = {}
+            self.version += 1
+
+    def table(self):
+        """Agrégats par période (index PeriodIndex), avec le nombre de lignes agrégées"""
+        with self._lock:
+            if self._table is None:
+                moyennes = self._totaux / np.maximum(self._effectifs, 1)[:, None]
+                donnees = {col: self._totaux[:, i] if col in self.sommes else moyennes[:, i]
+                           for i, col in enumerate(self.colonnes)}
+                donnees['lignes'] = self._effectifs
+                index = pd.PeriodIndex.from_ordinals(self._periodes, freq=self.freq)
+                self._table = pd.DataFrame(donnees, index=index)
+            return self._table
+
+    def deltas(self, decalage=1):
+        """Écart de chaque période avec la période située ``decalage`` périodes plus tôt (NaN si absente)"""
+        table = self.table()
+        with self._lock:
+            ecarts = self._deltas.get(decalage)
+        if ecarts is None:
+            ecarts = self._compute_deltas(table, decalage)
+            with self._lock:
+                if self._table is table:
+                    self._deltas[decalage] = ecarts
+        return ecarts
+
+    def _compute_deltas(self, table, decalage):
+        ordinaux = table.index.asi8
+        valeurs = table[self.colonnes].to_numpy()
+        if not len(table):
+            return pd.DataFrame(columns=self.colonnes, index=table.index, dtype=np.float64)
+        cibles = ordinaux - decalage
+        positions = np.searchsorted(ordinaux, cibles).clip(max=len(ordinaux) - 1)
+        trouvees = ordinaux[positions] == cibles
+        ecarts = np.where(trouvees[:, None], valeurs - valeurs[positions], np.nan)
+        return pd.DataFrame(ecarts, index=table.index, columns=self.colonnes)
+
+    def period_change(self):
+        """Variations par rapport à la période précédente (QoQ pour un trimestre)"""
+        return self.deltas(1)
+
+    def year_change(self):
+        """Variations sur un an (YoY)"""
+        return self.deltas(PERIODES_PAR_AN[self.freq])
+
+    def last_delta(self, col, decalage=1):
+        """Dernière valeur d'un indicateur et son écart avec ``decalage`` périodes plus tôt"""
+        table = self.table()
+        if not len(table):
+            return None, None
+        delta = self.deltas(decalage)[col].iloc[-1]
+        return table[col].iloc[-1], None if np.isnan(delta) else delta
+
+
+def build_rollups(df, colonnes, freqs=('Q', 'Y'), sommes=()):
+    """Agrégats d'un jeu de données pour plusieurs fréquences"""
+    return {freq: Rollup.from_frame(df, colonnes, freq, sommes) for freq in freqs}
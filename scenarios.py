@@ -0,0 +1,146 @@
+# scenarios.py
+"""Simulation Monte Carlo de trajectoires futures à partir des régimes des générateurs.
+
+Chaque indicateur est simulé d'un bloc sous forme de tableau 2-D
+(scénarios x mois). Un scénario peut subir, avec une probabilité donnée, un
+choc du type COVID débutant à un mois aléatoire : les mois qui suivent le
+début du choc reprennent les bandes de tirage des années 2020-2022 des
+générateurs (``covid_impact``, ``covid_factor``), les autres les bandes
+hors crise. La part renouvelable suit le dernier palier des générateurs.
+
+Les scénarios sont découpés en blocs de taille fixe, chacun avec sa propre
+graine : le résultat ne dépend pas du nombre de processus. Les processus
+écrivent directement dans un tampon ``multiprocessing.shared_memory`` alloué
+par le processus principal, sans renvoyer de tableaux sérialisés.
+"""
+import logging
+import os
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import get_context, shared_memory
+
+import numpy as np
+import pandas as pd
+
+from data_engine import DEFAULT_SEED
+
+logger = logging.getLogger(__name__)
+
+# Indicateurs simulés, dans l'ordre des plans du tampon partagé
+INDICATEURS = ('pib_mensuel', 'croissance_pib', 'arrivees_touristes', 'part_renouvelable')
+
+# Nombre de scénarios par bloc (unité de travail et de graine)
+TAILLE_BLOC = 1000
+
+# Percentiles des graphiques en éventail
+PERCENTILES = (5, 25, 50, 75, 95)
+
+
+def _regimes_choc(decalage):
+    """Masques des phases d'un choc à partir du nombre de mois écoulés depuis son début"""
+    return [
+        (decalage >= 0) & (decalage < 18),   # confinements (2020 - mi-2021)
+        (decalage >= 18) & (decalage < 24),  # réouverture partielle (fin 2021)
+        (decalage >= 24) & (decalage < 36),  # reprise (2022)
+    ]
+
+
+def simulate_block(mois, n, rng, probabilite_choc, pib_initial):
+    """Simule n scénarios sur les mois donnés ; retourne un tableau (indicateurs, n, mois)"""
+    horizon = len(mois)
+    # Début du choc de chaque scénario (-horizon - 36 : aucun choc pendant l'horizon)
+    choc = rng.random(n) < probabilite_choc
+    debut = np.where(choc, rng.integers(0, horizon, n), -horizon - 36)
+    decalage = np.arange(horizon)[None, :] - debut[:, None]
+    confinement, reouverture, reprise = _regimes_choc(decalage)
+
+    # Croissance : bandes 2020 pendant les 12 premiers mois, 2021 les 12 suivants
+    annee_1 = (decalage >= 0) & (decalage < 12)
+    annee_2 = (decalage >= 12) & (decalage < 24)
+    impact = rng.uniform(np.select([annee_1, annee_2], [-0.08, -0.02], 0.02),
+                         np.select([annee_1, annee_2], [-0.03, 0.02], 0.06))
+    croissance = 2.8 + impact * 100
+    pib = pib_initial * np.cumprod(1 + croissance / 100 / 12, axis=1)
+
+    # Tourisme : saisonnalité des générateurs et facteur de fréquentation par phase
+    base = np.select([np.isin(mois, [7, 8, 12, 1]), np.isin(mois, [2, 3, 9, 10])], [120000, 80000], 50000)
+    phases = [confinement, reouverture, reprise]
+    facteur = rng.uniform(np.select(phases, [0.02, 0.2, 0.6], 0.9), np.select(phases, [0.08, 0.4, 0.8], 1.1))
+    arrivees = base[None, :] * facteur
+
+    renouvelable = rng.uniform(0.45, 0.55, (n, horizon))
+    return np.stack([pib, croissance, arrivees, renouvelable])
+
+
+def _simulate_into(nom_tampon, forme, debut, n, graine, mois, probabilite_choc, pib_initial):
+    """Tâche d'un processus : simule un bloc et l'écrit dans le tampon partagé"""
+    tampon = shared_memory.SharedMemory(name=nom_tampon)
+    try:
+        resultats = np.ndarray(forme, dtype=np.float64, buffer=tampon.buf)
+        rng = np.random.Generator(np.random.PCG64(graine))
+        resultats[:, debut:debut + n] = simulate_block(mois, n, rng, probabilite_choc, pib_initial)
+        del resultats
+    finally:
+        tampon.close()
+
+
+class ScenarioEngine:
+    """Simule des milliers de trajectoires en parallèle et en résume les percentiles"""
+    def __init__(self, workers=None, seed=DEFAULT_SEED):
+        self.workers = workers if workers is not None else os.cpu_count() or 1
+        self.seed = seed
+        self._pool = None
+
+    def pool(self):
+        """Pool de processus créé au premier besoin (None en mode séquentiel)"""
+        if self.workers <= 1:
+            return None
+        if self._pool is None:
+            # spawn : les processus ne dupliquent pas les threads du serveur
+            self._pool = ProcessPoolExecutor(self.workers, mp_context=get_context('spawn'))
+        return self._pool
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+    def _run(self, taches):
+        """Exécute les tâches dans le pool, ou séquentiellement si le pool est indisponible"""
+        pool = self.pool()
+        if pool is not None:
+            try:
+                for future in [pool.submit(_simulate_into, *tache) for tache in taches]:
+                    future.result()
+                return
+            except (BrokenProcessPool, OSError):
+                logger.exception("Pool de simulation indisponible, repli séquentiel")
+                self.shutdown()
+                self.workers = 1
+        for tache in taches:
+            _simulate_into(*tache)
+
+    def simulate(self, debut, horizon=36, n_scenarios=5000, probabilite_choc=0.1, pib_initial=20.5):
+        """Percentiles de chaque indicateur : dictionnaire indicateur -> DataFrame (mois x percentiles)"""
+        dates = pd.date_range(pd.Timestamp(debut), periods=horizon, freq='ME')
+        mois = dates.month.to_numpy()
+        forme = (len(INDICATEURS), n_scenarios, horizon)
+        blocs = [(i, min(TAILLE_BLOC, n_scenarios - i)) for i in range(0, n_scenarios, TAILLE_BLOC)]
+        graines = np.random.SeedSequence(self.seed, spawn_key=(zlib.crc32(b'scenarios'),)).spawn(len(blocs))
+
+        tampon = shared_memory.SharedMemory(create=True, size=int(np.prod(forme)) * 8)
+        try:
+            resultats = np.ndarray(forme, dtype=np.float64, buffer=tampon.buf)
+            taches = [(tampon.name, forme, i, n, graine, mois, probabilite_choc, pib_initial)
+                      for (i, n), graine in zip(blocs, graines)]
+            self._run(taches)
+            quantiles = np.percentile(resultats, PERCENTILES, axis=1)
+            del resultats
+        finally:
+            tampon.close()
+            tampon.unlink()
+
+        return {indicateur: pd.DataFrame(quantiles[:, i, :].T, index=dates,
+                                         columns=[f'p{p}' for p in PERCENTILES])
+                for i, indicateur in enumerate(INDICATEURS)}
@@ -0,0 +1,289 @@
+# sectors.py
+"""Catalogue des secteurs économiques, stocké en colonnes (un tableau NumPy par attribut).
+
+Le catalogue intégré compte huit secteurs. Une nomenclature hiérarchique (NAF :
+sections, divisions, groupes... plusieurs centaines de lignes) peut le
+remplacer : fichier CSV ou Parquet désigné par ``REUNION_SECTEURS``, avec une
+colonne ``secteur`` (identifiant unique), une colonne ``parent`` (vide pour les
+secteurs de premier niveau) et les colonnes de ``SECTEURS``. Les mesures
+absentes d'un secteur parent sont agrégées depuis ses enfants.
+
+Totaux, parts, couleurs et index parent/enfants sont calculés une fois à la
+construction ; le catalogue est ensuite partagé en lecture seule par toutes les
+sessions (``get_sector_catalog`` dans Dashboard.py).
+"""
+import os
+import zlib
+
+import numpy as np
+import pandas as pd
+
+from data_engine import DEFAULT_SEED
+
+SECTEURS_ENV = 'REUNION_SECTEURS'
+
+SECTEURS = {
+    'Tourisme': {
+        'nom_complet': 'Tourisme et Hôtellerie',
+        'poids_pib': 18.7,
+        'croissance': 6.2,
+        'emplois': 35000,
+        'couleur': '#EF4135',
+        'description': 'Premier secteur économique de l\'île',
+        'entreprises_cles': ['Accor', 'Club Med', 'Palm Hotel', 'LUX*'],
+        'perspectives': 'Très positives avec reprise post-COVID'
+    },
+    'Agriculture': {
+        'nom_complet': 'Agriculture et Agroalimentaire',
+        'poids_pib': 12.3,
+        'croissance': 2.1,
+        'emplois': 28000,
+        'couleur': '#28a745',
+        'description': 'Canne à sucre, fruits tropicaux, élevage',
+        'entreprises_cles': ['Tereos', 'Sucrerie de Bois Rouge', 'Chambre d\'Agriculture'],
+        'perspectives': 'Stable avec diversification'
+    },
+    'BTP': {
+        'nom_complet': 'Bâtiment et Travaux Publics',
+        'poids_pib': 15.4,
+        'croissance': 8.9,
+        'emplois': 42000,
+        'couleur': '#FF6B00',
+        'description': 'Construction, infrastructures, grands chantiers',
+        'entreprises_cles': ['Vinci', 'Eiffage', 'Bouygues', 'Sogea'],
+        'perspectives': 'Très positives avec NEO'
+    },
+    'Commerce': {
+        'nom_complet': 'Commerce et Distribution',
+        'poids_pib': 14.2,
+        'croissance': 3.8,
+        'emplois': 52000,
+        'couleur': '#6f42c1',
+        'description': 'Grande distribution, commerce de détail',
+        'entreprises_cles': ['Carrefour', 'Leader Price', 'Jumbo', 'Run Market'],
+        'perspectives': 'Stable'
+    },
+    'Services Publics': {
+        'nom_complet': 'Services Publics et Administration',
+        'poids_pib': 22.1,
+        'croissance': 1.2,
+        'emplois': 68000,
+        'couleur': '#0055A4',
+        'description': 'Administration, éducation, santé publique',
+        'entreprises_cles': ['ARS', 'Rectorat', 'Conseil Départemental', 'Conseil Régional'],
+        'perspectives': 'Stable'
+    },
+    'Énergie': {
+        'nom_complet': 'Énergie et Environnement',
+        'poids_pib': 5.8,
+        'croissance': 12.4,
+        'emplois': 8500,
+        'couleur': '#FFD100',
+        'description': 'Énergies renouvelables, transition écologique',
+        'entreprises_cles': ['EDF', 'Albioma', 'Akuo Energy', 'SIDELEC'],
+        'perspectives': 'Très positives'
+    },
+    'Numérique': {
+        'nom_complet': 'Numérique et Télécoms',
+        'poids_pib': 4.2,
+        'croissance': 9.7,
+        'emplois': 6200,
+        'couleur': '#00A3E0',
+        'description': 'Télécommunications, services numériques',
+        'entreprises_cles': ['Orange', 'SFR', 'Zeop', 'Runware'],
+        'perspectives': 'Très positives'
+    },
+    'Industrie': {
+        'nom_complet': 'Industrie et Transformation',
+        'poids_pib': 7.3,
+        'croissance': 4.5,
+        'emplois': 12500,
+        'couleur': '#8B4513',
+        'description': 'Agroalimentaire, BTP, énergie',
+        'entreprises_cles': ['Sofraca', 'Bourbon', 'Groupe Quartier Français'],
+        'perspectives': 'Modérément positives'
+    }
+}
+
+LOCALISATIONS = ('Saint-Denis', 'Saint-Pierre', 'Le Port', 'Saint-Paul', 'Saint-André')
+COULEUR_DEFAUT = '#6c757d'
+
+
+def _names(valeur):
+    """Entreprises clés : liste Python (catalogue intégré) ou noms séparés par « ; » (fichier)"""
+    if isinstance(valeur, str):
+        return tuple(nom.strip() for nom in valeur.split(';') if nom.strip())
+    if isinstance(valeur, (list, tuple, np.ndarray)):
+        return tuple(valeur)
+    return ()
+
+
+def load_catalog(chemin=None, seed=DEFAULT_SEED):
+    """Catalogue du fichier ``chemin`` (ou de ``REUNION_SECTEURS``), sinon le catalogue intégré"""
+    chemin = chemin or os.environ.get(SECTEURS_ENV)
+    if not chemin:
+        table = pd.DataFrame([{'secteur': secteur, **info} for secteur, info in SECTEURS.items()])
+    elif chemin.endswith('.parquet'):
+        table = pd.read_parquet(chemin)
+    else:
+        table = pd.read_csv(chemin, dtype={'secteur': str, 'parent': str})
+    return SectorCatalog(table, seed)
+
+
+class SectorCatalog:
+    """Secteurs en colonnes, ordonnés par niveau puis par parent.
+
+    Chaque niveau, et les enfants d'un même secteur, occupent des positions
+    contiguës : descendre d'un niveau est une tranche, remonter un ``bincount``.
+    Les écarts « vs année précédente » et la table des entreprises, simulés,
+    sont tirés une fois à partir de la graine.
+    """
+    def __init__(self, table, seed=DEFAULT_SEED):
+        table = table.reset_index(drop=True)
+        codes = table['secteur'].astype(str).to_numpy()
+        position = {code: i for i, code in enumerate(codes)}
+        if len(position) != len(codes):
+            raise ValueError("Identifiants de secteur en double")
+        parents = table['parent'] if 'parent' in table else pd.Series(np.nan, index=table.index)
+        inconnus = {p for p in parents if isinstance(p, str) and p and p not in position}
+        if inconnus:
+            raise ValueError(f"Secteurs parents inconnus: {sorted(inconnus)}")
+        parent = np.array([position[p] if isinstance(p, str) and p else -1 for p in parents], dtype=np.int64)
+
+        # Parcours en largeur : un niveau après l'autre, enfants regroupés dans l'ordre de leur parent
+        rang = np.full(len(codes), -1, dtype=np.int64)
+        morceaux, bornes = [], [0]
+        courant = np.flatnonzero(parent < 0)
+        while len(courant):
+            rang[courant] = np.arange(bornes[-1], bornes[-1] + len(courant))
+            morceaux.append(courant)
+            bornes.append(bornes[-1] + len(courant))
+            enfants = np.flatnonzero(np.isin(parent, courant))
+            courant = enfants[np.argsort(rang[parent[enfants]], kind='stable')]
+        if bornes[-1] != len(codes):
+            raise ValueError("Cycle dans la hiérarchie des secteurs")
+        ordre = np.concatenate(morceaux) if morceaux else np.zeros(0, dtype=np.int64)
+        table = table.iloc[ordre].reset_index(drop=True)
+
+        self.codes = codes[ordre]
+        self.position = {code: i for i, code in enumerate(self.codes)}
+        self.parent = np.where(parent[ordre] >= 0, rang[parent[ordre]], -1)
+        self._niveaux = np.array(bornes, dtype=np.int64)
+        self.niveau = np.repeat(np.arange(len(bornes) - 1), np.diff(self._niveaux))
+        # Enfants du secteur i : positions _enfants[i] à _enfants[i + 1]
+        self._enfants = np.full(len(codes) + 1, bornes[1] if len(bornes) > 1 else 0, dtype=np.int64)
+        np.cumsum(np.bincount(self.parent[self.parent >= 0], minlength=len(codes)), out=self._enfants[1:])
+        self._enfants[1:] += self._enfants[0]
+
+        def mesure(nom):
+            return table[nom].to_numpy(dtype=float) if nom in table else np.full(len(table), np.nan)
+
+        # Mesures absentes d'un parent : agrégées depuis les enfants (sommes, croissance pondérée par le PIB)
+        poids_pib = mesure('poids_pib')
+        self.poids_pib = np.where(np.isnan(poids_pib), self.rollup(np.nan_to_num(poids_pib)), poids_pib)
+        emplois = mesure('emplois')
+        self.emplois = np.where(np.isnan(emplois), self.rollup(np.nan_to_num(emplois)), emplois).round().astype(np.int64)
+        croissance = mesure('croissance')
+        self.croissance = np.where(np.isnan(croissance),
+                                   self.rollup(np.nan_to_num(croissance), self.poids_pib), croissance)
+
+        # Part de l'emploi total, celui du premier niveau : un parent ne couvre pas
+        # forcément tous ses sous-secteurs au niveau suivant
+        self.part_emploi = self.emplois / max(self.emplois[self.niveau == 0].sum(), 1) * 100
+
+        # Couleurs : celle du parent lorsqu'elle n'est pas renseignée
+        couleurs = table['couleur'].fillna('').to_numpy(dtype=object) if 'couleur' in table else np.full(len(table), '', dtype=object)
+        couleurs[(couleurs == '') & (self.niveau == 0)] = COULEUR_DEFAUT
+        for k in range(1, len(bornes) - 1):
+            niveau = self.level(k)
+            manquantes = couleurs[niveau] == ''
+            couleurs[niveau] = np.where(manquantes, couleurs[self.parent[niveau]], couleurs[niveau])
+        self.couleurs = dict(zip(self.codes, couleurs))
+
+        def texte(nom):
+            return table[nom].fillna('').astype(str).to_numpy() if nom in table else np.full(len(table), '', dtype=object)
+
+        self.nom_complet = np.where(texte('nom_complet') == '', self.codes, texte('nom_complet'))
+        self.description = texte('description')
+        self.perspectives = texte('perspectives')
+        self.entreprises_cles = tuple(map(_names, table['entreprises_cles'])) if 'entreprises_cles' in table else ((),) * len(table)
+
+        rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(zlib.crc32(b'secteurs'),)))
+        n = len(self.codes)
+        self.delta_poids = rng.uniform(-0.3, 0.4, n)
+        self.delta_croissance = rng.uniform(-1, 1.5, n)
+        self.delta_emplois = rng.integers(-500, 1501, n)
+        # Position du secteur de chaque entreprise
+        self._proprietaires = np.repeat(np.arange(n), [len(liste) for liste in self.entreprises_cles])
+        m = len(self._proprietaires)
+        self.entreprises = pd.DataFrame({
+            'entreprise': [entreprise for liste in self.entreprises_cles for entreprise in liste],
+            'secteur': self.codes[self._proprietaires],
+            'chiffre_affaires_estime': rng.uniform(5, 300, m),  # Millions EUR
+            'employes': rng.integers(50, 3001, m),
+            'localisation': np.asarray(LOCALISATIONS, dtype=object)[rng.integers(0, len(LOCALISATIONS), m)],
+        })
+        self.version = f"{n}:{zlib.crc32(pd.util.hash_pandas_object(table.astype(str), index=False).to_numpy().tobytes()):08x}"
+
+    def __len__(self):
+        return len(self.codes)
+
+    @property
+    def depth(self):
+        """Nombre de niveaux de la hiérarchie"""
+        return len(self._niveaux) - 1
+
+    def level(self, niveau):
+        """Positions des secteurs d'un niveau (tranche)"""
+        return slice(self._niveaux[niveau], self._niveaux[niveau + 1])
+
+    def children(self, i):
+        """Positions des sous-secteurs directs du secteur i (tranche)"""
+        return slice(self._enfants[i], self._enfants[i + 1])
+
+    def select(self, codes):
+        """Positions des secteurs désignés (identifiants inconnus ignorés)"""
+        return np.array([self.position[code] for code in codes if code in self.position], dtype=np.int64)
+
+    def rollup(self, valeurs, poids=None):
+        """Remonte des valeurs vers les parents, du niveau le plus fin au premier niveau.
+
+        Un secteur qui a des enfants reçoit leur somme, ou leur moyenne pondérée
+        par ``poids`` ; les autres gardent leur valeur.
+        """
+        valeurs = np.array(valeurs, dtype=float)
+        for k in range(self.depth - 1, 0, -1):
+            niveau, parents = self.level(k), self.level(k - 1)
+            cibles = self.parent[niveau] - parents.start
+            taille = parents.stop - parents.start
+            avec_enfants = np.bincount(cibles, minlength=taille) > 0
+            if poids is None:
+                agregat = np.bincount(cibles, valeurs[niveau], minlength=taille)
+            else:
+                total = np.bincount(cibles, poids[niveau], minlength=taille)
+                agregat = np.bincount(cibles, valeurs[niveau] * poids[niveau], minlength=taille) / np.where(total != 0, total, 1)
+            valeurs[parents] = np.where(avec_enfants, agregat, valeurs[parents])
+        return valeurs
+
+    def descendants_mask(self, positions):
+        """Masque des secteurs désignés et de tous leurs sous-secteurs"""
+        masque = np.zeros(len(self.codes), dtype=bool)
+        masque[positions] = True
+        for k in range(1, self.depth):
+            niveau = self.level(k)
+            masque[niveau] |= masque[self.parent[niveau]]
+        return masque
+
+    def frame(self, positions):
+        """Table des secteurs ``positions`` (tableau ou tranche), avec leur part précalculée de l'emploi total"""
+        return pd.DataFrame({
+            'secteur': self.codes[positions],
+            'poids_pib': self.poids_pib[positions],
+            'croissance': self.croissance[positions],
+            'emplois': self.emplois[positions],
+            'part_emploi_total': self.part_emploi[positions],
+        })
+
+    def companies(self, positions):
+        """Entreprises des secteurs désignés et de leurs sous-secteurs"""
+        return self.entreprises[self.descendants_mask(positions)[self._proprietaires]].reset_index(drop=True)
@@ -0,0 +1,391 @@
+# sources.py
+"""Sources de données interchangeables pour le dashboard.
+
+Une source expose ``load(nom, colonnes, debut, fin)`` et retourne un DataFrame
+conforme à ``SCHEMAS`` (colonne ``date`` + colonnes déclarées), indexé par ses
+dates. Deux implémentations :
+
+- ``SyntheticSource`` : données simulées par ``DataEngine`` (comportement historique) ;
+- ``FileSource`` : extraits INSEE / CEROM / IEDOM téléchargés hors ligne, en
+  CSV ou Parquet, lus en ne chargeant que les colonnes et les lignes demandées ;
+- ``HttpSource`` : les mêmes extraits servis par les organismes en HTTP,
+  téléchargés en parallèle dans une copie locale lue par ``FileSource``.
+"""
+import asyncio
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from urllib.parse import urlsplit
+
+import pandas as pd
+
+from data_engine import GENERATEURS, GENERATEURS_VERSION, SCHEMAS, DataEngine, slice_period
+from http_client import ConnectionPool
+
+logger = logging.getLogger(__name__)
+
+
+def _colonnes(nom, colonnes):
+    """Colonnes à charger : la date puis les colonnes demandées (toutes par défaut)"""
+    if nom not in SCHEMAS:
+        raise ValueError(f"Jeu de données inconnu: {nom}")
+    if colonnes is None:
+        return list(SCHEMAS[nom])
+    inconnues = set(colonnes) - set(SCHEMAS[nom]) - {'date'}
+    if inconnues:
+        raise ValueError(f"Colonnes inconnues pour {nom}: {sorted(inconnues)}")
+    return [col for col in SCHEMAS[nom] if col in colonnes]
+
+
+def select(df, nom, colonnes=None, debut=None, fin=None):
+    """Restreint un jeu de données complet à une période et des colonnes (vues, sans copie)"""
+    if len(df) and (debut is not None or fin is not None):
+        df = slice_period(df, debut if debut is not None else df.index[0],
+                          fin if fin is not None else df.index[-1])
+    return df[['date'] + _colonnes(nom, colonnes)]
+
+
+class DataSource:
+    """Interface commune des sources de données"""
+    label = "source"
+
+    def load(self, nom, colonnes=None, debut=None, fin=None):
+        """Charge un jeu de données, éventuellement restreint à des colonnes et une période"""
+        raise NotImplementedError
+
+    def cache_key(self, nom):
+        """Clé identifiant le contenu courant d'un jeu de données, pour les caches"""
+        raise NotImplementedError
+
+    def identity(self):
+        """Identifiant stable de la source, indépendant de la version des données (ressources partagées)"""
+        return (self.label,)
+
+    def describe(self):
+        """Description courte de la source, pour l'interface"""
+        return self.label
+
+    def refresh(self, noms=None):
+        """Met à jour les copies locales d'une source distante (sans effet pour les autres sources)"""
+        return None
+
+
+class SyntheticSource(DataSource):
+    """Données simulées de façon déterministe par un DataEngine"""
+    label = "synthétique"
+
+    def __init__(self, engine=None):
+        self.engine = engine or DataEngine()
+        self._frames = {}
+
+    def load(self, nom, colonnes=None, debut=None, fin=None):
+        # La série complète est générée une seule fois : générer une sous-période
+        # produirait d'autres tirages que ceux de l'historique complet
+        if nom not in self._frames:
+            self._frames[nom] = self.engine.dataset(nom)
+        return select(self._frames[nom], nom, colonnes, debut, fin)
+
+    def __getstate__(self):
+        # Envoyée à un processus de construction : les séries déjà générées ne sont pas transmises
+        etat = self.__dict__.copy()
+        etat['_frames'] = {}
+        return etat
+
+    def cache_key(self, nom):
+        return ('synthetic', self.engine.snapshot_id)
+
+    def identity(self):
+        # Sans la période : snapshot_id change chaque jour avec la date de fin
+        return ('synthetic', GENERATEURS_VERSION, self.engine.seed)
+
+
+class FileSource(DataSource):
+    """Extraits locaux ``<repertoire>/<nom>.parquet`` ou ``<repertoire>/<nom>.csv``.
+
+    - projection : seules les colonnes demandées sont lues (``usecols`` / ``columns``) ;
+    - types : les dtypes de ``SCHEMAS`` sont déclarés à la lecture ;
+    - prédicat sur la date : filtres de groupes de lignes en Parquet, lecture
+      par blocs en CSV, arrêtée dès que la fin de période est dépassée (les
+      fichiers sont supposés triés par date ; ``sorted=False`` lit tout le fichier).
+
+    Les jeux sans fichier sont lus dans ``secours`` s'il est fourni (sinon FileNotFoundError).
+    """
+    label = "fichiers"
+
+    def __init__(self, repertoire, taille_bloc=100_000, sorted=True, secours=None):
+        self.repertoire = repertoire
+        self.taille_bloc = taille_bloc
+        self.sorted = sorted
+        self.secours = secours
+
+    def path(self, nom):
+        """Chemin du fichier d'un jeu de données (Parquet prioritaire sur CSV)"""
+        for extension in ('parquet', 'csv'):
+            chemin = os.path.join(self.repertoire, f"{nom}.{extension}")
+            if os.path.exists(chemin):
+                return chemin
+        raise FileNotFoundError(f"Aucun fichier {nom}.parquet ou {nom}.csv dans {self.repertoire}")
+
+    def has_file(self, nom):
+        """Indique si le jeu de données a un fichier dans le répertoire"""
+        try:
+            self.path(nom)
+            return True
+        except FileNotFoundError:
+            return False
+
+    def load(self, nom, colonnes=None, debut=None, fin=None):
+        if self.secours is not None and not self.has_file(nom):
+            return self.secours.load(nom, colonnes, debut, fin)
+        colonnes = _colonnes(nom, colonnes)
+        debut = pd.Timestamp(debut) if debut is not None else None
+        # Fin de période incluse sur toute la journée
+        fin = pd.Timestamp(fin).normalize() + pd.Timedelta(days=1) if fin is not None else None
+        chemin = self.path(nom)
+        if chemin.endswith('.parquet'):
+            df = self._read_parquet(chemin, colonnes, debut, fin)
+        else:
+            df = self._read_csv(nom, chemin, colonnes, debut, fin)
+        df = df.astype({col: SCHEMAS[nom][col] for col in colonnes})
+        df['date'] = pd.to_datetime(df['date'])
+        df = df.sort_values('date', kind='stable')
+        df.index = pd.DatetimeIndex(df['date'])
+        df.index.name = None
+        return df[['date'] + colonnes]
+
+    def _read_parquet(self, chemin, colonnes, debut, fin):
+        filtres = []
+        if debut is not None:
+            filtres.append(('date', '>=', debut))
+        if fin is not None:
+            filtres.append(('date', '<', fin))
+        try:
+            return pd.read_parquet(chemin, columns=['date'] + colonnes, filters=filtres or None)
+        except ImportError as exc:
+            raise ImportError("La lecture des fichiers Parquet nécessite pyarrow: pip install pyarrow") from exc
+
+    def _read_csv(self, nom, chemin, colonnes, debut, fin):
+        blocs = []
+        lecteur = pd.read_csv(chemin, usecols=['date'] + colonnes, parse_dates=['date'],
+                              dtype={col: SCHEMAS[nom][col] for col in colonnes},
+                              chunksize=self.taille_bloc)
+        with lecteur:
+            for bloc in lecteur:
+                dates = bloc['date']
+                masque = pd.Series(True, index=bloc.index)
+                if debut is not None:
+                    masque &= dates >= debut
+                if fin is not None:
+                    masque &= dates < fin
+                blocs.append(bloc[masque])
+                if self.sorted and fin is not None and len(bloc) and dates.iloc[-1] >= fin:
+                    break
+        if not blocs:
+            return pd.DataFrame({col: pd.Series(dtype='float64') for col in ['date'] + colonnes})
+        return pd.concat(blocs, ignore_index=True)
+
+    def cache_key(self, nom):
+        if self.secours is not None and not self.has_file(nom):
+            return self.secours.cache_key(nom)
+        chemin = self.path(nom)
+        return ('files', chemin, os.path.getmtime(chemin))
+
+    def identity(self):
+        return ('files', os.path.abspath(self.repertoire))
+
+    def describe(self):
+        if self.secours is None:
+            return f"{self.label} ({self.repertoire})"
+        simules = [nom for nom in GENERATEURS if not self.has_file(nom)]
+        return f"{self.label} ({self.repertoire}" + (f", {len(simules)} {self.secours.label})" if simules else ")")
+
+
+class HttpSource(DataSource):
+    """Extraits servis en HTTP, un point d'accès par jeu de données.
+
+    Chaque téléchargement est écrit dans ``repertoire`` (``<nom>.csv`` ou
+    ``<nom>.parquet`` selon l'URL ou le type de contenu), puis lu par
+    ``FileSource`` : la clé de cache est celle du fichier local, qui ne change
+    que si le contenu a changé. refresh() interroge les jeux en parallèle, dans
+    une boucle asyncio propre à la source, sur des connexions réutilisées :
+
+    - requêtes conditionnelles (``If-None-Match`` / ``If-Modified-Since``) : un
+      jeu inchangé (304) n'est ni retéléchargé ni relu ;
+    - délai par requête : en cas de dépassement ou d'erreur, la copie locale
+      précédente est conservée (jeu « périmé ») ;
+    - seuls les jeux sans copie locale sont attendus ; les autres sont vérifiés
+      en arrière-plan, au plus une fois toutes les ``max_age`` secondes, et la
+      nouvelle version est prise en compte à l'exécution suivante.
+
+    Les jeux sans point d'accès sont lus dans ``secours`` (données simulées par défaut).
+    """
+    label = "http"
+
+    def __init__(self, urls, repertoire, secours=None, timeout=10.0, max_age=300, connexions=4):
+        self.urls = dict(urls)
+        self.repertoire = repertoire
+        self.secours = secours or SyntheticSource()
+        self.timeout = timeout
+        self.max_age = max_age
+        self.connexions = connexions
+        self.fichiers = FileSource(repertoire)
+        # État de la dernière vérification de chaque jeu (modifié, inchangé, périmé, indisponible)
+        self.status = {}
+        self._verifie = {}
+        self._boucle = None
+        self._pool = None
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        # Envoyée à un processus de construction : seule la copie locale y est lue
+        etat = self.__dict__.copy()
+        etat.update(_boucle=None, _pool=None, _lock=None)
+        return etat
+
+    def __setstate__(self, etat):
+        self.__dict__.update(etat)
+        self._lock = threading.Lock()
+
+    def _loop(self):
+        """Boucle asyncio de la source, exécutée dans un thread dédié (créée au premier besoin)"""
+        with self._lock:
+            if self._boucle is None:
+                self._boucle = asyncio.new_event_loop()
+                self._pool = ConnectionPool(self.connexions)
+                threading.Thread(target=self._boucle.run_forever, name='http-source', daemon=True).start()
+            return self._boucle
+
+    def _meta_path(self, nom):
+        return os.path.join(self.repertoire, f"{nom}.json")
+
+    def has_copy(self, nom):
+        """Indique si une copie locale du jeu de données existe"""
+        return self.fichiers.has_file(nom)
+
+    def refresh(self, noms=None, force=False):
+        """Vérifie les jeux dont la dernière vérification date de plus de ``max_age`` secondes"""
+        maintenant = time.time()
+        with self._lock:
+            noms = [nom for nom in (noms if noms is not None else self.urls)
+                    if nom in self.urls and (force or maintenant - self._verifie.get(nom, 0) >= self.max_age)]
+            for nom in noms:
+                self._verifie[nom] = maintenant
+        if not noms:
+            return self.status
+        boucle = self._loop()
+        taches = {nom: asyncio.run_coroutine_threadsafe(self._fetch(nom), boucle) for nom in noms}
+        for nom, tache in taches.items():
+            if not self.has_copy(nom):
+                tache.result()
+        return self.status
+
+    async def _fetch(self, nom):
+        """Requête conditionnelle d'un jeu ; écrit la copie locale si le contenu a changé"""
+        debut = time.perf_counter()
+        meta = {}
+        if self.has_copy(nom) and os.path.exists(self._meta_path(nom)):
+            with open(self._meta_path(nom), encoding='utf-8') as fichier:
+                meta = json.load(fichier)
+        entetes = {}
+        if meta.get('etag'):
+            entetes['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            entetes['If-Modified-Since'] = meta['last_modified']
+        erreur = None
+        try:
+            statut, reponse, corps = await asyncio.wait_for(self._pool.get(self.urls[nom], entetes), self.timeout)
+            if statut == 304:
+                etat = 'inchangé'
+            elif statut == 200:
+                self._write(nom, corps, reponse)
+                etat = 'modifié'
+            else:
+                raise OSError(f"HTTP {statut}")
+        except Exception as exc:
+            # Réseau, délai, réponse tronquée (IncompleteReadError) ou écriture : la copie précédente reste lue
+            erreur = str(exc) or type(exc).__name__
+            etat = 'périmé' if self.has_copy(nom) else 'indisponible'
+            logger.warning("Téléchargement de %s impossible (%s) : %s", nom, self.urls[nom], erreur)
+        self.status[nom] = {'etat': etat, 'secondes': time.perf_counter() - debut, 'erreur': erreur}
+
+    def _write(self, nom, corps, reponse):
+        """Remplace la copie locale d'un jeu de façon atomique, avec ses validateurs HTTP"""
+        os.makedirs(self.repertoire, exist_ok=True)
+        chemin_url = urlsplit(self.urls[nom]).path
+        parquet = chemin_url.endswith('.parquet') or 'parquet' in reponse.get('content-type', '')
+        extension, autre = ('parquet', 'csv') if parquet else ('csv', 'parquet')
+        chemin = os.path.join(self.repertoire, f"{nom}.{extension}")
+        with open(f"{chemin}.tmp", 'wb') as fichier:
+            fichier.write(corps)
+        os.replace(f"{chemin}.tmp", chemin)
+        # Une ancienne copie dans l'autre format serait lue à la place (Parquet prioritaire)
+        if os.path.exists(os.path.join(self.repertoire, f"{nom}.{autre}")):
+            os.remove(os.path.join(self.repertoire, f"{nom}.{autre}"))
+        with open(f"{self._meta_path(nom)}.tmp", 'w', encoding='utf-8') as fichier:
+            json.dump({'url': self.urls[nom], 'etag': reponse.get('etag'),
+                       'last_modified': reponse.get('last-modified')}, fichier)
+        os.replace(f"{self._meta_path(nom)}.tmp", self._meta_path(nom))
+
+    def _ensure_copy(self, nom):
+        if not self.has_copy(nom):
+            self.refresh([nom], force=True)
+        if not self.has_copy(nom):
+            raise FileNotFoundError(f"{self.urls.get(nom, nom)} indisponible et aucune copie locale de {nom}")
+
+    def load(self, nom, colonnes=None, debut=None, fin=None):
+        if nom not in self.urls:
+            return self.secours.load(nom, colonnes, debut, fin)
+        self._ensure_copy(nom)
+        return self.fichiers.load(nom, colonnes, debut, fin)
+
+    def cache_key(self, nom):
+        if nom not in self.urls:
+            return self.secours.cache_key(nom)
+        self._ensure_copy(nom)
+        return ('http',) + self.fichiers.cache_key(nom)[1:]
+
+    def identity(self):
+        return ('http', tuple(sorted(self.urls.items())))
+
+    def describe(self):
+        perimes = sum(etat['etat'] in ('périmé', 'indisponible') for etat in self.status.values())
+        return f"{self.label} ({len(self.urls)} points d'accès" + (f", {perimes} périmé(s))" if perimes else ")")
+
+
+# Répertoire des extraits locaux ; sans cette variable, les données sont simulées
+DATA_DIR_ENV = 'REUNION_DATA_DIR'
+# Points d'accès HTTP : modèle d'URL contenant {nom} (prioritaire sur REUNION_DATA_DIR),
+# remplaçable jeu par jeu par REUNION_DATA_URL_<NOM>
+DATA_URL_ENV = 'REUNION_DATA_URL'
+# Copies locales des téléchargements
+HTTP_CACHE_ENV = 'REUNION_HTTP_CACHE'
+
+# Sources HTTP du processus : la boucle, les connexions et les dates de vérification
+# sont conservées d'une exécution du script à l'autre
+_sources_http = {}
+
+
+def source_from_env(engine):
+    """Source configurée par l'environnement : HTTP, fichiers, ou données simulées par défaut"""
+    modele = os.environ.get(DATA_URL_ENV)
+    urls = {nom: os.environ.get(f"{DATA_URL_ENV}_{nom.upper()}") or (modele.format(nom=nom) if modele else None)
+            for nom in GENERATEURS}
+    urls = {nom: url for nom, url in urls.items() if url}
+    if urls:
+        repertoire = os.environ.get(HTTP_CACHE_ENV) or os.path.join(tempfile.gettempdir(), 'reunion-http')
+        cle = (tuple(sorted(urls.items())), repertoire)
+        source = _sources_http.get(cle)
+        if source is None:
+            source = _sources_http[cle] = HttpSource(urls, repertoire, SyntheticSource(engine))
+        elif source.secours.engine.snapshot_id != engine.snapshot_id:
+            # Nouvelle période simulée : même boucle et mêmes connexions, seul le secours change
+            source.secours = SyntheticSource(engine)
+        return source
+    repertoire = os.environ.get(DATA_DIR_ENV)
+    if repertoire:
+        # Les extraits couvrent rarement tous les jeux : les autres restent simulés
+        return FileSource(repertoire, secours=SyntheticSource(engine))
+    return SyntheticSource(engine)
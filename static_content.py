@@ -0,0 +1,132 @@
+# static_content.py
+"""Contenu fixe du dashboard : marchés émetteurs, infrastructures, projets, objectifs, micro-régions, DROM.
+
+Tables et figures sont construites une seule fois par processus
+(``get_static_content`` dans Dashboard.py) puis partagées par toutes les
+sessions et toutes les exécutions : elles ne doivent pas être modifiées.
+"""
+import zlib
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+
+from data_engine import DEFAULT_SEED
+
+MARCHES = {
+    'Marché': ['France Métropolitaine', 'Mayotte', 'Maurice', 'Afrique du Sud', 'Europe', 'Autres'],
+    'Part_Marché': [65, 12, 8, 5, 7, 3],
+    'Croissance': [4.2, 8.7, 6.1, 12.3, 5.8, 9.4]
+}
+
+INFRASTRUCTURES = (
+    {'Type': 'Hôtels', 'Nombre': 125, 'Capacité': '15,000 chambres', 'Taux Occupation': '68%'},
+    {'Type': 'Résidences de tourisme', 'Nombre': 85, 'Capacité': '3,200 appartements', 'Taux Occupation': '62%'},
+    {'Type': 'Gîtes et meublés', 'Nombre': 1200, 'Capacité': '8,500 lits', 'Taux Occupation': '58%'},
+    {'Type': 'Campings', 'Nombre': 25, 'Capacité': '1,200 emplacements', 'Taux Occupation': '72%'},
+    {'Type': 'Restaurants', 'Nombre': 1800, 'Capacité': '85,000 couverts', 'Taux Occupation': '65%'},
+)
+TENDANCES = ('En hausse', 'Stable', 'En baisse modérée')
+
+PROJETS_ENERGIE = (
+    {'Nom': 'Centrale photovoltaïque du Gol', 'Type': 'Solaire', 'Puissance': '10 MW', 'Avancement': '95%'},
+    {'Nom': 'Parc éolien de Sainte-Rose', 'Type': 'Éolien', 'Puissance': '12 MW', 'Avancement': '75%'},
+    {'Nom': 'Unité de méthanisation du Tampon', 'Type': 'Biomasse', 'Puissance': '5 MW', 'Avancement': '60%'},
+    {'Nom': 'Centrale biomasse de Bois Rouge', 'Type': 'Biomasse', 'Puissance': '40 MW', 'Avancement': '85%'},
+    {'Nom': 'Centrale hydroélectrique de Takamaka', 'Type': 'Hydraulique', 'Puissance': '7 MW', 'Avancement': '100%'},
+)
+
+OBJECTIFS = {
+    'Année': ['2020', '2023', '2025', '2030'],
+    'Part_ENR': [35, 45, 60, 75],
+    'Autonomie_energetique': [25, 35, 50, 65],
+    'Reduction_GES': [15, 25, 40, 60]
+}
+
+MICRO_REGIONS = {
+    'Micro-région': ['Nord', 'Ouest', 'Sud', 'Est', 'Cirques'],
+    'Population': [215000, 185000, 205000, 130000, 75000],
+    'PIB_Regional': [6.2, 5.1, 4.8, 3.2, 1.2],
+    'Taux_Chomage': [20.1, 22.5, 24.8, 26.2, 28.5],
+    'Activite_Principale': ['Services/Admin', 'Tourisme/Commerce', 'Tourisme/Agriculture', 'Agriculture', 'Agriculture'],
+    'Croissance': [3.2, 4.1, 3.8, 2.5, 1.8]
+}
+
+SPECIALISATIONS = {
+    'Nord': ('Administration', 'Services', 'Enseignement supérieur', 'Santé'),
+    'Ouest': ('Tourisme balnéaire', 'Commerce', 'Immobilier', 'Services'),
+    'Sud': ('Tourisme nature', 'Agriculture', 'Artisanat', 'Énergie renouvelable'),
+    'Est': ('Agriculture', 'Pêche', 'Énergie', 'Industrie'),
+    'Cirques': ('Agriculture de montagne', 'Tourisme rural', 'Artisanat', 'Produits locaux')
+}
+
+PROJETS_REGIONAUX = (
+    {'Nom': 'NEO Réunion', 'Région': 'Toute l\'île', 'Budget': '2.1 Md€', 'Échéance': '2030'},
+    {'Nom': 'Tram-Train', 'Région': 'Nord-Ouest', 'Budget': '1.7 Md€', 'Échéance': '2028'},
+    {'Nom': 'Pôle d\'excellence rural', 'Région': 'Cirques', 'Budget': '150 M€', 'Échéance': '2026'},
+    {'Nom': 'Zone industrialo-portuaire', 'Région': 'Ouest', 'Budget': '300 M€', 'Échéance': '2027'},
+    {'Nom': 'Pôle de compétitivité numérique', 'Région': 'Nord', 'Budget': '80 M€', 'Échéance': '2025'},
+)
+
+DROM = {
+    'Réunion': {'PIB/hab': 23700, 'Croissance': 2.8, 'Chômage': 21.5},
+    'Martinique': {'PIB/hab': 24500, 'Croissance': 1.8, 'Chômage': 16.2},
+    'Guadeloupe': {'PIB/hab': 22100, 'Croissance': 2.1, 'Chômage': 19.8},
+    'Guyane': {'PIB/hab': 15300, 'Croissance': 3.5, 'Chômage': 23.1}
+}
+
+
+class StaticContent:
+    """Tables et figures du contenu fixe, prêtes à afficher.
+
+    La tendance des infrastructures et la progression des projets régionaux,
+    simulées, sont tirées une fois à partir de la graine : elles restent
+    stables d'une exécution à l'autre.
+    """
+    def __init__(self, seed=DEFAULT_SEED):
+        rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(zlib.crc32(b'static'),)))
+
+        self.marches = pd.DataFrame(MARCHES)
+        self.regions = pd.DataFrame(MICRO_REGIONS)
+        self.objectifs = pd.DataFrame(OBJECTIFS)
+        self.specialisations = SPECIALISATIONS
+        self.infrastructures = tuple({**infra, 'Tendance': TENDANCES[i]}
+                                     for infra, i in zip(INFRASTRUCTURES, rng.integers(0, len(TENDANCES), len(INFRASTRUCTURES))))
+        self.projets_energie = tuple({**projet, 'Progression': int(projet['Avancement'].replace('%', '')) / 100}
+                                     for projet in PROJETS_ENERGIE)
+        self.projets_regionaux = tuple({**projet, 'Progression': int(progression)}
+                                       for projet, progression in zip(PROJETS_REGIONAUX, rng.integers(15, 66, len(PROJETS_REGIONAUX))))
+        # Métriques de la sidebar : (territoire, valeur, delta)
+        self.drom = tuple((territoire, f"{data['PIB/hab']:,} EUR/hab", f"{data['Croissance']}% croissance")
+                          for territoire, data in DROM.items())
+        self.figures = {
+            'marches_repartition': px.pie(self.marches,
+                                          values='Part_Marché',
+                                          names='Marché',
+                                          title='Répartition des Marchés Émetteurs (%)',
+                                          color_discrete_sequence=px.colors.qualitative.Set3),
+            'marches_croissance': px.bar(self.marches,
+                                         x='Marché',
+                                         y='Croissance',
+                                         title='Croissance par Marché Émetteur (%)',
+                                         color='Croissance',
+                                         color_continuous_scale='Viridis'),
+            'objectifs_transition': px.line(self.objectifs,
+                                            x='Année',
+                                            y=['Part_ENR', 'Autonomie_energetique', 'Reduction_GES'],
+                                            title='Objectifs de Transition Énergétique (%)',
+                                            markers=True,
+                                            color_discrete_map={'Part_ENR': '#28a745', 'Autonomie_energetique': '#0055A4', 'Reduction_GES': '#EF4135'}),
+            'regions_pib': px.bar(self.regions,
+                                  x='Micro-région',
+                                  y='PIB_Regional',
+                                  title='PIB par Micro-région (Milliards EUR)',
+                                  color='Micro-région',
+                                  color_discrete_sequence=px.colors.qualitative.Set3),
+            'regions_chomage': px.bar(self.regions,
+                                      x='Micro-région',
+                                      y='Taux_Chomage',
+                                      title='Taux de Chômage par Micro-région (%)',
+                                      color='Taux_Chomage',
+                                      color_continuous_scale='Reds'),
+        }
@@ -0,0 +1,113 @@
+# store.py
+"""Stockage colonnaire sur disque des séries historiques, lu par projection mémoire.
+
+Chaque version d'un jeu de données est écrite une fois dans un répertoire
+``<racine>/<nom>-<empreinte>/`` : un fichier ``.npy`` par colonne et un
+``meta.json`` décrivant les colonnes. Les colonnes sont ensuite ouvertes avec
+``numpy.load(mmap_mode='r')`` : les processus serveur qui lisent la même version
+partagent les pages du cache du système au lieu de détenir chacun une copie
+privée, l'ouverture est quasi instantanée et la mémoire résidente d'un worker
+ne croît pas avec la longueur de l'historique.
+"""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+
+import numpy as np
+import pandas as pd
+
+
+def _empreinte(cle):
+    """Nom de répertoire stable pour une clé de version de source"""
+    return hashlib.sha1(repr(cle).encode()).hexdigest()[:16]
+
+
+class ColumnStore:
+    """Répertoire de jeux de données colonnaires projetés en mémoire.
+
+    Les chaînes de caractères sont stockées sous forme de codes entiers, les
+    libellés étant conservés dans ``meta.json``. Les DataFrames retournés sont
+    en lecture seule et indexés par leur colonne ``date``.
+    """
+    def __init__(self, racine):
+        self.racine = racine
+        self._frames = {}
+        self._lock = threading.Lock()
+
+    def path(self, nom, cle):
+        return os.path.join(self.racine, f"{nom}-{_empreinte(cle)}")
+
+    def load(self, nom, cle, builder):
+        """Ouvre la version ``cle`` d'un jeu de données, en l'écrivant avec builder() si absente"""
+        with self._lock:
+            df = self._frames.get((nom, cle))
+        if df is not None:
+            return df
+        chemin = self.ensure(nom, cle, builder)
+        df = self.open(chemin)
+        with self._lock:
+            # Une seule version ouverte par jeu de données
+            for ancienne in [c for c in self._frames if c[0] == nom]:
+                del self._frames[ancienne]
+            self._frames[(nom, cle)] = df
+        return df
+
+    def ensure(self, nom, cle, builder):
+        """Écrit la version ``cle`` avec builder() si elle n'est pas encore sur disque ; retourne son chemin"""
+        chemin = self.path(nom, cle)
+        if not os.path.exists(os.path.join(chemin, 'meta.json')):
+            self.write(nom, cle, builder())
+        return chemin
+
+    def write(self, nom, cle, df):
+        """Écrit un DataFrame de façon atomique (répertoire temporaire puis renommage)"""
+        os.makedirs(self.racine, exist_ok=True)
+        temporaire = tempfile.mkdtemp(prefix=f".{nom}-", dir=self.racine)
+        meta = {'colonnes': [], 'categories': {}}
+        for col in df.columns:
+            valeurs = df[col]
+            if valeurs.dtype.kind in 'OSUT' or isinstance(valeurs.dtype, (pd.StringDtype, pd.CategoricalDtype)):
+                codes, categories = pd.factorize(valeurs)
+                meta['categories'][col] = [str(c) for c in categories]
+                valeurs = codes.astype(np.int8 if len(categories) < 128 else np.int32)
+            np.save(os.path.join(temporaire, f"{len(meta['colonnes'])}.npy"), np.asarray(valeurs))
+            meta['colonnes'].append(col)
+        with open(os.path.join(temporaire, 'meta.json'), 'w', encoding='utf-8') as fichier:
+            json.dump(meta, fichier, ensure_ascii=False)
+
+        chemin = self.path(nom, cle)
+        try:
+            os.rename(temporaire, chemin)
+        except OSError:
+            # Version déjà écrite par un autre processus
+            shutil.rmtree(temporaire, ignore_errors=True)
+            return
+        self.prune(nom, garder=chemin)
+
+    def prune(self, nom, garder):
+        """Supprime les anciennes versions d'un jeu de données.
+
+        Les processus qui les ont encore ouvertes gardent leurs projections
+        valides jusqu'à fermeture (suppression différée par le système).
+        """
+        for entree in os.listdir(self.racine):
+            chemin = os.path.join(self.racine, entree)
+            if entree.startswith(f"{nom}-") and chemin != garder:
+                shutil.rmtree(chemin, ignore_errors=True)
+
+    @staticmethod
+    def open(chemin):
+        """DataFrame en lecture seule dont les colonnes sont projetées depuis le disque"""
+        with open(os.path.join(chemin, 'meta.json'), encoding='utf-8') as fichier:
+            meta = json.load(fichier)
+        colonnes = {}
+        for i, col in enumerate(meta['colonnes']):
+            valeurs = np.load(os.path.join(chemin, f"{i}.npy"), mmap_mode='r')
+            if col in meta['categories']:
+                valeurs = pd.Categorical.from_codes(valeurs, meta['categories'][col])
+            colonnes[col] = valeurs
+        index = pd.DatetimeIndex(colonnes['date'], copy=False) if 'date' in colonnes else None
+        return pd.DataFrame(colonnes, index=index, copy=False)
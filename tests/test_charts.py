@@ -0,0 +1,29 @@
+# tests/test_charts.py
+"""Sous-échantillonnage LTTB des séries affichées."""
+import numpy as np
+import pandas as pd
+
+from charts import downsample, lttb_indices
+
+
+def test_lttb_keeps_endpoints_and_size():
+    x = np.arange(1000, dtype=np.float64)
+    y = np.sin(x / 40) + np.random.default_rng(0).normal(0, 0.1, len(x))
+    y[500] = 10
+    indices = lttb_indices(x, y, 100)
+    assert len(indices) == 100
+    assert indices[0] == 0 and indices[-1] == len(x) - 1
+    assert (np.diff(indices) > 0).all()
+    # Pic isolé : conservé
+    assert 500 in indices
+    assert list(lttb_indices(x[:50], y[:50], 100)) == list(range(50))
+
+
+def test_downsample_keeps_each_series_shape():
+    df = pd.DataFrame({'date': pd.date_range('2000-01-31', periods=600, freq='ME'),
+                       'a': np.arange(600.0), 'b': np.cos(np.arange(600) / 25)})
+    reduit = downsample(df, 'date', ['a', 'b'], 120)
+    assert len(reduit) <= 120
+    assert reduit['date'].iloc[0] == df['date'].iloc[0] and reduit['date'].iloc[-1] == df['date'].iloc[-1]
+    assert abs(reduit['b'].max() - df['b'].max()) < 0.01 and abs(reduit['b'].min() - df['b'].min()) < 0.01
+    assert downsample(df, 'date', ['a'], 1000) is df
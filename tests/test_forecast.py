@@ -0,0 +1,38 @@
+# tests/test_forecast.py
+"""Prévisions tendance + saisonnalité sur des séries connues."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from forecast import forecast
+
+
+@pytest.fixture
+def serie():
+    dates = pd.date_range('2010-01-31', periods=180, freq='ME')
+    t = np.arange(len(dates))
+    saison = np.tile(np.sin(np.arange(12) * np.pi / 6), 15)
+    return pd.DataFrame({'date': dates, 'lineaire': 100 + 0.5 * t,
+                         'saisonnier': 50 + 0.2 * t + 3 * saison,
+                         'multiplicatif': 1000 * 1.01 ** t * (1 + 0.2 * saison)})
+
+
+def test_forecast_recovers_known_trend(serie):
+    prevision = forecast(serie, ['lineaire', 'saisonnier'], horizon=24, exclure=())
+    t = np.arange(180, 204)
+    assert list(prevision.index) == list(pd.date_range('2025-01-31', periods=24, freq='ME'))
+    np.testing.assert_allclose(prevision['lineaire'], 100 + 0.5 * t, rtol=1e-9)
+    saison = np.sin(np.arange(180, 204) % 12 * np.pi / 6)
+    np.testing.assert_allclose(prevision['saisonnier'], 50 + 0.2 * t + 3 * saison, rtol=1e-9)
+    # Série exacte : intervalle réduit à la prévision
+    np.testing.assert_allclose(prevision['lineaire_haut'], prevision['lineaire_bas'], atol=1e-6)
+
+
+def test_forecast_log_and_bounds(serie):
+    prevision = forecast(serie, ['multiplicatif', 'lineaire'], horizon=12, log=('multiplicatif',),
+                         bornes={'lineaire': (0, 150)}, exclure=())
+    saison = np.sin(np.arange(12) * np.pi / 6)
+    np.testing.assert_allclose(prevision['multiplicatif'], 1000 * 1.01 ** np.arange(180, 192) * (1 + 0.2 * saison),
+                               rtol=1e-6)
+    assert (prevision['lineaire'] == 150).all()
+    assert (prevision['multiplicatif_bas'] <= prevision['multiplicatif']).all()
@@ -0,0 +1,167 @@
+# tests/test_http_client.py
+"""Client HTTP et HttpSource face à un serveur local aux réponses contrôlées."""
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from data_engine import SCHEMAS, DataEngine
+from http_client import ConnectionPool
+from sources import HttpSource, SyntheticSource
+
+CSV = (','.join(['date', *SCHEMAS['demographic']]) + '\n2020-01-01' + ',1' * len(SCHEMAS['demographic']) + '\n').encode()
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def setup(self):
+        super().setup()
+        self.server.connexions += 1
+
+    def send_body(self, corps, **entetes):
+        self.send_response(200)
+        for nom, valeur in entetes.items():
+            self.send_header(nom.replace('_', '-'), valeur)
+        self.end_headers()
+        self.wfile.write(corps)
+
+    def do_GET(self):
+        self.server.requetes.append((self.path, dict(self.headers)))
+        if self.path == '/length':
+            self.send_body(b'abcdef', Content_Length='6')
+        elif self.path == '/chunked':
+            self.send_body(b'3;ext=1\r\nabc\r\n3\r\ndef\r\n0\r\nX-Fin: 1\r\n\r\n', Transfer_Encoding='chunked')
+        elif self.path == '/close':
+            # Ni longueur ni découpage : corps lu jusqu'à la fermeture
+            self.send_body(b'abcdef', Connection='close')
+            self.close_connection = True
+        elif self.path == '/drop':
+            # Réponse complète puis fermeture sans l'annoncer : connexion inactive périmée
+            self.send_body(b'abcdef', Content_Length='6')
+            self.close_connection = True
+        elif self.path == '/short':
+            self.send_body(b'abc', Content_Length='100')
+            self.close_connection = True
+        elif self.path == '/demographic.csv':
+            if self.headers.get('If-None-Match') == '"v1"':
+                self.send_response(304)
+                self.send_header('ETag', '"v1"')
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+            else:
+                self.send_body(CSV, Content_Length=str(len(CSV)), ETag='"v1"')
+        else:
+            self.send_response(404)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+
+
+@pytest.fixture
+def serveur():
+    serveur = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    serveur.connexions = 0
+    serveur.requetes = []
+    threading.Thread(target=serveur.serve_forever, daemon=True).start()
+    serveur.url = f"http://127.0.0.1:{serveur.server_address[1]}"
+    yield serveur
+    serveur.shutdown()
+    serveur.server_close()
+
+
+def get_all(urls, max_par_hote=4):
+    async def principal():
+        pool = ConnectionPool(max_par_hote)
+        try:
+            return [await pool.get(url) for url in urls]
+        finally:
+            pool.close()
+    return asyncio.run(principal())
+
+
+def test_content_length_reuses_connection(serveur):
+    reponses = get_all([f"{serveur.url}/length"] * 3)
+    assert [(statut, corps) for statut, _, corps in reponses] == [(200, b'abcdef')] * 3
+    assert reponses[0][1]['content-length'] == '6'
+    assert serveur.connexions == 1
+
+
+def test_chunked_body(serveur):
+    statut, _, corps = get_all([f"{serveur.url}/chunked", f"{serveur.url}/length"])[0]
+    assert (statut, corps) == (200, b'abcdef')
+    assert serveur.connexions == 1
+
+
+def test_body_until_close(serveur):
+    reponses = get_all([f"{serveur.url}/close", f"{serveur.url}/length"])
+    assert [corps for _, _, corps in reponses] == [b'abcdef', b'abcdef']
+    assert serveur.connexions == 2
+
+
+def test_stale_connection_is_retried(serveur):
+    reponses = get_all([f"{serveur.url}/drop", f"{serveur.url}/length"])
+    assert [corps for _, _, corps in reponses] == [b'abcdef', b'abcdef']
+    assert serveur.connexions == 2
+
+
+def test_truncated_body_raises(serveur):
+    with pytest.raises(asyncio.IncompleteReadError):
+        get_all([f"{serveur.url}/short"])
+
+
+def test_concurrent_requests_respect_host_limit(serveur):
+    async def principal():
+        pool = ConnectionPool(max_par_hote=2)
+        try:
+            return await asyncio.gather(*(pool.get(f"{serveur.url}/length") for _ in range(6)))
+        finally:
+            pool.close()
+    assert [corps for _, _, corps in asyncio.run(principal())] == [b'abcdef'] * 6
+    assert serveur.connexions <= 2
+
+
+def verify(source, nom='demographic'):
+    """Vérification d'un jeu qui a une copie locale (sinon menée en arrière-plan par refresh)"""
+    asyncio.run_coroutine_threadsafe(source._fetch(nom), source._loop()).result(timeout=5)
+
+
+@pytest.fixture
+def secours():
+    return SyntheticSource(DataEngine())
+
+
+def test_http_source_conditional_refresh(serveur, secours, tmp_path):
+    source = HttpSource({'demographic': f"{serveur.url}/demographic.csv"}, str(tmp_path), secours)
+    source.refresh()
+    assert source.status['demographic']['etat'] == 'modifié'
+    assert len(source.load('demographic')) == 1
+    cle = source.cache_key('demographic')
+    verify(source)
+    assert source.status['demographic']['etat'] == 'inchangé'
+    assert serveur.requetes[-1][1].get('If-None-Match') == '"v1"'
+    assert source.cache_key('demographic') == cle
+    # Jeu sans point d'accès : lu dans la source de secours
+    assert source.cache_key('tourism') == secours.cache_key('tourism')
+
+
+@pytest.mark.parametrize('chemin', ['/short', '/missing.csv'])
+def test_http_source_failure_keeps_copy(serveur, secours, tmp_path, chemin):
+    source = HttpSource({'demographic': f"{serveur.url}/demographic.csv"}, str(tmp_path), secours)
+    source.refresh()
+    cle = source.cache_key('demographic')
+    source.urls['demographic'] = f"{serveur.url}{chemin}"
+    verify(source)
+    assert source.status['demographic']['etat'] == 'périmé'
+    assert source.cache_key('demographic') == cle
+
+
+def test_http_source_failure_without_copy(serveur, secours, tmp_path):
+    source = HttpSource({'demographic': f"{serveur.url}/short"}, str(tmp_path), secours, timeout=5)
+    source.refresh()
+    assert source.status['demographic']['etat'] == 'indisponible'
+    with pytest.raises(FileNotFoundError):
+        source.load('demographic')
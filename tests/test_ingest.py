@@ -0,0 +1,101 @@
+# tests/test_ingest.py
+"""Pipeline d'ingestion des ticks : validation, ordre des dates, agrégats et contre-pression."""
+import json
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_engine import SCHEMAS, DataEngine
+from ingest import IngestStats, TickIngestor, micro_batches, parse, validate
+from live import TickStore
+from rollups import Rollup, build_rollups
+
+COLONNES = list(SCHEMAS['economic'])
+
+
+def tick(date, valeur=1.0):
+    return {'date': str(date), **{col: valeur for col in COLONNES}}
+
+
+@pytest.fixture
+def store():
+    return TickStore.from_frame(DataEngine().dataset('economic'), index_col='date')
+
+
+def test_stats_count_rejections():
+    stats = IngestStats()
+    lignes = ['{"date": "2030-01-31"', '[1, 2]', json.dumps({'date': '2030-01-31'}),
+              json.dumps({**tick('2030-01-31'), 'inflation': 'n/a'}),
+              json.dumps({**tick('2030-01-31'), 'inflation': float('nan')}),
+              json.dumps(tick('2030-01-31')), '', None]
+    valides = [element for element in validate(parse(lignes, stats), 'economic', stats) if element is not None]
+    assert len(valides) == 1
+    assert stats.recues == 6
+    assert dict(stats.rejets) == {'json invalide': 2, 'colonne manquante': 1, 'valeur invalide': 2}
+
+
+def test_micro_batches_use_schema_dtypes():
+    lignes = [({'date': np.datetime64('2030-01-31'), **{col: 1.5 for col in COLONNES}}, time.time())] * 3
+    lot, _ = next(micro_batches(iter(lignes), 'economic', taille=3))
+    assert {col: str(valeurs.dtype) for col, valeurs in lot.items() if col != 'date'} == SCHEMAS['economic']
+
+
+def test_drain_rejects_out_of_order_and_duplicates(store):
+    ingestor = TickIngestor('/inexistant', max_lots=4)
+    derniere = pd.Timestamp(store.last('date'))
+    dates = [derniere + pd.offsets.MonthEnd(2), derniere, derniere + pd.offsets.MonthEnd(1),
+             derniere + pd.offsets.MonthEnd(1), derniere - pd.offsets.MonthEnd(3)]
+    colonnes = {'date': np.array(dates, dtype='datetime64[us]'),
+                **{col: np.array([1.0, 2.0, 3.0, 4.0, 5.0]) for col in COLONNES}}
+    ingestor._file.put((colonnes, time.time()))
+    n = len(store)
+    assert ingestor.drain(store) == 2
+    assert len(store) == n + 2
+    # Date répétée : seule la dernière ligne reçue est conservée
+    assert store.frame()['inflation'].iloc[-2] == 4.0
+    assert store.last('date') == np.datetime64(dates[0], 'us')
+    assert ingestor.stats.rejets['hors ordre'] == 3
+    assert ingestor.stats.ajoutees == 2
+    assert ingestor.drain(store) == 0
+
+
+def test_drain_feeds_rollups_the_stored_values(store):
+    rollups = build_rollups(store.frame(), COLONNES)
+    ingestor = TickIngestor('/inexistant')
+    derniere = pd.Timestamp(store.last('date'))
+    dates = [derniere + pd.offsets.MonthEnd(i) for i in range(1, 5)]
+    # Valeurs float64 non représentables exactement en float32
+    colonnes = {'date': np.array(dates, dtype='datetime64[us]'),
+                **{col: np.array([0.1, 0.2, 0.3, 0.7]) for col in COLONNES}}
+    ingestor._file.put((colonnes, time.time()))
+    ingestor.drain(store, rollups)
+    for freq, rollup in rollups.items():
+        reconstruit = Rollup.from_frame(store.frame(), COLONNES, freq)
+        np.testing.assert_allclose(rollup.table()[COLONNES], reconstruit.table()[COLONNES], rtol=1e-12)
+        assert (rollup.table()['lignes'] == reconstruit.table()['lignes']).all()
+
+
+def test_bounded_queue_applies_backpressure(tmp_path, store):
+    n = 200
+    with open(tmp_path / 'ticks.ndjson', 'w') as fichier:
+        for i in range(n):
+            fichier.write(json.dumps(tick(pd.Timestamp('2030-01-01') + pd.Timedelta(days=i))) + '\n')
+    ingestor = TickIngestor(str(tmp_path), taille_lot=10, delai_lot=0.05, max_lots=2).start()
+    try:
+        limite = time.time() + 5
+        while ingestor._file.qsize() < 2 and time.time() < limite:
+            time.sleep(0.01)
+        time.sleep(0.2)
+        # File pleine : le thread est bloqué, la lecture ne va pas au-delà d'un lot de plus
+        assert ingestor._file.full()
+        assert ingestor.stats.recues <= 3 * 10 + 1
+        ajoutees = 0
+        while ajoutees < n and time.time() < limite:
+            ajoutees += ingestor.drain(store)
+            time.sleep(0.01)
+        assert ajoutees == n
+        assert ingestor.stats.recues == n
+    finally:
+        ingestor.stop()
@@ -0,0 +1,114 @@
+# tests/test_live.py
+"""Planificateur des ticks et séries temps réel."""
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import live
+from data_engine import DataEngine
+from live import LiveScheduler, SharedTickStore
+from sources import SyntheticSource
+
+
+def test_refresh_slots_are_capped_and_released():
+    scheduler = LiveScheduler(lambda: True, interval=30, max_concurrent_refreshes=2)
+    jetons = [scheduler.acquire_refresh(), scheduler.acquire_refresh()]
+    assert None not in jetons
+    assert scheduler.acquire_refresh() is None
+    scheduler.release_refresh(jetons[0])
+    assert scheduler.acquire_refresh() is not None
+
+
+def test_leaked_refresh_slots_expire():
+    scheduler = LiveScheduler(lambda: True, interval=30, max_concurrent_refreshes=1, slot_ttl=0.05)
+    jeton = scheduler.acquire_refresh()
+    assert scheduler.acquire_refresh() is None
+    # Session fermée avant la relance : le créneau n'est jamais libéré
+    time.sleep(0.1)
+    nouveau = scheduler.acquire_refresh()
+    assert nouveau is not None
+    # Libération tardive du créneau expiré : sans effet sur le nouveau
+    scheduler.release_refresh(jeton)
+    assert scheduler.acquire_refresh() is None
+
+
+def serie(racine, n=4):
+    df = pd.DataFrame({'a': np.arange(n, dtype=np.int64), 'b': np.arange(n, dtype=np.int64)})
+    return SharedTickStore.attach(str(racine), df)
+
+
+def test_reader_sees_consistent_snapshots(tmp_path):
+    producteur = serie(tmp_path / 'serie')
+    lecteur = SharedTickStore(str(tmp_path / 'serie'))
+    assert producteur.acquire_writer() and not lecteur.acquire_writer()
+    n = 2000
+
+    def produire():
+        # Croissance : plusieurs nouvelles générations de fichiers pendant la lecture
+        for i in range(4, n):
+            producteur.extend({'a': [i], 'b': [i]})
+
+    ecrivain = threading.Thread(target=produire)
+    ecrivain.start()
+    lues = 4
+    while ecrivain.is_alive() or lues < n:
+        lignes = lecteur.refresh()
+        if lignes is not None:
+            # Lignes nouvelles contiguës, sans trou ni doublon
+            assert np.array_equal(lignes['a'], np.arange(lues, lues + len(lignes['a'])))
+            lues += len(lignes['a'])
+        df = lecteur.frame()
+        assert np.array_equal(df['a'], np.arange(len(df))) and np.array_equal(df['a'], df['b'])
+    ecrivain.join()
+    assert lues == n and len(lecteur) == n
+
+
+def test_new_writer_repairs_interrupted_write(tmp_path, monkeypatch):
+    monkeypatch.setattr(live, 'LECTURE_MAX_SECONDES', 0.05)
+    producteur = serie(tmp_path / 'serie')
+    lecteur = SharedTickStore(str(tmp_path / 'serie'))
+    assert producteur.acquire_writer()
+    # Mort pendant une écriture : séquence impaire, génération créée mais pas publiée, verrou libéré
+    producteur._entete[live.SEQUENCE] += 1
+    np.memmap(SharedTickStore._fichier(producteur.racine, 0, 1), dtype=np.int64, mode='w+', shape=(64,))
+    producteur._verrou.close()
+    producteur._verrou = None
+    assert lecteur.refresh() is None
+    assert lecteur.acquire_writer()
+    assert int(lecteur._entete[live.SEQUENCE]) % 2 == 0
+    assert not os.path.exists(SharedTickStore._fichier(lecteur.racine, 0, 1))
+    lecteur.append({'a': 4, 'b': 4})
+    assert list(SharedTickStore(lecteur.racine).frame()['a']) == [0, 1, 2, 3, 4]
+
+
+def test_sources_do_not_share_series(tmp_path, monkeypatch):
+    Dashboard = pytest.importorskip('Dashboard')
+    monkeypatch.setattr(Dashboard, 'LIVE_DIR', str(tmp_path))
+    hier = SyntheticSource(DataEngine(date_fin='2030-01-31'))
+    # Même source d'un jour à l'autre : même série ; autre graine : autre série
+    assert Dashboard.live_path(hier) == Dashboard.live_path(SyntheticSource(DataEngine(date_fin='2030-02-28')))
+    autre = Dashboard.live_path(SyntheticSource(DataEngine(seed=7)))
+    assert autre != Dashboard.live_path(hier)
+    a, b = serie(Dashboard.live_path(hier)), serie(autre)
+    a.append({'a': 4, 'b': 4})
+    assert b.refresh() is None and len(b) == 4
+
+
+def test_prune_keeps_mapped_series(tmp_path):
+    vieux = time.time() - 3600
+    for nom in ('economic-lue', 'economic-abandonnee', 'economic-recente', 'economic-gardee'):
+        serie(tmp_path / nom)
+        if nom != 'economic-recente':
+            os.utime(tmp_path / nom, (vieux, vieux))
+    # Lecteur sans verrou de producteur : la série ne doit pas disparaître sous lui
+    lecteur = SharedTickStore(str(tmp_path / 'economic-lue'))
+    SharedTickStore.prune(str(tmp_path), 'economic-', str(tmp_path / 'economic-gardee'))
+    assert sorted(os.listdir(tmp_path)) == ['economic-gardee', 'economic-lue', 'economic-recente']
+    del lecteur
+    os.utime(tmp_path / 'economic-lue', (vieux, vieux))
+    SharedTickStore.prune(str(tmp_path), 'economic-', str(tmp_path / 'economic-gardee'))
+    assert sorted(os.listdir(tmp_path)) == ['economic-gardee', 'economic-recente']
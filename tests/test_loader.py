@@ -0,0 +1,17 @@
+# tests/test_loader.py
+"""Construction des jeux de données à la demande et versions conservées."""
+from data_engine import DataEngine
+from loader import DatasetLoader
+from sources import SyntheticSource
+
+
+def test_only_latest_version_is_kept():
+    loader = DatasetLoader(workers=1)
+    ancienne = SyntheticSource(DataEngine(date_fin='2030-01-31'))
+    nouvelle = SyntheticSource(DataEngine(date_fin='2030-02-28'))
+    assert loader.submit(ancienne, 'economic')
+    assert not loader.submit(ancienne, 'economic')
+    df = loader.get(ancienne, 'economic')
+    assert loader.get(ancienne, 'economic') is df
+    assert len(loader.get(nouvelle, 'economic')) == len(df) + 1
+    assert [cle for cle, *_ in loader._jeux.values()] == [nouvelle.cache_key('economic')]
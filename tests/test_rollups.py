@@ -0,0 +1,27 @@
+# tests/test_rollups.py
+"""Agrégats incrémentaux comparés à un resample pandas."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from rollups import Rollup
+
+
+@pytest.mark.parametrize('freq,regle', [('Q', 'QE'), ('Y', 'YE')])
+def test_incremental_rollup_matches_resample(freq, regle):
+    rng = np.random.default_rng(0)
+    dates = pd.to_datetime('2010-01-01') + pd.to_timedelta(np.sort(rng.integers(0, 3650, 2000)), unit='D')
+    df = pd.DataFrame({'date': dates, 'flux': rng.normal(100, 10, len(dates)), 'taux': rng.uniform(0, 5, len(dates))})
+    rollup = Rollup(['flux', 'taux'], freq, sommes=('flux',))
+    # Lots de tailles variables, dont des lignes qui complètent une période déjà vue
+    for debut, fin in zip([0, 1, 7, 500, 1200], [1, 7, 500, 1200, len(df)]):
+        lot = df.iloc[debut:fin]
+        rollup.extend(lot['date'], lot[['flux', 'taux']].to_numpy())
+    attendu = df.set_index('date').resample(regle)
+    attendu = pd.DataFrame({'flux': attendu['flux'].sum(), 'taux': attendu['taux'].mean(),
+                            'lignes': attendu['flux'].count()})
+    attendu = attendu[attendu['lignes'] > 0]
+    table = rollup.table()
+    assert list(table.index.to_timestamp(how='end').normalize()) == list(attendu.index)
+    np.testing.assert_allclose(table[['flux', 'taux']], attendu[['flux', 'taux']], rtol=1e-12)
+    assert list(table['lignes']) == list(attendu['lignes'])
@@ -0,0 +1,37 @@
+# tests/test_sectors.py
+"""Catalogue hiérarchique des secteurs : ordre des positions et parts d'emploi."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from sectors import SectorCatalog, load_catalog
+
+# Hiérarchie déséquilibrée, parents listés après leurs enfants : C n'a pas de sous-secteur
+NOMENCLATURE = pd.DataFrame({
+    'secteur': ['A1b', 'B', 'A1a', 'A2', 'A', 'C', 'A1', 'B1'],
+    'parent': ['A1', None, 'A1', 'A', None, None, 'A', 'B'],
+    'emplois': [10, np.nan, 20, 30, np.nan, 40, np.nan, 50],
+    'poids_pib': [1.0, np.nan, 2.0, 3.0, np.nan, 4.0, np.nan, 5.0],
+    'croissance': [1.0, np.nan, 2.0, 3.0, np.nan, 4.0, np.nan, 5.0],
+})
+
+
+def test_parents_come_before_children():
+    catalogue = SectorCatalog(NOMENCLATURE)
+    enfants = catalogue.parent >= 0
+    assert (catalogue.parent[enfants] < np.flatnonzero(enfants)).all()
+    assert (catalogue.niveau[enfants] == catalogue.niveau[catalogue.parent[enfants]] + 1).all()
+    # Enfants d'un même secteur contigus, dans la tranche children()
+    for i in range(len(catalogue.codes)):
+        assert set(np.flatnonzero(catalogue.parent == i)) == set(range(len(catalogue.codes))[catalogue.children(i)])
+    assert list(catalogue.codes[catalogue.level(0)]) == ['B', 'A', 'C']
+
+
+def test_employment_share_uses_total_employment():
+    catalogue = SectorCatalog(NOMENCLATURE)
+    part = dict(zip(catalogue.codes, catalogue.part_emploi))
+    assert catalogue.emplois[catalogue.position['A']] == 60
+    assert part['A'] + part['B'] + part['C'] == pytest.approx(100)
+    # Niveau 2 incomplet (C et B1 n'ont pas de sous-secteur) : part de tout l'emploi, pas du niveau
+    assert part['A1a'] == pytest.approx(20 / 150 * 100)
+    assert load_catalog().part_emploi.sum() == pytest.approx(100)
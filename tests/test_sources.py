@@ -0,0 +1,40 @@
+# tests/test_sources.py
+"""FileSource sur un répertoire qui ne contient qu'une partie des jeux de données, sources configurées par l'environnement."""
+import pytest
+
+from data_engine import DataEngine
+import sources
+from sources import FileSource, HttpSource, SyntheticSource, source_from_env
+
+
+@pytest.fixture
+def repertoire(tmp_path):
+    DataEngine().dataset('economic').to_csv(tmp_path / 'economic.csv', index=False)
+    return str(tmp_path)
+
+
+def test_missing_files_fall_back(repertoire):
+    secours = SyntheticSource(DataEngine())
+    source = FileSource(repertoire, secours=secours)
+    assert source.cache_key('economic')[0] == 'files'
+    assert source.cache_key('tourism') == secours.cache_key('tourism')
+    assert source.load('tourism', ['arrivees_touristes']).equals(secours.load('tourism', ['arrivees_touristes']))
+    assert len(source.load('economic', ['inflation'])) == len(secours.load('economic'))
+
+
+def test_missing_file_without_fallback(repertoire):
+    with pytest.raises(FileNotFoundError):
+        FileSource(repertoire).cache_key('tourism')
+
+
+def test_http_source_survives_new_period(monkeypatch, tmp_path):
+    monkeypatch.setenv(sources.DATA_URL_ENV, 'http://127.0.0.1:9/{nom}.csv')
+    monkeypatch.setenv(sources.HTTP_CACHE_ENV, str(tmp_path))
+    monkeypatch.setattr(sources, '_sources_http', {})
+    source = source_from_env(DataEngine(date_fin='2030-01-31'))
+    assert isinstance(source, HttpSource)
+    # Le lendemain : même instance (boucle et connexions), secours sur la nouvelle période
+    engine = DataEngine(date_fin='2030-02-28')
+    assert source_from_env(engine) is source
+    assert source.secours.engine.snapshot_id == engine.snapshot_id
+    assert len(sources._sources_http) == 1